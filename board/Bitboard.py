@@ -0,0 +1,263 @@
+"""
+a few tables and functions for representing the board as 64 bit integers (bitboards):
+
+    1) every space on the board is a bit, the space (x, y) is bit x + 8 * y so (0, 0) is bit 0 and (7, 7) is bit 63
+    2) tables of the spaces knights, kings and pawns attack from every space, and the spaces pawns push to
+    3) tables of the rays leaving every space in each of the 8 directions, used to find sliding attacks by stopping the
+       ray at the first piece that blocks it
+    4) tables of the spaces between any two spaces on the same line, used to find checks that can be blocked and pins
+    5) lookup tables of the sliding attacks from every space for every arrangement of the pieces that can block them,
+       the tables are filled the first time an arrangement is seen so importing the module stays fast
+    6) sets of the coordinates of the spaces of bitboards, so the moves of a piece found as a bitboard are turned into
+       the coordinates the pieces keep with a single lookup
+"""
+
+
+# ======================================================= SPACES =======================================================
+
+
+SQUARES = [[x + 8 * y for y in range(8)] for x in range(8)]  # indexed [x][y] like the game board
+COORDINATES = [(square % 8, square // 8) for square in range(64)]
+COORDINATE_SETS = {}  # the sets of coordinates of the bitboards converted so far, see coordinate_set
+COORDINATE_SETS_SIZE = 1 << 16  # the most sets kept at once
+
+
+def bits(bitboard: int):
+    """
+    generates the spaces that are set in a bitboard
+
+    :param bitboard: the bitboard to read
+    :return: a generator of the spaces in the bitboard, lowest space first
+    """
+
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+def coordinates(bitboard: int) -> list:
+    """
+    converts a bitboard into the coordinates of its spaces
+
+    :param bitboard: the bitboard to read
+    :return: a list of the coordinates in the form (0-7, 0-7), lowest space first
+    """
+
+    spaces = []
+    while bitboard:
+        low = bitboard & -bitboard
+        spaces.append(COORDINATES[low.bit_length() - 1])
+        bitboard ^= low
+    return spaces
+
+
+def coordinate_set(bitboard: int) -> frozenset:
+    """
+    converts a bitboard into a set of the coordinates of its spaces, the sets are kept so a bitboard that was seen
+    before is converted with a single lookup. the kept sets are dropped once there are too many of them
+
+    :param bitboard: the bitboard to read
+    :return: a frozenset of the coordinates in the form (0-7, 0-7)
+    """
+
+    spaces = COORDINATE_SETS.get(bitboard)
+    if spaces is None:
+        COORDINATE_SETS.clear() if len(COORDINATE_SETS) >= COORDINATE_SETS_SIZE else None
+        spaces = COORDINATE_SETS[bitboard] = frozenset(coordinates(bitboard))
+    return spaces
+
+
+def leap_table(displacements: tuple) -> list:
+    """
+    creates a table of the spaces that can be reached from every space with fixed displacements
+
+    :param displacements: the displacements in the form (x, y)
+    :return: a list indexed by space of bitboards of the reachable spaces
+    """
+
+    table = []
+    for x, y in COORDINATES:
+        bitboard = 0
+        for delta_x, delta_y in displacements:
+            if 0 <= x + delta_x <= 7 and 0 <= y + delta_y <= 7:
+                bitboard |= 1 << SQUARES[x + delta_x][y + delta_y]
+        table.append(bitboard)
+    return table
+
+
+def ray_table(direction: tuple) -> list:
+    """
+    creates a table of the rays leaving every space in a direction until the end of the board
+
+    :param direction: the direction of the ray in the form (x, y)
+    :return: a list indexed by space of bitboards of the spaces on the ray, not including the starting space
+    """
+
+    table = []
+    for x, y in COORDINATES:
+        bitboard = 0
+        x, y = x + direction[0], y + direction[1]
+        while 0 <= x <= 7 and 0 <= y <= 7:
+            bitboard |= 1 << SQUARES[x][y]
+            x, y = x + direction[0], y + direction[1]
+        table.append(bitboard)
+    return table
+
+
+# ======================================================= TABLES =======================================================
+
+
+KNIGHT_ATTACKS = leap_table(((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)))
+KING_ATTACKS = leap_table(((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)))
+PAWN_ATTACKS = {'white': leap_table(((-1, -1), (1, -1))), 'black': leap_table(((-1, 1), (1, 1)))}
+PAWN_PUSHES = {'white': leap_table(((0, -1), (0, -2))), 'black': leap_table(((0, 1), (0, 2)))}
+
+# rays are split by whether they move towards higher or lower spaces since the blocking piece is found differently
+POSITIVE_RAYS = {direction: ray_table(direction) for direction in ((1, 0), (0, 1), (1, 1), (-1, 1))}
+NEGATIVE_RAYS = {direction: ray_table(direction) for direction in ((-1, 0), (0, -1), (-1, -1), (1, -1))}
+STRAIGHT = (POSITIVE_RAYS[(1, 0)], POSITIVE_RAYS[(0, 1)]), (NEGATIVE_RAYS[(-1, 0)], NEGATIVE_RAYS[(0, -1)])
+DIAGONAL = (POSITIVE_RAYS[(1, 1)], POSITIVE_RAYS[(-1, 1)]), (NEGATIVE_RAYS[(-1, -1)], NEGATIVE_RAYS[(1, -1)])
+STRAIGHT_LINES = [sum(table[square] for table in STRAIGHT[0] + STRAIGHT[1]) for square in range(64)]
+DIAGONAL_LINES = [sum(table[square] for table in DIAGONAL[0] + DIAGONAL[1]) for square in range(64)]
+
+
+def between_table() -> list:
+    """
+    creates a table of the spaces between every pair of spaces that are on the same line
+
+    :return: a list of lists indexed [first space][second space] of bitboards of the spaces strictly between them, the
+        bitboard is empty when the spaces are not on the same line or are next to each other
+    """
+
+    table = [[0] * 64 for _ in range(64)]
+    for direction in list(POSITIVE_RAYS.keys()) + list(NEGATIVE_RAYS.keys()):
+        for square in range(64):
+            bitboard = 0
+            x, y = COORDINATES[square][0] + direction[0], COORDINATES[square][1] + direction[1]
+            while 0 <= x <= 7 and 0 <= y <= 7:
+                table[square][SQUARES[x][y]] = bitboard
+                bitboard |= 1 << SQUARES[x][y]
+                x, y = x + direction[0], y + direction[1]
+    return table
+
+
+BETWEEN = between_table()
+
+
+# ================================================== SLIDING ATTACKS ===================================================
+
+
+def sliding_attacks(square: int, occupied: int, rays: tuple) -> int:
+    """
+    finds the spaces a sliding piece attacks, each ray stops at (and includes) the first piece in its way
+
+    :param square: the space of the sliding piece
+    :param occupied: a bitboard of every piece on the board
+    :param rays: the positive and negative ray tables to slide along, either STRAIGHT or DIAGONAL
+    :return: a bitboard of the attacked spaces
+    """
+
+    attacks = 0
+    for table in rays[0]:
+        ray = table[square]
+        blockers = ray & occupied
+        attacks |= ray ^ table[(blockers & -blockers).bit_length() - 1] if blockers else ray
+    for table in rays[1]:
+        ray = table[square]
+        blockers = ray & occupied
+        attacks |= ray ^ table[blockers.bit_length() - 1] if blockers else ray
+    return attacks
+
+
+def blocker_mask(square: int, rays: tuple) -> int:
+    """
+    finds the spaces where a piece can block a sliding piece, the last space of each ray can never block anything
+
+    :param square: the space of the sliding piece
+    :param rays: the positive and negative ray tables to slide along, either STRAIGHT or DIAGONAL
+    :return: a bitboard of the spaces that can block the sliding piece
+    """
+
+    mask = 0
+    for table in rays[0]:
+        ray = table[square]
+        mask |= ray & ~(1 << ray.bit_length() >> 1)
+    for table in rays[1]:
+        ray = table[square]
+        mask |= ray & ~(ray & -ray)
+    return mask
+
+
+ROOK_MASKS = [blocker_mask(square, STRAIGHT) for square in range(64)]
+BISHOP_MASKS = [blocker_mask(square, DIAGONAL) for square in range(64)]
+ROOK_TABLES = [{} for _ in range(64)]
+BISHOP_TABLES = [{} for _ in range(64)]
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """
+    finds the spaces a rook attacks
+
+    :param square: the space of the rook
+    :param occupied: a bitboard of every piece on the board
+    :return: a bitboard of the attacked spaces
+    """
+
+    blockers = occupied & ROOK_MASKS[square]
+    attacks = ROOK_TABLES[square].get(blockers)
+    if attacks is None:
+        attacks = ROOK_TABLES[square][blockers] = sliding_attacks(square, blockers, STRAIGHT)
+    return attacks
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """
+    finds the spaces a bishop attacks
+
+    :param square: the space of the bishop
+    :param occupied: a bitboard of every piece on the board
+    :return: a bitboard of the attacked spaces
+    """
+
+    blockers = occupied & BISHOP_MASKS[square]
+    attacks = BISHOP_TABLES[square].get(blockers)
+    if attacks is None:
+        attacks = BISHOP_TABLES[square][blockers] = sliding_attacks(square, blockers, DIAGONAL)
+    return attacks
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    """
+    finds the spaces a queen attacks
+
+    :param square: the space of the queen
+    :param occupied: a bitboard of every piece on the board
+    :return: a bitboard of the attacked spaces
+    """
+
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def piece_attacks(name: str, color: str, square: int, occupied: int) -> int:
+    """
+    finds the spaces a piece attacks, note pawns only attack diagonally
+
+    :param name: the name of the piece
+    :param color: the color of the piece, only used for pawns
+    :param square: the space of the piece
+    :param occupied: a bitboard of every piece on the board
+    :return: a bitboard of the attacked spaces
+    """
+
+    if name == 'pawn':
+        return PAWN_ATTACKS[color][square]
+    elif name == 'king':
+        return KING_ATTACKS[square]
+    elif name == 'knight':
+        return KNIGHT_ATTACKS[square]
+    elif name == 'bishop':
+        return bishop_attacks(square, occupied)
+    elif name == 'rook':
+        return rook_attacks(square, occupied)
+    return queen_attacks(square, occupied)
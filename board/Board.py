@@ -1,134 +1,292 @@
+from Game import Game
 from Piece import Piece
 from SpecialMoves import *
+from Notation import parse_square, square_name
+from Position import Position, NAMES, BLACK
+from Bitboard import COORDINATES
 
 
 """
 a few functions for board management:
     1) functions to create each piece
     2) function to initialize the board
+    3) functions to set up the board from a FEN string and to write the board as a FEN string
+    4) function to set up the board from a compact position
 """
 
 
 # ==================================================== CREATE PIECE ====================================================
 
 
-def create_pawn(coordinates: tuple, color: str):
+# the moves and special moves of each kind of piece, the tables are shared by every piece of the kind since they never
+# change, which keeps creating pieces cheap
+BISHOP_MOVES = {('i', 'i'), ('i', '-i'), ('-i', 'i'), ('-i', '-i')}
+ROOK_MOVES = {(0, 'i'), (0, '-i'), ('i', 0), ('-i', 0)}
+KNIGHT_MOVES = {(1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)}
+QUEEN_MOVES = BISHOP_MOVES | ROOK_MOVES
+PAWN_SPECIALS = {color: {(0, 2 * multiplier, 0): [(pawn_can_move_two, pawn_move_two)],
+                         (-1, 1 * multiplier, 1): [(pawn_can_attack_left_upgrade, pawn_attack_left_upgrade),
+                                                   (pawn_can_attack_left, pawn_attack_left),
+                                                   (pawn_can_en_passant_left, pawn_en_passant_left)],
+                         (1, 1 * multiplier, 2): [(pawn_can_attack_right_upgrade, pawn_attack_right_upgrade),
+                                                  (pawn_can_attack_right, pawn_attack_right),
+                                                  (pawn_can_en_passant_right, pawn_en_passant_right)],
+                         (0, 1 * multiplier, 3): [(pawn_can_upgrade, pawn_upgrade),
+                                                  (pawn_can_move_one, pawn_move_one)]}
+                 for color, multiplier in (('white', -1), ('black', 1))}
+KING_SPECIALS = {move: [(generate_king_can_move(move), action)] for move, action in KING_STEPS.items()}
+KING_SPECIALS.update({(2, 0): [(king_can_castle_right, king_castle_right)],
+                      (-2, 0): [(king_can_castle_left, king_castle_left)]})
+
+
+def create_pawn(game: Game, coordinates: tuple, color: str):
     """
     creates a pawn
 
+    :param game: the game to place the piece in
     :param coordinates: the coordinates of the chess piece in the form (0-7, 0-7)
     :param color: the color of the piece, can be either 'black' or 'white'
     """
 
-    multiplier = -1 if color == 'white' else 1
-    specials = {(0, 2 * multiplier, 0): [(pawn_can_move_two, pawn_move_two)],
-                (-1, 1 * multiplier, 1): [(pawn_can_attack_left_upgrade, pawn_attack_left_upgrade),
-                                          (pawn_can_attack_left, pawn_attack_left)],
-                (1, 1 * multiplier, 2): [(pawn_can_attack_right_upgrade, pawn_attack_right_upgrade),
-                                         (pawn_can_attack_right, pawn_attack_right)],
-                (0, 1 * multiplier, 3): [(pawn_can_upgrade, pawn_upgrade),
-                                         (pawn_can_move_one, pawn_move_one)]}
-    Piece(coordinates, f'board/assets/{color}/pawn.png', (20, 15), None, specials)
+    Piece(game, coordinates, color, 'pawn', None, PAWN_SPECIALS[color])
 
 
-def create_bishop(coordinates: tuple, color: str):
+def create_bishop(game: Game, coordinates: tuple, color: str):
     """
     creates a bishop
 
+    :param game: the game to place the piece in
     :param coordinates: the coordinates of the chess piece in the form (0-7, 0-7)
     :param color: the color of the piece, can be either 'black' or 'white'
     """
 
-    moves = {('i', 'i'), ('i', '-i'), ('-i', 'i'), ('-i', '-i')}
-    Piece(coordinates, f'board/assets/{color}/bishop.png', (20, 15), moves, None)
+    Piece(game, coordinates, color, 'bishop', BISHOP_MOVES, None)
 
 
-def create_rook(coordinates: tuple, color: str):
+def create_rook(game: Game, coordinates: tuple, color: str):
     """
     creates a rook
 
+    :param game: the game to place the piece in
     :param coordinates: the coordinates of the chess piece in the form (0-7, 0-7)
     :param color: the color of the piece, can be either 'black' or 'white'
     """
 
-    moves = {(0, 'i'), (0, '-i'), ('i', 0), ('-i', 0)}
-    Piece(coordinates, f'board/assets/{color}/rook.png', (20, 15), moves, None)
+    Piece(game, coordinates, color, 'rook', ROOK_MOVES, None)
 
 
-def create_knight(coordinates: tuple, color: str):
+def create_knight(game: Game, coordinates: tuple, color: str):
     """
     creates a knight
 
+    :param game: the game to place the piece in
     :param coordinates: the coordinates of the chess piece in the form (0-7, 0-7)
     :param color: the color of the piece, can be either 'black' or 'white'
     """
 
-    moves = {(1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)}
-    Piece(coordinates, f'board/assets/{color}/knight.png', (20, 15), moves, None)
+    Piece(game, coordinates, color, 'knight', KNIGHT_MOVES, None)
 
 
-def create_queen(coordinates: tuple, color: str):
+def create_queen(game: Game, coordinates: tuple, color: str):
     """
     creates a queen
 
+    :param game: the game to place the piece in
     :param coordinates: the coordinates of the chess piece in the form (0-7, 0-7)
     :param color: the color of the piece, can be either 'black' or 'white'
     """
 
-    moves = {(0, 'i'), (0, '-i'), ('i', 0), ('-i', 0), ('i', 'i'), ('i', '-i'), ('-i', 'i'), ('-i', '-i')}
-    Piece(coordinates, f'board/assets/{color}/queen.png', (15, 15), moves, None)
+    Piece(game, coordinates, color, 'queen', QUEEN_MOVES, None)
 
 
-def create_king(coordinates: tuple, color: str):
+def create_king(game: Game, coordinates: tuple, color: str):
     """
     creates a king
 
+    :param game: the game to place the piece in
     :param coordinates: the coordinates of the chess piece in the form (0-7, 0-7)
     :param color: the color of the piece, can be either 'black' or 'white'
     """
 
-    specials = {(0, 1): [(generate_king_can_move((0, 1)), generate_king_move((0, 1)))],
-                (1, 1): [(generate_king_can_move((1, 1)), generate_king_move((1, 1)))],
-                (1, 0): [(generate_king_can_move((1, 0)), generate_king_move((1, 0)))],
-                (1, -1): [(generate_king_can_move((1, -1)), generate_king_move((1, -1)))],
-                (0, -1): [(generate_king_can_move((0, -1)), generate_king_move((0, -1)))],
-                (-1, -1): [(generate_king_can_move((-1, -1)), generate_king_move((-1, -1)))],
-                (-1, 0): [(generate_king_can_move((-1, 0)), generate_king_move((-1, 0)))],
-                (-1, 1): [(generate_king_can_move((-1, 1)), generate_king_move((-1, 1)))],
-                (2, 0): [(king_can_castle_right, king_castle_right)],
-                (-2, 0): [(king_can_castle_left, king_castle_left)]}
-    Piece(coordinates, f'board/assets/{color}/king.png', (20, 15), None, specials)
+    Piece(game, coordinates, color, 'king', None, KING_SPECIALS)
 
 
 # ================================================== INITIALIZE BOARD ==================================================
 
 
-def initialize_board():
+def initialize_board(game: Game) -> Game:
     """
     places all the pieces on the board in the correct starting configuration
+
+    :param game: the game to place the pieces in, should be empty
+    :return: the game, useful for writing initialize_board(Game())
     """
 
     # creates the black pieces
-    create_rook((0, 0), 'black')
-    create_knight((1, 0), 'black')
-    create_bishop((2, 0), 'black')
-    create_queen((3, 0), 'black')
-    create_king((4, 0), 'black')
-    create_bishop((5, 0), 'black')
-    create_knight((6, 0), 'black')
-    create_rook((7, 0), 'black')
-    [create_pawn((i, 1), 'black') for i in range(8)]
+    create_rook(game, (0, 0), 'black')
+    create_knight(game, (1, 0), 'black')
+    create_bishop(game, (2, 0), 'black')
+    create_queen(game, (3, 0), 'black')
+    create_king(game, (4, 0), 'black')
+    create_bishop(game, (5, 0), 'black')
+    create_knight(game, (6, 0), 'black')
+    create_rook(game, (7, 0), 'black')
+    [create_pawn(game, (i, 1), 'black') for i in range(8)]
 
     # creates the white pieces
-    [create_pawn((i, 6), 'white') for i in range(8)]
-    create_rook((0, 7), 'white')
-    create_knight((1, 7), 'white')
-    create_bishop((2, 7), 'white')
-    create_queen((3, 7), 'white')
-    create_king((4, 7), 'white')
-    create_bishop((5, 7), 'white')
-    create_knight((6, 7), 'white')
-    create_rook((7, 7), 'white')
-
-    # updates piece moves
-    Piece.update_board()
+    [create_pawn(game, (i, 6), 'white') for i in range(8)]
+    create_rook(game, (0, 7), 'white')
+    create_knight(game, (1, 7), 'white')
+    create_bishop(game, (2, 7), 'white')
+    create_queen(game, (3, 7), 'white')
+    create_king(game, (4, 7), 'white')
+    create_bishop(game, (5, 7), 'white')
+    create_knight(game, (6, 7), 'white')
+    create_rook(game, (7, 7), 'white')
+
+    # updates the key and piece moves
+    game.reset_key()
+    game.update_board()
+    return game
+
+
+# ====================================================== LOAD FEN ======================================================
+
+
+# the function creating the piece of each letter and the color of the piece, upper case letters are white
+CREATE = {letter: (create, 'black') for letter, create in (('p', create_pawn), ('n', create_knight),
+                                                          ('b', create_bishop), ('r', create_rook),
+                                                          ('q', create_queen), ('k', create_king))}
+CREATE.update({letter.upper(): (create, 'white') for letter, (create, _) in tuple(CREATE.items())})
+LETTERS = {'pawn': 'p', 'knight': 'n', 'bishop': 'b', 'rook': 'r', 'queen': 'q', 'king': 'k'}
+
+
+def load_fen(game: Game, fen: str, update: bool = True) -> Game:
+    """
+    places the pieces of a position written in Forsyth-Edwards Notation on the board, for example the starting
+    position is 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'. the castling rights are stored by marking
+    the kings and rooks that have not moved
+
+    :param game: the game to place the pieces in, should be empty
+    :param fen: the position, the move counters can be left out and default to 0 1
+    :param update: true to update the possible moves of the pieces, only needed when the view shows the game since
+        Game.legal_moves and the search do not use them. skipping the update makes loading several times faster
+    :return: the game, useful for writing load_fen(Game(), fen)
+    """
+
+    # splits the fields, the move counters are optional
+    fields = fen.split()
+    if len(fields) not in (4, 6) or len(fields[0].split('/')) != 8 or fields[1] not in ('w', 'b'):
+        raise ValueError(f'invalid FEN {fen!r}')
+    if len(fields) == 6 and not (fields[4].isdigit() and fields[5].isdigit()):
+        raise ValueError(f'invalid FEN {fen!r}')
+
+    # places the pieces, only pawns on their starting row have not moved
+    board = game.board
+    for y, row in enumerate(fields[0].split('/')):
+        x = 0
+        for letter in row:
+            if letter in '12345678':
+                x += int(letter)
+                continue
+            if letter not in CREATE or x > 7:
+                raise ValueError(f'invalid FEN {fen!r}')
+            create, color = CREATE[letter]
+            create(game, (x, y), color)
+            board[x][y].has_not_moved = (letter == 'P' and y == 6) or (letter == 'p' and y == 1)
+            x += 1
+        if x != 8:
+            raise ValueError(f'invalid FEN {fen!r}')
+    if game.white_king is None or game.black_king is None:
+        raise ValueError(f'invalid FEN {fen!r}')
+
+    # marks the kings and rooks of each castling right as not moved
+    for letter, y, x in (('K', 7, 7), ('Q', 7, 0), ('k', 0, 7), ('q', 0, 0)):
+        king, rook = game.board[4][y], game.board[x][y]
+        if letter in fields[2] and king is not None and king.name == 'king' and rook is not None and \
+                rook.name == 'rook':
+            king.has_not_moved = True
+            rook.has_not_moved = True
+
+    # sets the turn, en passant coordinates and move counters then updates the key and piece moves
+    game.turn = 'white' if fields[1] == 'w' else 'black'
+    game.en_passant = parse_square(fields[3]) if fields[3] != '-' else None
+    game.halfmove_clock = int(fields[4]) if len(fields) == 6 else 0
+    game.fullmove_number = max(1, int(fields[5])) if len(fields) == 6 else 1
+    game.reset_key()
+    game.update_board() if update else None
+    return game
+
+
+def save_fen(game: Game) -> str:
+    """
+    writes the position of a game in Forsyth-Edwards Notation, the castling rights come from the kings and rooks that
+    have not moved (see Game.castling_rights)
+
+    :param game: the game to write
+    :return: the position, for example 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+    """
+
+    # writes the pieces row by row from black's side, counting the empty spaces between them
+    board = game.board
+    rows = []
+    for y in range(8):
+        row = ''
+        empty = 0
+        for x in range(8):
+            piece = board[x][y]
+            if piece is None:
+                empty += 1
+                continue
+            letter = LETTERS[piece.name]
+            row += (str(empty) if empty else '') + (letter.upper() if piece.color == 'white' else letter)
+            empty = 0
+        rows.append(row + (str(empty) if empty else ''))
+
+    # writes the turn, castling rights, en passant coordinates and move counters
+    castling = ''.join(letter for bit, letter in enumerate('KQkq') if game.castling >> bit & 1) or '-'
+    en_passant = square_name(game.en_passant) if game.en_passant is not None else '-'
+    return f'{"/".join(rows)} {game.turn[0]} {castling} {en_passant} {game.halfmove_clock} {game.fullmove_number}'
+
+
+# =================================================== LOAD POSITION ====================================================
+
+
+def load_position(game: Game, position: Position, update: bool = True) -> Game:
+    """
+    places the pieces of a compact position on the board, see Position.py. pawns on their starting row and the kings
+    and rooks of the castling rights are marked as not moved like load_fen
+
+    :param game: the game to place the pieces in, should be empty
+    :param position: the position
+    :param update: true to update the possible moves of the pieces, see load_fen
+    :return: the game, useful for writing load_position(Game(), position)
+    """
+
+    # places the pieces
+    for square, code in enumerate(position.squares):
+        if code:
+            x, y = COORDINATES[square]
+            color = 'black' if code & BLACK else 'white'
+            name = NAMES[code & 7]
+            CREATE[LETTERS[name]][0](game, (x, y), color)
+            game.board[x][y].has_not_moved = name == 'pawn' and y == (6 if color == 'white' else 1)
+    if game.white_king is None or game.black_king is None:
+        raise ValueError('invalid position, both kings must be on the board')
+
+    # marks the kings and rooks of each castling right as not moved
+    for bit, (y, x) in enumerate(((7, 7), (7, 0), (0, 7), (0, 0))):
+        king, rook = game.board[4][y], game.board[x][y]
+        if position.castling >> bit & 1 and king is not None and king.name == 'king' and rook is not None and \
+                rook.name == 'rook':
+            king.has_not_moved = True
+            rook.has_not_moved = True
+
+    # sets the turn, en passant coordinates and move counters then updates the key and piece moves
+    game.turn = position.turn
+    game.en_passant = position.en_passant
+    game.halfmove_clock = position.halfmove_clock
+    game.fullmove_number = position.fullmove_number
+    game.reset_key()
+    game.update_board() if update else None
+    return game
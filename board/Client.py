@@ -0,0 +1,99 @@
+from json import dumps, loads
+from queue import Queue, Empty
+from socket import create_connection
+from threading import Thread
+from Notation import parse_move, move_name
+
+
+class Remote:
+    """
+    a class representing the connection of a window to a game on the server (see Server.py), the window only draws the
+    game and sends the moves of the user, the server checks them and sends back the moves of both players. instances
+    of the class contains the following attributes
+        1) socket - the connection to the server
+        2) messages - a queue of the messages from the server, filled by a thread so the window never waits on the
+            network
+        3) color - the color of the user, None until the game starts
+        4) result - the result of the game, None while it is being played
+        5) closed - true once the connection to the server was closed
+
+    class contains the following functions:
+        1) __init__ - connects to the server and joins a game
+        2) listen - reads the messages of the server into the queue
+        3) send - sends a move to the server
+        4) received - takes the moves, errors and the closing of the connection that arrived since the last call
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765):
+        """
+        connects to the server and joins a game
+
+        :param host: the address of the server
+        :param port: the port of the server
+        """
+
+        self.socket = create_connection((host, port))
+        self.messages = Queue()
+        self.color = None
+        self.result = None
+        self.closed = False
+        self.socket.sendall(b'{"type": "join"}\n')
+        Thread(target=self.listen, daemon=True).start()
+
+    def listen(self):
+        """
+        reads the messages of the server into the queue until the connection is closed, the closing of the connection
+        is put on the queue as a message of its own
+        """
+
+        try:
+            with self.socket.makefile('rb') as file:
+                for line in file:
+                    self.messages.put(loads(line))
+        except (OSError, ValueError):
+            pass
+        self.messages.put({'type': 'closed'})
+
+    def send(self, move: tuple):
+        """
+        sends a move to the server
+
+        :param move: the move in the form (start, end, promotion), see Game.legal_moves
+        """
+
+        try:
+            self.socket.sendall(dumps({'type': 'move', 'move': move_name(move)}).encode() + b'\n')
+        except OSError:
+            self.messages.put({'type': 'closed'})
+
+    def received(self) -> list:
+        """
+        takes the messages that arrived since the last call, the start of the game sets the color of the user and the
+        end of the game sets the result
+
+        :return: a list of tuples of the kind and the value of every message to act on, in the order they arrived
+            1) ('move', move) - a move of the other player in the form (start, end, promotion), the moves of the user
+               are already on the board so they are left out
+            2) ('error', reason) - the server did not accept a message of the user, for example an illegal move
+            3) ('closed', reason) - the connection to the server was closed
+        """
+
+        events = []
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except Empty:
+                return events
+            if message['type'] == 'start':
+                self.color = message['color']
+            elif message['type'] == 'move':
+                self.result = message['result']
+                if message['fen'].split()[1] == self.color[0]:
+                    events.append(('move', parse_move(message['move'])))
+            elif message['type'] == 'end':
+                self.result = message['result']
+            elif message['type'] == 'error':
+                events.append(('error', message['message']))
+            elif message['type'] == 'closed' and not self.closed:
+                self.closed = True
+                events.append(('closed', 'the connection to the server was closed'))
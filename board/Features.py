@@ -0,0 +1,165 @@
+from os import makedirs
+from os.path import join
+from Pgn import replay
+try:
+    import numpy
+    from numpy.lib.format import open_memmap
+except ImportError:
+    numpy = None
+
+
+"""
+a few functions for turning positions into arrays of numbers (feature planes) to tune the evaluation or train a model
+on, numpy is only needed by these functions so the rest of the game runs without it:
+
+    1) encode - turns a batch of positions into planes and features at once, without a loop over the positions, and
+       encode_positions for a list of positions (see Position.py)
+    2) write_shards - replays games one at a time and writes their positions to .npy files (shards) of a fixed number
+       of positions, so a dataset can be bigger than the memory
+    3) load_shard - reads a shard as a memory map so its arrays are used straight from the file without a copy
+
+every position is encoded as:
+
+    1) planes - 12 boards of 8 by 8 bytes, one for each piece from the white pawn, knight, bishop, rook, queen and
+       king to the black king, with a 1 on every space the piece is on. the rows start from black's side like the game
+       board so planes[i, plane, y, x] is the space (x, y)
+    2) features - 6 numbers, 1 when it is white's turn, the 4 castling rights in the order of Zobrist.py and the result
+       of the game from white's side, 1 for a win, 0 for a draw, -1 for a loss or -2 if the game did not finish
+"""
+
+
+PLANE_CODES = (1, 2, 3, 4, 5, 6, 9, 10, 11, 12, 13, 14)  # the piece code of each plane, see Position.py
+RESULTS = {'1-0': 1, '1/2-1/2': 0, '0-1': -1, '*': -2}
+
+
+def require_numpy():
+    """
+    raises an ImportError when numpy is not installed
+    """
+
+    if numpy is None:
+        raise ImportError('numpy is needed for feature planes, install it with pip install numpy')
+
+
+def encode(squares: bytes, turns: bytes, castling: bytes, results: bytes = None) -> tuple:
+    """
+    turns a batch of positions into planes and features, the batch is given as flat buffers so a position is added to
+    a batch by copying its 64 byte board (see Game.squares) instead of making an object
+
+    :param squares: the 64 piece codes of every position one after another
+    :param turns: a byte for every position, 1 when it is white's turn and 0 otherwise
+    :param castling: a byte of the castling rights of every position, see Zobrist.py for the order of the bits
+    :param results: a signed byte of the result of the game of every position, see RESULTS, None for unknown results
+    :return: a tuple of the planes, an array of bytes in the shape (positions, 12, 8, 8) and the features, an array of
+        signed bytes in the shape (positions, 6)
+    """
+
+    require_numpy()
+    codes = numpy.frombuffer(squares, numpy.uint8).reshape(-1, 8, 8)
+    planes = (codes[:, None, :, :] == numpy.array(PLANE_CODES, numpy.uint8)[None, :, None, None]).view(numpy.uint8)
+    features = numpy.empty((len(codes), 6), numpy.int8)
+    features[:, 0] = numpy.frombuffer(turns, numpy.uint8)
+    rights = numpy.frombuffer(castling, numpy.uint8)
+    for bit in range(4):
+        features[:, 1 + bit] = rights >> bit & 1
+    features[:, 5] = numpy.frombuffer(results, numpy.int8) if results is not None else RESULTS['*']
+    return planes, features
+
+
+def encode_positions(positions: list) -> tuple:
+    """
+    turns a list of positions into planes and features, see encode
+
+    :param positions: a list of positions, see Position.py
+    :return: a tuple of the planes and the features
+    """
+
+    return encode(b''.join(position.squares for position in positions),
+                  bytes(position.turn == 'white' for position in positions),
+                  bytes(position.castling for position in positions))
+
+
+def write_shard(path: str, squares: bytearray, turns: bytearray, castling: bytearray, results: bytearray):
+    """
+    writes a batch of positions to a shard, the arrays are written straight into memory mapped .npy files
+
+    :param path: the path of the shard without the extension, the files path.planes.npy and path.features.npy are
+        written
+    :param squares: the 64 piece codes of every position one after another
+    :param turns: a byte for every position, 1 when it is white's turn and 0 otherwise
+    :param castling: a byte of the castling rights of every position
+    :param results: a signed byte of the result of the game of every position
+    """
+
+    planes, features = encode(squares, turns, castling, results)
+    for name, array in (('planes', planes), ('features', features)):
+        file = open_memmap(f'{path}.{name}.npy', 'w+', array.dtype, array.shape)
+        file[:] = array
+        file.flush()
+        del file
+
+
+def write_shards(games, directory: str, shard_size: int = 65536, report=None) -> int:
+    """
+    replays games one at a time and writes every position after each move to shards, only the positions of the shard
+    being filled are kept in memory. a game with an illegal move is only replayed up to that move
+
+    :param games: the games in the form (tags, moves, result), see Pgn.read_games
+    :param directory: the directory the shards are written to, as shard-00000.planes.npy, shard-00000.features.npy,
+        shard-00001.planes.npy and so on
+    :param shard_size: the number of positions in each shard, the last shard can have fewer
+    :param report: a function called with a line of text after each shard is written, None if nothing is reported
+    :return: the number of positions written
+    """
+
+    # the positions of the shard being filled, a flat buffer of boards and a byte of each feature per position
+    require_numpy()
+    makedirs(directory, exist_ok=True)
+    squares = bytearray(64 * shard_size)
+    turns = bytearray(shard_size)
+    castling = bytearray(shard_size)
+    results = bytearray(shard_size)
+    count = 0
+    shards = 0
+    total = 0
+    for tags, moves, result in games:
+        value = RESULTS.get(result, RESULTS['*']) & 0xFF
+        try:
+            for game in replay(tags, moves):
+
+                # copies the position into the buffers
+                squares[64 * count:64 * count + 64] = game.squares
+                turns[count] = game.turn == 'white'
+                castling[count] = game.castling
+                results[count] = value
+                count += 1
+
+                # writes the shard when it is full
+                if count == shard_size:
+                    write_shard(join(directory, f'shard-{shards:05}'), squares, turns, castling, results)
+                    shards += 1
+                    total += count
+                    count = 0
+                    report(f'shard {shards}  {total} positions') if report is not None else None
+        except ValueError:
+            continue
+
+    # writes the last shard
+    if count:
+        write_shard(join(directory, f'shard-{shards:05}'), squares[:64 * count], turns[:count], castling[:count],
+                    results[:count])
+        total += count
+        report(f'shard {shards + 1}  {total} positions') if report is not None else None
+    return total
+
+
+def load_shard(path: str) -> tuple:
+    """
+    reads a shard as memory maps, the arrays are read from the file only when they are used
+
+    :param path: the path of the shard without the extension, for example 'dataset/shard-00000'
+    :return: a tuple of the planes and the features, see encode
+    """
+
+    require_numpy()
+    return numpy.load(f'{path}.planes.npy', mmap_mode='r'), numpy.load(f'{path}.features.npy', mmap_mode='r')
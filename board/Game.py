@@ -0,0 +1,733 @@
+from Bitboard import SQUARES, COORDINATES, BETWEEN, STRAIGHT_LINES, DIAGONAL_LINES, KNIGHT_ATTACKS, KING_ATTACKS, \
+    PAWN_ATTACKS, PAWN_PUSHES, bits, rook_attacks, bishop_attacks, piece_attacks
+from Zobrist import PIECE_KEYS, TURN_KEY, EN_PASSANT_KEYS, CASTLING_KEYS, CASTLING_SPACES
+from SpecialMoves import upgrade, pawn_move_one, pawn_move_two, pawn_attack_left, pawn_attack_right, pawn_upgrade, \
+    pawn_attack_left_upgrade, pawn_attack_right_upgrade, pawn_en_passant_left, pawn_en_passant_right, KING_STEPS, \
+    king_castle_left, king_castle_right
+from Position import Position, CODES
+
+
+KING_STEP_SETS = {}  # the space of a king and the spaces it can step to as the key and its special moves as the value
+PAWN_STEP_SETS = {}  # the color, space and pieces in front of a pawn as the key and its special moves as the value
+
+# the castling of the kings on each row, the corner of the rook, the spaces that must be empty, the spaces the king
+# passes through or ends on that must not be attacked, the action and the step of the king
+CASTLES = {row: tuple((corner, sum(1 << SQUARES[x][row] for x in empty), sum(1 << SQUARES[x][row] for x in safe),
+                       action, step)
+                      for corner, empty, safe, action, step in ((0, (1, 2, 3), (2, 3), king_castle_left, -2),
+                                                                (7, (5, 6), (5, 6), king_castle_right, 2)))
+           for row in (0, 7)}
+
+
+class Game:
+    """
+    a class representing a game of chess, every piece belongs to a game so a single process can hold many games at
+    once. instances of the class contains the following attributes
+        1) board - a matrix representing the game board, note board is rotated 90 degrees for easier indexing
+        2) turn - the color of the player whose move it is
+        3) white_king - the white king piece
+        4) black_king - the black king piece
+        5) view - the view drawing the board, None when the game is played headless
+        6) engine - the move generator used by update_moves, either 'bitboard' or 'rays' (the original ray walker)
+        7) bitboards - a dict with the color as the key and a dict of piece name to bitboard as the value, see
+            Bitboard.py for how spaces map to bits
+        8) occupied - a dict with the color as the key and a bitboard of all pieces of that color as the value
+        9) attack_maps - a dict with the color as the key and a bitboard of every space that color attacks as the value
+        10) piece_attacks - a dict with the piece as the key and a bitboard of the spaces it attacks as the value
+        11) changed - a bitboard of the spaces that changed since the attack maps were last updated
+        12) moved - a set of the pieces that were placed since the attack maps were last updated
+        13) en_passant - the coordinates a pawn can move to when attacking en passant, None if there are none
+        14) history - a list of undo records for the moves made so far, see make_move for what is in a record
+        15) castling - the castling rights as a 4 bit number, see Zobrist.py for the order of the bits
+        16) key - the zobrist key of the position, updated with every change to the board
+        17) halfmove_clock - the number of moves since the last kill or pawn move, used for the fifty move rule
+        18) fullmove_number - the number of the current move, starting at 1 and increasing after every move by black
+        19) squares - a bytearray of the piece code on every space indexed like the bitboards, the compact board of the
+            pieces on the board, see Position.py
+        20) reach - a dict with the piece as the key and a bitboard of the spaces whose change can change its possible
+            moves as the value, found when the moves of its color were last updated
+        21) pseudo - a dict with the piece as the key and a tuple of its possible moves and special moves before the
+            moves that leave the king in check were removed and its coordinates when they were found as the value
+        22) updated - a dict with the color as the key and a tuple of a copy of squares and the en passant coordinates
+            when the possible moves of its pieces were last updated by update_board as the value
+        23) repetitions - a dict with the key of every position of the game as the key and the number of times it was
+            reached as the value, updated with every move so a repetition is found without looking through the history
+        24) material - a list of the number of pieces of each piece code on the board, see Position.py for the codes
+        25) result - the result of the game found at the last update_board, '1-0', '0-1' or '1/2-1/2', None if the
+            game is not over
+        26) tablebase - the endgame tables the result of positions with few pieces is looked up in, None if there are
+            none, see Tablebase.py
+        27) bishop_colors - a dict with the color as the key and a list of the number of its bishops on light and on
+            dark spaces as the value, for finding the draws of bishops that can never attack each other
+
+    class contains the following functions:
+        1) __init__ - creates an empty game
+        2) place - places a piece on the board at its coordinates
+        3) remove - removes a piece from the board
+        4) relocate - moves a piece without making a move in the game
+        5) position - takes a compact copy of the position
+        6) castling_rights - finds the castling rights from the kings and rooks that have not moved
+        7) en_passant_key - finds the part of the key that comes from the en passant coordinates
+        8) reset_key - recalculates the castling rights and the key from scratch
+        9) make_move - makes a move and saves an undo record for it
+        10) unmake_move - takes back the last move that was made
+        11) update_attacks - updates the attack maps for the pieces affected by the changed spaces
+        12) step_moves - finds the special moves of a pawn or a king from the bitboards
+        13) attacked - checks if a location is blocked by another pieces moves or not
+        14) in_check - checks if the king of the player whose turn it is is attacked
+        15) legal_moves - generates every legal move for the player whose turn it is
+        16) update_board - updates the moves of the pieces affected by the last moves and finds the result
+        17) draw - checks for a draw by repetition, the fifty move rule or too few pieces to checkmate
+        18) outcome - finds the result of the game
+        19) table_result - finds the result the endgame tables know for the position
+    """
+
+    def __init__(self, engine: str = 'bitboard', tablebase=None):
+        """
+        creates an empty game, use initialize_board to place the pieces
+
+        :param engine: the move generator used by update_moves, either 'bitboard' or 'rays'
+        :param tablebase: the endgame tables the result of positions with few pieces is looked up in, None if there
+            are none
+        """
+
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.turn = 'white'
+        self.white_king = None
+        self.black_king = None
+        self.view = None
+        self.engine = engine
+        self.bitboards = {color: {name: 0 for name in ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')}
+                          for color in ('white', 'black')}
+        self.occupied = {'white': 0, 'black': 0}
+        self.attack_maps = {'white': 0, 'black': 0}
+        self.piece_attacks = {}
+        self.changed = 0
+        self.moved = set()
+        self.en_passant = None
+        self.history = []
+        self.castling = 0
+        self.key = 0
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.squares = bytearray(64)
+        self.reach = {}
+        self.pseudo = {}
+        self.updated = {'white': (bytearray(64), None), 'black': (bytearray(64), None)}
+        self.repetitions = {}
+        self.material = [0] * 16
+        self.result = None
+        self.tablebase = tablebase
+        self.bishop_colors = {'white': [0, 0], 'black': [0, 0]}
+
+    def place(self, piece):
+        """
+        places a piece on the board at its coordinates, any piece already in that spot is removed
+
+        :param piece: the piece to place
+        """
+
+        x, y = piece.coordinates
+        if self.board[x][y] is not None:
+            self.remove(self.board[x][y])
+        self.board[x][y] = piece
+        self.squares[SQUARES[x][y]] = CODES[piece.color][piece.name]
+        self.material[CODES[piece.color][piece.name]] += 1
+        if piece.name == 'bishop':
+            self.bishop_colors[piece.color][(x + y) % 2] += 1
+        bit = 1 << SQUARES[x][y]
+        self.bitboards[piece.color][piece.name] |= bit
+        self.occupied[piece.color] |= bit
+        self.changed |= bit
+        self.moved.add(piece)
+        self.key ^= PIECE_KEYS[piece.color][piece.name][SQUARES[x][y]]
+
+    def remove(self, piece):
+        """
+        removes a piece from the board
+
+        :param piece: the piece to remove
+        """
+
+        x, y = piece.coordinates
+        self.board[x][y] = None
+        self.squares[SQUARES[x][y]] = 0
+        self.material[CODES[piece.color][piece.name]] -= 1
+        if piece.name == 'bishop':
+            self.bishop_colors[piece.color][(x + y) % 2] -= 1
+        bit = 1 << SQUARES[x][y]
+        self.bitboards[piece.color][piece.name] &= ~bit
+        self.occupied[piece.color] &= ~bit
+        self.changed |= bit
+        self.moved.discard(piece)
+        self.piece_attacks.pop(piece, None)
+        self.key ^= PIECE_KEYS[piece.color][piece.name][SQUARES[x][y]]
+
+    def relocate(self, piece, position: tuple):
+        """
+        moves a piece without making a move in the game, the piece in the new location is removed if there is one
+
+        :param piece: the piece to move
+        :param position: the new position of the piece
+        """
+
+        self.remove(piece)
+        piece.coordinates = position
+        self.place(piece)
+
+    def position(self) -> Position:
+        """
+        takes a compact copy of the position, see Position.py
+
+        :return: the position, changing it does not change the game
+        """
+
+        return Position(bytearray(self.squares), self.turn, self.castling, self.en_passant, self.halfmove_clock,
+                        self.fullmove_number, self.key)
+
+    def castling_rights(self) -> int:
+        """
+        finds the castling rights, a right is available while the king and the rook it castles with have not moved
+
+        :return: the castling rights as a 4 bit number, see Zobrist.py for the order of the bits
+        """
+
+        rights = 0
+        for bit, (color, y, x) in enumerate((('white', 7, 7), ('white', 7, 0), ('black', 0, 7), ('black', 0, 0))):
+            king = self.board[4][y]
+            rook = self.board[x][y]
+            king_ready = king is not None and king.name == 'king' and king.color == color and king.has_not_moved
+            rook_ready = rook is not None and rook.name == 'rook' and rook.color == color and rook.has_not_moved
+            rights |= 1 << bit if king_ready and rook_ready else 0
+        return rights
+
+    def en_passant_key(self) -> int:
+        """
+        finds the part of the key that comes from the en passant coordinates, the en passant file is only part of the
+        key when a pawn of the player whose turn it is can attack en passant
+
+        :return: the number to xor into the key
+        """
+
+        if self.en_passant is None:
+            return 0
+        enemy = 'black' if self.turn == 'white' else 'white'
+        attackers = PAWN_ATTACKS[enemy][SQUARES[self.en_passant[0]][self.en_passant[1]]]
+        return EN_PASSANT_KEYS[self.en_passant[0]] if attackers & self.bitboards[self.turn]['pawn'] else 0
+
+    def reset_key(self):
+        """
+        recalculates the castling rights and the key from scratch, used after setting up a position. the position is
+        the first position of the game for finding repetitions
+        """
+
+        self.castling = self.castling_rights()
+        self.key = CASTLING_KEYS[self.castling] ^ self.en_passant_key() ^ (TURN_KEY if self.turn == 'black' else 0)
+        for column in self.board:
+            for piece in column:
+                if piece is not None:
+                    x, y = piece.coordinates
+                    self.key ^= PIECE_KEYS[piece.color][piece.name][SQUARES[x][y]]
+        self.repetitions = {self.key: 1}
+
+    def make_move(self, start: tuple, end: tuple, promotion: str = None):
+        """
+        makes a move, handling kills, en passant, castling and upgrades, and ends the turn. an undo record is saved so
+        the move can be taken back with unmake_move, the record is a tuple of
+            1) the piece that moved
+            2) the coordinates it moved from
+            3) the coordinates it moved to
+            4) the piece that was killed, None if no piece was killed
+            5) has_not_moved of the piece before the move
+            6) the rook that was moved if the king castled, None otherwise
+            7) the en passant coordinates before the move
+            8) the castling rights before the move
+            9) the key before the move
+            10) the halfmove clock before the move
+
+        :param start: the coordinates of the piece to move
+        :param end: the coordinates to move the piece to
+        :param promotion: the name of the piece to upgrade to if a pawn reaches the end of the board, None upgrades to a
+            queen so moves from legal_moves can be passed straight in
+        """
+
+        # gets the piece that moves, the piece that is killed and the rook that moves when the king castles
+        piece = self.board[start[0]][start[1]]
+        killed = self.board[end[0]][end[1]]
+        if piece.name == 'pawn' and end == self.en_passant:
+            killed = self.board[end[0]][start[1]]
+        castles = piece.name == 'king' and abs(end[0] - start[0]) == 2
+        rook = self.board[0 if end[0] == 2 else 7][start[1]] if castles else None
+
+        # saves the undo record and takes the old en passant file out of the key
+        self.history.append((piece, start, end, killed, piece.has_not_moved, rook, self.en_passant, self.castling,
+                             self.key, self.halfmove_clock))
+        self.key ^= self.en_passant_key()
+
+        # moves the rook when the king castles and kills the pawn attacked en passant
+        if rook is not None:
+            self.relocate(rook, (3 if end[0] == 2 else 5, start[1]))
+            rook.has_not_moved = False
+        if killed is not None and killed.coordinates != end:
+            self.remove(killed)
+
+        # moves the piece and upgrades pawns that reach the end of the board
+        self.relocate(piece, end)
+        piece.has_not_moved = False
+        if piece.name == 'pawn' and end[1] in (0, 7):
+            upgrade(piece, promotion if promotion is not None else 'queen').has_not_moved = False
+
+        # updates castling rights when a king or rook moves or is killed
+        if start in CASTLING_SPACES or end in CASTLING_SPACES:
+            castling = self.castling_rights()
+            self.key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+            self.castling = castling
+
+        # updates the move counters, en passant coordinates and turn
+        self.halfmove_clock = 0 if piece.name == 'pawn' or killed is not None else self.halfmove_clock + 1
+        self.fullmove_number += 1 if self.turn == 'black' else 0
+        self.key ^= TURN_KEY
+        double_step = piece.name == 'pawn' and abs(end[1] - start[1]) == 2
+        self.en_passant = (start[0], (start[1] + end[1]) // 2) if double_step else None
+        self.turn = 'black' if self.turn == 'white' else 'white'
+        self.key ^= self.en_passant_key()
+        self.repetitions[self.key] = self.repetitions.get(self.key, 0) + 1
+
+    def unmake_move(self):
+        """
+        takes back the last move that was made using its undo record, see make_move
+        """
+
+        # takes the position out of the repetitions
+        if self.repetitions[self.key] == 1:
+            self.repetitions.pop(self.key)
+        else:
+            self.repetitions[self.key] -= 1
+
+        # moves the piece back, removing the piece it was upgraded to
+        piece, start, end, killed, has_not_moved, rook, en_passant, castling, key, halfmove_clock = self.history.pop()
+        if self.board[end[0]][end[1]] is not piece:
+            self.place(piece)
+        self.relocate(piece, start)
+        piece.has_not_moved = has_not_moved
+
+        # brings back the killed piece and the castled rook
+        self.place(killed) if killed is not None else None
+        if rook is not None:
+            self.relocate(rook, (0 if end[0] == 2 else 7, start[1]))
+            rook.has_not_moved = True
+
+        # restores en passant coordinates, castling rights, key, move counters and turn
+        self.en_passant = en_passant
+        self.castling = castling
+        self.key = key
+        self.halfmove_clock = halfmove_clock
+        self.turn = 'black' if self.turn == 'white' else 'white'
+        self.fullmove_number -= 1 if self.turn == 'black' else 0
+
+    def update_attacks(self):
+        """
+        updates the attack maps, only the pieces that were placed and the sliding pieces whose attacks reached a changed
+        space are updated since no other piece can attack differently after a move
+        """
+
+        # handles when nothing has changed
+        if not self.changed:
+            return
+
+        # updates the attacks of affected pieces
+        occupied = self.occupied['white'] | self.occupied['black']
+        for piece, attacks in self.piece_attacks.items():
+            if attacks & self.changed and piece.name in ('bishop', 'rook', 'queen'):
+                self.moved.add(piece)
+        for piece in self.moved:
+            square = SQUARES[piece.coordinates[0]][piece.coordinates[1]]
+            self.piece_attacks[piece] = piece_attacks(piece.name, piece.color, square, occupied)
+
+        # combines the attacks of each color
+        self.attack_maps = {'white': 0, 'black': 0}
+        for piece, attacks in self.piece_attacks.items():
+            self.attack_maps[piece.color] |= attacks
+        self.changed = 0
+        self.moved.clear()
+
+    def step_moves(self, piece):
+        """
+        finds the special moves of a pawn or a king from the bitboards, the pushes and kills of a pawn and the steps of
+        a king are read from the tables of Bitboard.py so only promotion, en passant and castling need more than a
+        lookup. the moves and actions are the same the pre-tests of SpecialMoves.py find, which the ray walker still
+        uses, see Perft.compare_engines
+
+        :param piece: the pawn or king, its special moves are added to its possible special moves
+        """
+
+        self.update_attacks()
+        x, y = piece.coordinates
+        square = SQUARES[x][y]
+        enemy = 'black' if piece.color == 'white' else 'white'
+        occupied = self.occupied['white'] | self.occupied['black']
+        specials = piece.possible_specials
+
+        # handles when the piece is a king, it steps to every space that is not its own or attacked. the moves of a
+        # space and its targets are kept so they are found once
+        if piece.name == 'king':
+            danger = self.attack_maps[enemy]
+            targets = KING_ATTACKS[square] & ~self.occupied[piece.color] & ~danger
+            found = KING_STEP_SETS.get((square, targets))
+            if found is None:
+                found = KING_STEP_SETS[(square, targets)] = {
+                    COORDINATES[end]: KING_STEPS[(COORDINATES[end][0] - x, COORDINATES[end][1] - y)]
+                    for end in bits(targets)}
+            specials.update(found)
+
+            # castles when the king and rook have not moved, the spaces between are empty and the king does not start,
+            # pass or end in an attack
+            if not piece.has_not_moved or danger >> square & 1:
+                return
+            row = 7 if piece.color == 'white' else 0
+            for corner, empty, safe, action, step in CASTLES[row]:
+                rook = self.board[corner][row]
+                ready = rook is not None and rook.name == 'rook' and rook.has_not_moved
+                if ready and not occupied & empty and not danger & safe:
+                    specials[(x + step, y)] = action
+            return
+
+        # finds the pushes and kills of a pawn from the pieces in front of it, which are kept so they are found once
+        attacks = PAWN_ATTACKS[piece.color][square]
+        key = (piece.color, square, piece.has_not_moved, occupied & PAWN_PUSHES[piece.color][square],
+               self.occupied[enemy] & attacks)
+        found = PAWN_STEP_SETS.get(key)
+        if found is None:
+            found = PAWN_STEP_SETS[key] = {}
+
+            # pushes the pawn one space, or two from where it started, a push to the last row upgrades the pawn
+            step = -8 if piece.color == 'white' else 8
+            forward = -1 if piece.color == 'white' else 1
+            upgrades = y == (1 if piece.color == 'white' else 6)
+            if not occupied >> (square + step) & 1:
+                found[(x, y + forward)] = pawn_upgrade if upgrades else pawn_move_one
+                two = square + 2 * step
+                if piece.has_not_moved and 0 <= two < 64 and not occupied >> two & 1:
+                    found[(x, y + 2 * forward)] = pawn_move_two
+
+            # kills the enemy pieces the pawn attacks
+            for end in bits(attacks & self.occupied[enemy]):
+                left = COORDINATES[end][0] < x
+                if upgrades:
+                    found[COORDINATES[end]] = pawn_attack_left_upgrade if left else pawn_attack_right_upgrade
+                else:
+                    found[COORDINATES[end]] = pawn_attack_left if left else pawn_attack_right
+        specials.update(found)
+
+        # kills the pawn that just moved two spaces past it
+        passed = self.en_passant
+        if passed is not None and passed not in specials and attacks >> SQUARES[passed[0]][passed[1]] & 1:
+            specials[passed] = pawn_en_passant_left if passed[0] < x else pawn_en_passant_right
+
+    def attacked(self, position: tuple, color: str) -> list:
+        """
+        checks if a given position on the board is "blocked" by another piece and would cause the king to be in check
+
+        :param position: the board position to check
+        :param color: the color of the king that will move, for example if king is white then function will see if black
+            moves will cause a check
+        :return: a list of pieces that are attacking this position
+        """
+
+        # looks the position up in the attack map of the other color
+        self.update_attacks()
+        enemy = 'black' if color == 'white' else 'white'
+        square = SQUARES[position[0]][position[1]]
+        if not self.attack_maps[enemy] >> square & 1:
+            return []
+
+        # returns list of attacking pieces
+        return [piece for piece, attacks in self.piece_attacks.items()
+                if piece.color == enemy and attacks >> square & 1]
+
+    def in_check(self) -> bool:
+        """
+        checks if the king of the player whose turn it is is attacked, the check is found straight from the bitboards
+        so it is cheap enough to use at every position of a search
+
+        :return: true if the king is in check, false if it is not
+        """
+
+        enemies = self.bitboards['black' if self.turn == 'white' else 'white']
+        king = self.bitboards[self.turn]['king'].bit_length() - 1
+        occupied = self.occupied['white'] | self.occupied['black']
+        return bool(KNIGHT_ATTACKS[king] & enemies['knight'] or PAWN_ATTACKS[self.turn][king] & enemies['pawn'] or
+                    rook_attacks(king, occupied) & (enemies['rook'] | enemies['queen']) or
+                    bishop_attacks(king, occupied) & (enemies['bishop'] | enemies['queen']))
+
+    def legal_moves(self, kills: bool = False):
+        """
+        generates every legal move for the player whose turn it is in a single pass. the checks on the king and the pins
+        on its pieces are found first so every move that is generated is legal and nothing has to be made and taken back
+
+        :param kills: true to only generate kills and upgrades, used by the search to look at trades past its depth
+        :return: a generator of moves in the form (start, end, promotion) where start and end are coordinates and
+            promotion is the name of the piece a pawn upgrades to, or None if the move is not an upgrade
+        """
+
+        # gets the bitboards of both colors
+        color = self.turn
+        enemy = 'black' if color == 'white' else 'white'
+        pieces = self.bitboards[color]
+        enemies = self.bitboards[enemy]
+        own = self.occupied[color]
+        occupied = own | self.occupied[enemy]
+        king = pieces['king'].bit_length() - 1
+        straight_enemies = enemies['rook'] | enemies['queen']
+        diagonal_enemies = enemies['bishop'] | enemies['queen']
+
+        # finds the pieces checking the king
+        checkers = KNIGHT_ATTACKS[king] & enemies['knight'] | PAWN_ATTACKS[color][king] & enemies['pawn']
+        checkers |= rook_attacks(king, occupied) & straight_enemies | bishop_attacks(king, occupied) & diagonal_enemies
+
+        # finds the spaces the king cannot move to, the king is taken off the board so it cannot hide behind itself
+        without_king = occupied ^ pieces['king']
+        danger = KING_ATTACKS[enemies['king'].bit_length() - 1]
+        for square in bits(enemies['pawn']):
+            danger |= PAWN_ATTACKS[enemy][square]
+        for square in bits(enemies['knight']):
+            danger |= KNIGHT_ATTACKS[square]
+        for square in bits(straight_enemies):
+            danger |= rook_attacks(square, without_king)
+        for square in bits(diagonal_enemies):
+            danger |= bishop_attacks(square, without_king)
+
+        # generates king moves
+        start = COORDINATES[king]
+        king_targets = self.occupied[enemy] if kills else ~own
+        for square in bits(KING_ATTACKS[king] & king_targets & ~danger):
+            yield start, COORDINATES[square], None
+
+        # only the king can move when it is checked twice
+        if checkers & (checkers - 1):
+            return
+
+        # finds the spaces that capture the checking piece or block its check
+        if checkers:
+            check_mask = checkers | BETWEEN[king][checkers.bit_length() - 1]
+        else:
+            check_mask = -1
+
+            # generates castling moves, the rooks must not have moved and the king cannot pass through an attack
+            king_piece = self.board[start[0]][start[1]]
+            for corner, between, path, end in ((0, (1, 2, 3), (2, 3), 2), (7, (5, 6), (5, 6), 6)):
+                rook = self.board[corner][start[1]]
+                if kills or not king_piece.has_not_moved or rook is None or rook.name != 'rook' or rook.color != color:
+                    continue
+                empty = not any(occupied >> SQUARES[x][start[1]] & 1 for x in between)
+                safe = not any(danger >> SQUARES[x][start[1]] & 1 for x in path)
+                if rook.has_not_moved and empty and safe:
+                    yield start, (end, start[1]), None
+
+        # finds the pinned pieces and the line each one has to stay on
+        pins = {}
+        snipers = STRAIGHT_LINES[king] & straight_enemies | DIAGONAL_LINES[king] & diagonal_enemies
+        for square in bits(snipers):
+            blockers = BETWEEN[king][square] & occupied
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pins[blockers.bit_length() - 1] = BETWEEN[king][square] | 1 << square
+
+        # generates knight, bishop, rook and queen moves
+        targets = (self.occupied[enemy] if kills else ~own) & check_mask
+        for name in ('knight', 'bishop', 'rook', 'queen'):
+            for square in bits(pieces[name]):
+                moves = piece_attacks(name, color, square, occupied) & targets & pins.get(square, -1)
+                start = COORDINATES[square]
+                for end in bits(moves):
+                    yield start, COORDINATES[end], None
+
+        # generates pawn moves, including double steps, en passant and upgrades
+        forward = -8 if color == 'white' else 8
+        double_row, last_row = (6, 0) if color == 'white' else (1, 7)
+        en_passant = 1 << SQUARES[self.en_passant[0]][self.en_passant[1]] if self.en_passant is not None else 0
+        for square in bits(pieces['pawn']):
+            pin = pins.get(square, -1)
+            moves = PAWN_ATTACKS[color][square] & self.occupied[enemy]
+            if not occupied >> square + forward & 1 and (not kills or (square + forward) // 8 == last_row):
+                moves |= 1 << square + forward
+                if not kills and square // 8 == double_row and not occupied >> square + 2 * forward & 1:
+                    moves |= 1 << square + 2 * forward
+            moves &= check_mask & pin
+
+            # en passant is legal when it captures the checking pawn and the king is not left open along the row
+            if PAWN_ATTACKS[color][square] & en_passant & pin:
+                killed = en_passant.bit_length() - 1 - forward
+                if check_mask & (en_passant | 1 << killed):
+                    after = occupied ^ (1 << square | 1 << killed | en_passant)
+                    open_straight = rook_attacks(king, after) & straight_enemies
+                    open_diagonal = bishop_attacks(king, after) & diagonal_enemies
+                    moves |= en_passant if not (open_straight or open_diagonal) else 0
+
+            # yields moves, moves to the last row are yielded once for every upgrade
+            start = COORDINATES[square]
+            for end in bits(moves):
+                if end // 8 == last_row:
+                    for promotion in ('queen', 'rook', 'bishop', 'knight'):
+                        yield start, COORDINATES[end], promotion
+                else:
+                    yield start, COORDINATES[end], None
+
+    def update_board(self, full: bool = False):
+        """
+        updates the board by performing the following actions
+            1) finds the moves of the player whose turn it is from legal_moves
+            2) updates the possible moves of the pieces of the other player affected by the spaces that changed since
+               they were last updated
+            3) finds the result of the game, see outcome
+
+        the moves of the player whose turn it is come straight from legal_moves so they are never found twice, the
+        actions of the special moves of its pawns and kings are found with step_moves. a piece of the other player is
+        affected when it moved or a space it attacks, or a pawn could move to, changed. the moves of the other pieces
+        are the same as when they were last updated so they are copied instead of found again. kings are always updated
+        since castling and their special moves depend on the attacks of every enemy piece
+
+        :param full: true to update the moves of every piece with update_moves and remove the moves that leave the king
+            in check, used to check the moves found from legal_moves and the update of only the affected pieces
+        """
+
+        # finds the spaces that changed since the pieces of the other player were last updated from the bytes of the
+        # compact board that differ, the en passant spaces count as changed when they change
+        enemy = 'black' if self.turn == 'white' else 'white'
+        squares, en_passant = self.updated[enemy]
+        difference = int.from_bytes(squares, 'little') ^ int.from_bytes(self.squares, 'little')
+        changed = 0
+        while difference:
+            square = ((difference & -difference).bit_length() - 1) // 8
+            changed |= 1 << square
+            difference &= ~(0xFF << 8 * square)
+        if en_passant != self.en_passant:
+            for coordinates in (en_passant, self.en_passant):
+                changed |= 1 << SQUARES[coordinates[0]][coordinates[1]] if coordinates is not None else 0
+        colors = ('white', 'black') if full else (enemy,)
+        for color in colors:
+            self.updated[color] = (bytearray(self.squares), self.en_passant)
+
+        # updates the moves of the affected pieces and copies back the moves of the rest, the moves of the pieces of
+        # the player whose turn it is are kept for when they are next updated
+        occupied = self.occupied['white'] | self.occupied['black']
+        reach = {piece: spaces for piece, spaces in self.reach.items() if piece.color not in colors}
+        pseudo = {piece: found for piece, found in self.pseudo.items() if piece.color not in colors}
+        for square in bits(self.occupied[colors[0]] | self.occupied[colors[-1]]):
+            x, y = COORDINATES[square]
+            piece = self.board[x][y]
+
+            # copies back the moves when the piece is on the same space and none of the spaces it reaches changed, the
+            # space is checked since a taken back move can leave the same kind of piece where it was
+            found = self.pseudo.get(piece)
+            unchanged = found is not None and found[2] == piece.coordinates and not self.reach[piece] & changed
+            if not full and piece.name != 'king' and unchanged:
+                reach[piece] = self.reach[piece]
+                pseudo[piece] = found
+                piece.possible_moves.clear()
+                piece.possible_moves.update(found[0])
+                piece.possible_specials.clear()
+                piece.possible_specials.update(found[1])
+                continue
+            piece.update_moves()
+            pseudo[piece] = (set(piece.possible_moves), dict(piece.possible_specials), piece.coordinates)
+
+            # finds the spaces the moves of the piece depend on, a pawn also depends on the spaces in front of it
+            reach[piece] = piece_attacks(piece.name, piece.color, square, occupied) | 1 << square
+            if piece.name == 'pawn':
+                step = -8 if piece.color == 'white' else 8
+                reach[piece] |= 1 << (square + step)
+                reach[piece] |= 1 << (square + 2 * step) if 0 <= square + 2 * step < 64 else 0
+        self.reach = reach
+        self.pseudo = pseudo
+
+        # finds the legal moves of the player whose turn it is
+        legal = {}
+        for start, end, promotion in self.legal_moves():
+            legal.setdefault(start, set()).add(end)
+        for square in bits(self.occupied[self.turn]):
+            x, y = COORDINATES[square]
+            piece = self.board[x][y]
+
+            # handles when the moves were found by update_moves, only the legal ones are kept
+            ends = legal.get((x, y), ())
+            if full:
+                piece.possible_moves.intersection_update(ends)
+                for move in tuple(piece.possible_specials.keys()):
+                    if move not in ends:
+                        piece.possible_specials.pop(move)
+                continue
+
+            # sorts the legal moves into moves and special moves, the special moves of pawns and kings are found from
+            # the bitboards and only the legal ones are kept
+            piece.possible_moves.clear()
+            piece.possible_specials.clear()
+            if piece.name not in ('pawn', 'king'):
+                piece.possible_moves.update(ends)
+                continue
+            self.step_moves(piece)
+            for move in tuple(piece.possible_specials.keys()):
+                if move not in ends:
+                    piece.possible_specials.pop(move)
+
+        # finds the result of the game from the legal moves that were already found
+        self.result = self.outcome(bool(legal))
+
+    def draw(self) -> str:
+        """
+        checks for a draw by the rules, the position is a draw when it was reached three times, after 50 moves by each
+        player without a kill or a pawn move, or when neither player can ever checkmate: a king against a king, a king
+        and a bishop or knight against a king, or a king and a bishop against a king and a bishop on the same color of
+        spaces. the counters are kept up to date by every move so the check takes the same time at any point of a game
+
+        :return: 'repetition', 'fifty moves' or 'material', None if the position is not a draw
+        """
+
+        if self.repetitions.get(self.key, 0) >= 3:
+            return 'repetition'
+        if self.halfmove_clock >= 100:
+            return 'fifty moves'
+
+        # checks the material from the piece codes, pawns, rooks and queens can always checkmate
+        material = self.material
+        if material[1] or material[4] or material[5] or material[9] or material[12] or material[13]:
+            return None
+        white = material[2] + material[3]
+        black = material[10] + material[11]
+        if white + black <= 1:
+            return 'material'
+
+        # handles when each player has a single bishop, they can never be attacked when they are on the same color
+        bishops = white == black == material[3] == material[11] == 1
+        return 'material' if bishops and self.bishop_colors['white'] == self.bishop_colors['black'] else None
+
+    def outcome(self, moves: bool = None) -> str:
+        """
+        finds the result of the game, the game is over after a checkmate, a stalemate, a draw by the rules (see draw)
+        or when the endgame tables show neither player can checkmate. a position the tables know is won is still
+        played to the checkmate
+
+        :param moves: true if the player whose turn it is has a legal move, None to find out
+        :return: '1-0', '0-1' or '1/2-1/2', None if the game is not over
+        """
+
+        # handles when there are no moves, a checkmate when the king is in check and a stalemate otherwise
+        moves = next(self.legal_moves(), None) is not None if moves is None else moves
+        if not moves and self.in_check():
+            return '0-1' if self.turn == 'white' else '1-0'
+        if not moves or self.draw() is not None or self.table_result() == '1/2-1/2':
+            return '1/2-1/2'
+        return None
+
+    def table_result(self) -> str:
+        """
+        finds the result the endgame tables know for the position, the result both players get with perfect play
+
+        :return: '1-0', '0-1' or '1/2-1/2', None if there are no tables or the position is not in a table
+        """
+
+        found = self.tablebase.probe(self) if self.tablebase is not None else None
+        if found is None:
+            return None
+        if found[0] == 0:
+            return '1/2-1/2'
+        return '1-0' if (found[0] == 1) == (self.turn == 'white') else '0-1'
@@ -0,0 +1,59 @@
+"""
+a few functions for converting between board coordinates and chess notation:
+
+    1) the name of a space, for example (4, 6) is 'e2' since the board starts at the top left corner from black's side
+    2) the name of a move in long algebraic notation (the notation used by UCI), for example 'e2e4' or 'e7e8q'
+"""
+
+
+PROMOTION_LETTERS = {'queen': 'q', 'rook': 'r', 'bishop': 'b', 'knight': 'n'}
+PROMOTION_NAMES = {letter: name for name, letter in PROMOTION_LETTERS.items()}
+
+
+def square_name(coordinates: tuple) -> str:
+    """
+    finds the name of a space
+
+    :param coordinates: the coordinates of the space in the form (0-7, 0-7)
+    :return: the name of the space, for example 'e2'
+    """
+
+    return 'abcdefgh'[coordinates[0]] + str(8 - coordinates[1])
+
+
+def parse_square(name: str) -> tuple:
+    """
+    finds the coordinates of a space from its name
+
+    :param name: the name of the space, for example 'e2'
+    :return: the coordinates of the space in the form (0-7, 0-7)
+    """
+
+    if len(name) != 2 or name[0] not in 'abcdefgh' or name[1] not in '12345678':
+        raise ValueError(f'invalid space {name!r}')
+    return 'abcdefgh'.index(name[0]), 8 - int(name[1])
+
+
+def move_name(move: tuple) -> str:
+    """
+    finds the long algebraic name of a move
+
+    :param move: the move in the form (start, end, promotion), see Game.legal_moves
+    :return: the name of the move, for example 'e2e4' or 'e7e8q'
+    """
+
+    promotion = PROMOTION_LETTERS[move[2]] if move[2] is not None else ''
+    return square_name(move[0]) + square_name(move[1]) + promotion
+
+
+def parse_move(name: str) -> tuple:
+    """
+    finds a move from its long algebraic name, the move is not checked against the rules
+
+    :param name: the name of the move, for example 'e2e4' or 'e7e8q'
+    :return: the move in the form (start, end, promotion)
+    """
+
+    if len(name) not in (4, 5) or (len(name) == 5 and name[4] not in PROMOTION_NAMES):
+        raise ValueError(f'invalid move {name!r}')
+    return parse_square(name[0:2]), parse_square(name[2:4]), PROMOTION_NAMES[name[4]] if len(name) == 5 else None
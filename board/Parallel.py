@@ -0,0 +1,209 @@
+from multiprocessing import Process, Queue, Event, cpu_count
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter
+from Board import load_fen, save_fen
+from Game import Game
+from Search import Search, TimeUp
+from Transposition import TranspositionTable, table_bytes
+
+
+"""
+a search spread over several processes so it can use more than one core (python only runs one thread at a time in a
+process). the search is a lazy SMP search:
+
+    1) every process searches the same position with its own iterative deepening
+    2) the processes share one transposition table in shared memory, so the positions one process searched are cutoffs
+       or good first moves for the others
+    3) half of the helper processes search one move deeper than the main process at every depth so they fill the table
+       with positions the main process has not reached yet
+    4) the move of the main process is played, the helpers are stopped as soon as it returns
+
+the helper processes are started once and wait for positions, a position is sent to them as a FEN string since pieces
+cannot be sent between processes
+"""
+
+
+class Helper(Search):
+    """
+    a class representing the search run by a helper process, it stops when the main process finishes its search.
+    instances of the class contains the following attributes on top of the attributes of Search
+        1) event - the event set by the main process when its search is done
+        2) offset - the number of moves deeper than the main process this helper searches at every depth
+
+    class contains the following functions:
+        1) __init__ - creates a helper search
+        2) root - searches the moves of the root position offset moves deeper
+        3) tick - counts a position and checks if the main process is done
+    """
+
+    def __init__(self, game: Game, table: TranspositionTable, event: Event, offset: int):
+        """
+        creates a helper search
+
+        :param game: the game to search
+        :param table: the transposition table shared with the main process
+        :param event: the event set by the main process when its search is done
+        :param offset: the number of moves deeper than the main process to search
+        """
+
+        super().__init__(game, table=table)
+        self.event = event
+        self.offset = offset
+
+    def root(self, moves: list, best: tuple, depth: int) -> tuple:
+        """
+        searches the moves of the root position offset moves deeper, see Search.root
+        """
+
+        return super().root(moves, best, depth + self.offset)
+
+    def tick(self):
+        """
+        counts a position and checks if the search must stop, see Search.tick
+
+        :raises TimeUp: when the main process is done
+        """
+
+        super().tick()
+        if not self.nodes & 255 and self.event.is_set():
+            raise TimeUp
+
+
+def work(name: str, megabytes: float, commands: Queue, done: Queue, event: Event, offset: int):
+    """
+    runs in a helper process, searching every position it is sent until it is sent None
+
+    :param name: the name of the shared memory holding the transposition table
+    :param megabytes: the memory of the transposition table
+    :param commands: the queue the positions are sent on, as tuples of (FEN, generation of the table)
+    :param done: the queue the helper puts None on after each search so the main process knows it stopped
+    :param event: the event set by the main process when its search is done
+    :param offset: the number of moves deeper than the main process to search
+    """
+
+    memory = SharedMemory(name=name)
+    table = TranspositionTable(megabytes, memory.buf)
+    command = commands.get()
+    while command is not None:
+        fen, generation = command
+        table.generation = generation
+        Helper(load_fen(Game(), fen), table, event, offset).best_move(None)
+        done.put(None)
+        command = commands.get()
+    table.entries.release()
+    memory.close()
+
+
+class ParallelSearch:
+    """
+    a class representing a lazy SMP search of a game over several processes, used like Search. instances of the class
+    contains the following attributes
+        1) game - the game being searched
+        2) memory - the shared memory holding the transposition table
+        3) table - the transposition table shared by every process
+        4) search - the search of the main process, set search.stop to end the search early
+        5) event - the event set when the main process is done so the helpers stop
+        6) done - the queue the helpers report on when they stopped
+        7) commands - a list of the queue each helper is sent positions on
+        8) helpers - a list of the helper processes
+
+    class contains the following functions:
+        1) __init__ - creates the shared table and starts the helper processes
+        2) best_move - finds the best move, see Search.best_move
+        3) close - stops the helper processes and frees the shared memory
+    """
+
+    def __init__(self, game: Game, workers: int = None, megabytes: float = 16, report=None):
+        """
+        creates the shared table and starts the helper processes
+
+        :param game: the game to search
+        :param workers: the number of processes to search with, including the main process, None for one per core
+        :param megabytes: the memory of the shared transposition table
+        :param report: a function called with (depth, score, nodes, seconds, principal variation) after every depth of
+            the main process
+        """
+
+        # creates the shared table
+        workers = workers if workers is not None else cpu_count()
+        self.game = game
+        self.memory = SharedMemory(create=True, size=table_bytes(megabytes))
+        self.table = TranspositionTable(megabytes, self.memory.buf)
+        self.search = Search(game, report, self.table)
+
+        # starts the helpers, every second helper searches one move deeper
+        self.event = Event()
+        self.done = Queue()
+        self.commands = [Queue() for _ in range(workers - 1)]
+        self.helpers = [Process(target=work, args=(self.memory.name, megabytes, commands, self.done, self.event,
+                                                   index % 2), daemon=True)
+                        for index, commands in enumerate(self.commands, 1)]
+        [helper.start() for helper in self.helpers]
+
+    def best_move(self, time_limit: float = 1.0, depth: int = None, nodes: int = None) -> tuple:
+        """
+        finds the best move for the player whose turn it is, the helpers search while the main process does and are
+        stopped when it returns
+
+        :param time_limit: the number of seconds the search may take, None if there is no time limit
+        :param depth: the deepest depth the main process searches, None if there is no depth limit
+        :param nodes: the number of positions the main process may search, None if there is no limit
+        :return: the best move in the form (start, end, promotion), see Game.legal_moves, or None if there are no moves
+        """
+
+        # sends the position to the helpers, the table moves to the next generation in every process
+        self.event.clear()
+        fen = save_fen(self.game)
+        [commands.put((fen, self.table.generation)) for commands in self.commands]
+
+        # searches and waits for the helpers to stop so they do not search the next position with the old one
+        try:
+            return self.search.best_move(time_limit, depth, nodes)
+        finally:
+            self.event.set()
+            [self.done.get() for _ in self.helpers]
+
+    def close(self):
+        """
+        stops the helper processes and frees the shared memory
+        """
+
+        [commands.put(None) for commands in self.commands]
+        [helper.join() for helper in self.helpers]
+        self.table.entries.release()
+        self.memory.close()
+        self.memory.unlink()
+
+
+def speedup(game: Game, depth: int, workers: list, megabytes: float = 16, report=print) -> dict:
+    """
+    measures how much faster the parallel search reaches a depth than the search of a single process
+
+    :param game: the game to search
+    :param depth: the depth to search to
+    :param workers: the numbers of processes to measure
+    :param megabytes: the memory of the transposition table
+    :param report: the function called with a line of text for every measurement
+    :return: a dict with the number of processes as the key and the speedup as the value
+    """
+
+    # times the search of a single process with an empty table
+    start = perf_counter()
+    Search(game, table=TranspositionTable(megabytes)).best_move(None, depth)
+    single = perf_counter() - start
+    report(f'1 process (no shared memory)  depth {depth} in {single:.2f}s')
+
+    # times the parallel search with an empty table for every number of processes
+    speedups = {}
+    for count in workers:
+        search = ParallelSearch(game, count, megabytes)
+        try:
+            start = perf_counter()
+            search.best_move(None, depth)
+            elapsed = perf_counter() - start
+        finally:
+            search.close()
+        speedups[count] = single / max(elapsed, 1e-9)
+        name = 'process' if count == 1 else 'processes'
+        report(f'{count} {name}  depth {depth} in {elapsed:.2f}s  speedup {speedups[count]:.2f}x')
+    return speedups
@@ -0,0 +1,221 @@
+from time import perf_counter
+from Board import load_fen, save_fen
+from Game import Game
+from Notation import move_name
+
+
+"""
+a few functions for checking the move generation by counting every position reachable in a number of moves (perft):
+
+    1) perft - counts the positions using Game.legal_moves
+    2) perft_pieces - counts the positions using update_board and the possible moves of each piece, this is slower but
+       checks the moves the view lets the user make
+    3) divide - counts the positions after each move, used to find the move where the counts diverge
+    4) run_suite - counts the positions of standard positions and raises an error when a count is wrong
+    5) compare_updates - checks update_board gives the same possible moves when it only updates the pieces affected
+       by the last moves as when it updates every piece
+    6) compare_engines - checks the ray walker and the bitboard engine (see Game.engine) give the same possible moves
+
+the counts of the standard positions are the published counts from https://www.chessprogramming.org/Perft_Results
+"""
+
+
+SUITE = (('start', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+          (20, 400, 8902, 197281, 4865609)),
+         ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+          (48, 2039, 97862, 4085603, 193690690)),
+         ('position 3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+          (14, 191, 2812, 43238, 674624)),
+         ('position 4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+          (6, 264, 9467, 422333, 15833292)),
+         ('position 5', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+          (44, 1486, 62379, 2103487, 89941194)),
+         ('position 6', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+          (46, 2079, 89890, 3894594, 164075551)))
+
+
+def perft(game: Game, depth: int) -> int:
+    """
+    counts the positions reachable from the current position in a number of moves
+
+    :param game: the game to count from, the game is back in its position when the function returns
+    :param depth: the number of moves
+    :return: the number of positions
+    """
+
+    # the moves at the last depth are counted without being made
+    if depth == 0:
+        return 1
+    moves = list(game.legal_moves())
+    if depth == 1:
+        return len(moves)
+
+    # counts the positions after every move
+    nodes = 0
+    for move in moves:
+        game.make_move(*move)
+        nodes += perft(game, depth - 1)
+        game.unmake_move()
+    return nodes
+
+
+def piece_moves(game: Game) -> list:
+    """
+    finds the moves the view lets the user make from the possible moves and special moves of each piece
+
+    :param game: the game, update_board must have been called for the current position
+    :return: a list of moves in the form (start, end, promotion), see Game.legal_moves
+    """
+
+    moves = []
+    for column in game.board:
+        for piece in column:
+            if piece is not None and piece.color == game.turn:
+                for end in piece.possible_moves.union(piece.possible_specials.keys()):
+                    if piece.name == 'pawn' and end[1] in (0, 7):
+                        moves += [(piece.coordinates, end, name) for name in ('queen', 'rook', 'bishop', 'knight')]
+                    else:
+                        moves.append((piece.coordinates, end, None))
+    return moves
+
+
+def perft_pieces(game: Game, depth: int) -> int:
+    """
+    counts the positions reachable from the current position in a number of moves using update_board and the possible
+    moves of each piece instead of Game.legal_moves
+
+    :param game: the game to count from, the game is back in its position when the function returns
+    :param depth: the number of moves
+    :return: the number of positions
+    """
+
+    # finds the moves, a checkmate has no moves
+    if depth == 0:
+        return 1
+    game.update_board()
+    moves = piece_moves(game)
+    if depth == 1:
+        return len(moves)
+
+    # counts the positions after every move
+    nodes = 0
+    for move in moves:
+        game.make_move(*move)
+        nodes += perft_pieces(game, depth - 1)
+        game.unmake_move()
+    return nodes
+
+
+def compare_updates(game: Game, depth: int) -> int:
+    """
+    checks update_board gives the same possible moves when it finds the moves of the player whose turn it is from
+    legal_moves and only updates the affected pieces of the other player as when it updates every piece, in every
+    position reachable in a number of moves
+
+    :param game: the game to check from, the game is back in its position when the function returns
+    :param depth: the number of moves
+    :return: the number of positions checked, a ValueError is raised at the first position where the moves differ
+    """
+
+    # updates only the affected pieces then every piece
+    found = []
+    for full in (False, True):
+        game.update_board(full)
+        found.append({piece: (set(piece.possible_moves), dict(piece.possible_specials))
+                      for column in game.board for piece in column if piece is not None})
+    if found[0] != found[1]:
+        raise ValueError(f'the possible moves of the pieces differ in {save_fen(game)}')
+
+    # checks the positions after every move
+    if depth == 0:
+        return 1
+    positions = 1
+    for move in piece_moves(game):
+        game.make_move(*move)
+        positions += compare_updates(game, depth - 1)
+        game.unmake_move()
+    return positions
+
+
+def compare_engines(games: tuple, depth: int) -> int:
+    """
+    checks the ray walker and the bitboard engine give the same possible moves and special moves in every position
+    reachable in a number of moves, the pieces of the two games are matched by their coordinates. every piece is
+    updated with update_moves since the moves of the player whose turn it is otherwise come from legal_moves
+
+    :param games: a tuple of two games of the same position, one with each engine, both games are back in their
+        position when the function returns
+    :param depth: the number of moves
+    :return: the number of positions checked, a ValueError is raised at the first position where the moves differ
+    """
+
+    # updates both games
+    found = []
+    for game in games:
+        game.update_board(True)
+        found.append({piece.coordinates: (set(piece.possible_moves), dict(piece.possible_specials))
+                      for column in game.board for piece in column if piece is not None})
+    if found[0] != found[1]:
+        raise ValueError(f'the engines give different possible moves in {save_fen(games[0])}')
+
+    # checks the positions after every move
+    if depth == 0:
+        return 1
+    positions = 1
+    for move in piece_moves(games[0]):
+        [game.make_move(*move) for game in games]
+        positions += compare_engines(games, depth - 1)
+        [game.unmake_move() for game in games]
+    return positions
+
+
+def divide(game: Game, depth: int, count=perft) -> dict:
+    """
+    counts the positions reachable after each move
+
+    :param game: the game to count from
+    :param depth: the number of moves, including the first move
+    :param count: the function used to count the positions after the first move, either perft or perft_pieces
+    :return: a dict with the long algebraic name of each move as the key and the number of positions as the value
+    """
+
+    moves = piece_moves(game) if count is perft_pieces else list(game.legal_moves())
+    counts = {}
+    for move in moves:
+        game.make_move(*move)
+        counts[move_name(move)] = count(game, depth - 1)
+        game.unmake_move()
+    return counts
+
+
+def run_suite(depth: int, count=perft, report=print) -> float:
+    """
+    counts the positions of every standard position up to a depth and reports the speed
+
+    :param depth: the deepest depth to count, from 1 to 5
+    :param count: the function used to count the positions, either perft or perft_pieces
+    :param report: the function called with a line of text for every count
+    :return: the number of positions counted per second over the whole suite
+    :raises AssertionError: when a count differs from the published count
+    """
+
+    total_nodes = 0
+    total_time = 0
+    for name, fen, counts in SUITE:
+        for current in range(1, depth + 1):
+
+            # counts the positions and times the count
+            game = load_fen(Game(), fen)
+            start = perf_counter()
+            nodes = count(game, current)
+            elapsed = perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            report(f'{name:<11} depth {current}  {nodes:>10} nodes  {nodes / max(elapsed, 1e-9):>10.0f} nodes/sec')
+
+            # fails when the count is wrong
+            if nodes != counts[current - 1]:
+                raise AssertionError(f'{name} depth {current}: counted {nodes} but expected {counts[current - 1]}')
+
+    report(f'total {total_nodes} nodes in {total_time:.2f}s, {total_nodes / max(total_time, 1e-9):.0f} nodes/sec')
+    return total_nodes / max(total_time, 1e-9)
@@ -0,0 +1,235 @@
+from re import compile
+from Board import initialize_board, load_fen
+from Game import Game
+from Notation import square_name, parse_square
+from Perft import piece_moves
+
+
+"""
+a few functions for reading and writing games in Portable Game Notation (PGN):
+
+    1) the name of a move in standard algebraic notation (SAN), for example 'Nf3', 'exd5', 'O-O' or 'e8=Q+', which needs
+       the game to know which pieces could also reach the space and if the move checks
+    2) the text of a whole game, made of tag pairs such as [White "..."] followed by the numbered moves and the result
+    3) reading games one at a time from a file of any size, skipping comments, variations and annotations
+    4) finding the move of a standard algebraic name and replaying a game through the rules, one position at a time
+
+games are read as tuples of (tags, moves, result) where tags is a dict of the tag pairs, moves is a list of the standard
+algebraic names of the moves and result is the result written after the moves, the same arguments write_game takes
+"""
+
+
+LETTERS = {'pawn': '', 'knight': 'N', 'bishop': 'B', 'rook': 'R', 'queen': 'Q', 'king': 'K'}
+NAMES = {letter: name for name, letter in LETTERS.items()}
+SEVEN_TAGS = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+TAG = compile(r'\[\s*(\w+)\s*"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN = compile(r'[{}();]|\$\d+|\d+\.+|1-0|0-1|1/2-1/2|\*|[^\s{}();$]+')
+SAN = compile(r'([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?')
+
+
+def san(game: Game, move: tuple) -> str:
+    """
+    finds the standard algebraic name of a move, the move must be legal in the current position
+
+    :param game: the game, the game is back in its position when the function returns
+    :param move: the move in the form (start, end, promotion), see Game.legal_moves
+    :return: the name of the move, for example 'Nf3', 'exd5', 'O-O' or 'e8=Q+'
+    """
+
+    # handles castling
+    (x, y), end, promotion = move
+    piece = game.board[x][y]
+    if piece.name == 'king' and abs(end[0] - x) == 2:
+        name = 'O-O' if end[0] == 6 else 'O-O-O'
+
+    # names pawn moves by the file they leave when they kill
+    elif piece.name == 'pawn':
+        kills = end[0] != x
+        name = ('abcdefgh'[x] + 'x' if kills else '') + square_name(end)
+        name += '=' + LETTERS[promotion or 'queen'] if end[1] in (0, 7) else ''
+
+    # names other moves by the piece, adding its file or rank when another piece of the same kind reaches the space
+    else:
+        others = [start for start, other_end, _ in game.legal_moves()
+                  if other_end == end and start != (x, y) and game.board[start[0]][start[1]].name == piece.name]
+        if not others:
+            origin = ''
+        elif all(start[0] != x for start in others):
+            origin = 'abcdefgh'[x]
+        elif all(start[1] != y for start in others):
+            origin = str(8 - y)
+        else:
+            origin = square_name((x, y))
+        kills = game.board[end[0]][end[1]] is not None
+        name = LETTERS[piece.name] + origin + ('x' if kills else '') + square_name(end)
+
+    # adds check and checkmate marks
+    game.make_move(*move)
+    if game.in_check():
+        name += '+' if next(game.legal_moves(), None) is not None else '#'
+    game.unmake_move()
+    return name
+
+
+def write_game(tags: dict, moves: list, result: str, first_turn: str = 'white', first_number: int = 1) -> str:
+    """
+    writes a game in PGN, the seven required tags come first in their standard order and the moves are wrapped at 80
+    characters
+
+    :param tags: a dict with the tag name as the key and its value as the value, Result is added from result
+    :param moves: the standard algebraic names of the moves, see san
+    :param result: the result of the game, '1-0', '0-1', '1/2-1/2' or '*' if it did not finish
+    :param first_turn: the color that made the first move, black when the game started from a position with black to
+        move
+    :param first_number: the number of the first move
+    :return: the text of the game, ending with a blank line so games can be written one after another
+    """
+
+    # writes the tags, the seven required tags first
+    tags = dict(tags, Result=result)
+    names = [name for name in SEVEN_TAGS if name in tags] + [name for name in tags if name not in SEVEN_TAGS]
+    lines = []
+    for name in names:
+        value = str(tags[name]).replace('\\', '\\\\').replace('"', '\\"')
+        lines.append(f'[{name} "{value}"]')
+
+    # numbers the moves, a game starting with black writes the number followed by ...
+    words = []
+    number = first_number
+    for index, move in enumerate(moves):
+        white = (index % 2 == 0) == (first_turn == 'white')
+        if white:
+            words.append(f'{number}.')
+        elif index == 0:
+            words.append(f'{number}...')
+        words.append(move)
+        number += 0 if white else 1
+    words.append(result)
+
+    # wraps the moves at 80 characters
+    text = ''
+    line = ''
+    for word in words:
+        if line and len(line) + 1 + len(word) > 80:
+            text += line + '\n'
+            line = word
+        else:
+            line = line + ' ' + word if line else word
+    return '\n'.join(lines) + '\n\n' + text + line + '\n\n'
+
+
+def read_games(lines):
+    """
+    reads games one at a time from the lines of a PGN file, only the game being read is kept in memory so a file of
+    any size can be read. comments, variations, annotations and move numbers are skipped
+
+    :param lines: the lines of the file, for example an open file or sys.stdin
+    :return: a generator of games in the form (tags, moves, result)
+    """
+
+    tags = {}
+    moves = []
+    result = '*'
+    comment = False  # true while inside a {} comment, which can span several lines
+    variation = 0  # the number of () variations the reader is inside
+    ended = False  # true once the result after the moves has been read
+    for line in lines:
+
+        # handles escaped lines and tag pairs, a tag pair after the moves of a game starts the next game
+        if line.startswith('%'):
+            continue
+        if not comment and not variation and line.lstrip().startswith('['):
+            if moves or ended:
+                yield tags, moves, result
+                tags, moves, result, ended = {}, [], '*', False
+            for name, value in TAG.findall(line):
+                tags[name] = value.replace('\\"', '"').replace('\\\\', '\\')
+            continue
+
+        # reads the moves, skipping comments, variations, annotations and move numbers
+        for token in TOKEN.findall(line):
+            if comment:
+                comment = token != '}'
+            elif token == '{':
+                comment = True
+            elif token == ';':
+                break
+            elif token == '(':
+                variation += 1
+            elif token == ')':
+                variation = max(0, variation - 1)
+            elif variation or token[0] == '$' or token[-1] == '.':
+                continue
+            elif token in RESULTS:
+                result = token
+                ended = True
+            else:
+                moves.append(token)
+
+    # yields the last game
+    if moves or tags:
+        yield tags, moves, result
+
+
+def parse_san(game: Game, name: str) -> tuple:
+    """
+    finds the move of a standard algebraic name, the name may end with check, checkmate and annotation marks such as
+    '+', '#', '!' or '?' and castling may be written with zeros
+
+    :param game: the game, the move must be legal in its current position
+    :param name: the name of the move, for example 'Nf3', 'exd5', 'O-O' or 'e8=Q+'
+    :return: the move in the form (start, end, promotion), see Game.legal_moves
+    """
+
+    # handles castling
+    stripped = name.rstrip('+#!?').replace('0', 'O')
+    king = game.white_king if game.turn == 'white' else game.black_king
+    if stripped in ('O-O', 'O-O-O'):
+        x = 6 if stripped == 'O-O' else 2
+        move = (king.coordinates, (x, king.coordinates[1]), None)
+        if move not in list(game.legal_moves()):
+            raise ValueError(f'illegal move {name!r}')
+        return move
+
+    # finds the legal moves of the piece that match the name
+    match = SAN.fullmatch(stripped)
+    if match is None:
+        raise ValueError(f'invalid move {name!r}')
+    letter, file, rank, end, promotion = match.groups()
+    piece = NAMES[letter or '']
+    end = parse_square(end)
+    promotion = NAMES[promotion] if promotion else None
+    board = game.board
+    found = [move for move in game.legal_moves() if move[1] == end and move[2] == promotion and
+             board[move[0][0]][move[0][1]].name == piece and (file is None or 'abcdefgh'[move[0][0]] == file) and
+             (rank is None or str(8 - move[0][1]) == rank)]
+    if len(found) != 1:
+        raise ValueError(f'{"ambiguous" if found else "illegal"} move {name!r}')
+    return found[0]
+
+
+def replay(tags: dict, moves: list, pieces: bool = False):
+    """
+    replays a game through the rules, one position at a time. the game starts from the FEN tag if there is one or the
+    starting position otherwise, and a ValueError is raised at the first move that is not legal
+
+    :param tags: the tags of the game, see read_games
+    :param moves: the standard algebraic names of the moves
+    :param pieces: true to also check every move against the possible moves of the pieces, the moves the view lets
+        the user make (see Perft.piece_moves), this is much slower
+    :return: a generator of the game after each move, the same game is yielded every time so it should not be changed
+        while replaying
+    """
+
+    # sets up the first position
+    game = load_fen(Game(), tags['FEN'], False) if 'FEN' in tags else initialize_board(Game())
+
+    # makes each move, the possible moves of the pieces are only updated when they are checked
+    for name in moves:
+        move = parse_san(game, name)
+        game.update_board() if pieces else None
+        if pieces and move not in piece_moves(game):
+            raise ValueError(f'move {name!r} is legal but not a possible move of the piece')
+        game.make_move(*move)
+        yield game
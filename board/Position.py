@@ -0,0 +1,111 @@
+from Bitboard import SQUARES
+
+
+"""
+a compact copy of a position for storing and sending many positions at once. the board is a bytearray of 64 piece
+codes indexed by space like the bitboards (see Bitboard.py), so copying a position copies a single 64 byte buffer
+instead of 32 piece objects:
+
+    1) 0 is an empty space
+    2) 1 to 6 are the white pawn, knight, bishop, rook, queen and king
+    3) 9 to 14 are the black pieces, the white code plus 8 (BLACK)
+
+the game keeps a board of codes up to date with every move (see Game.squares) so a position can be taken at any time
+with Game.position and a game can be set up from a position with Board.load_position
+"""
+
+
+NAMES = (None, 'pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+BLACK = 8
+CODES = {'white': {name: code for code, name in enumerate(NAMES) if name is not None},
+         'black': {name: code | BLACK for code, name in enumerate(NAMES) if name is not None}}
+
+
+class Position:
+    """
+    a class representing a position without any piece objects, instances of the class contains the following
+    attributes, slots are used so a position takes little more than its 64 byte board
+        1) squares - a bytearray of the 64 piece codes indexed by space
+        2) turn - the color of the player whose move it is
+        3) castling - the castling rights as a 4 bit number, see Zobrist.py for the order of the bits
+        4) en_passant - the coordinates a pawn can move to when attacking en passant, None if there are none
+        5) halfmove_clock - the number of moves since the last kill or pawn move
+        6) fullmove_number - the number of the current move
+        7) key - the zobrist key of the position
+
+    class contains the following functions:
+        1) __init__ - creates a position
+        2) copy - copies the position
+        3) piece - finds the color and name of the piece on a space
+        4) __eq__ - checks if two positions are the same
+        5) __repr__ - draws the board, useful when printing a position
+    """
+
+    __slots__ = ('squares', 'turn', 'castling', 'en_passant', 'halfmove_clock', 'fullmove_number', 'key')
+
+    def __init__(self, squares: bytearray = None, turn: str = 'white', castling: int = 0, en_passant: tuple = None,
+                 halfmove_clock: int = 0, fullmove_number: int = 1, key: int = 0):
+        """
+        creates a position
+
+        :param squares: the 64 piece codes indexed by space, None for an empty board
+        :param turn: the color of the player whose move it is
+        :param castling: the castling rights as a 4 bit number
+        :param en_passant: the coordinates a pawn can move to when attacking en passant, None if there are none
+        :param halfmove_clock: the number of moves since the last kill or pawn move
+        :param fullmove_number: the number of the current move
+        :param key: the zobrist key of the position
+        """
+
+        self.squares = squares if squares is not None else bytearray(64)
+        self.turn = turn
+        self.castling = castling
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.key = key
+
+    def copy(self):
+        """
+        copies the position
+
+        :return: the copy, its board is a new buffer so changing one position does not change the other
+        """
+
+        return Position(bytearray(self.squares), self.turn, self.castling, self.en_passant, self.halfmove_clock,
+                        self.fullmove_number, self.key)
+
+    def piece(self, coordinates: tuple) -> tuple:
+        """
+        finds the color and name of the piece on a space
+
+        :param coordinates: the coordinates of the space in the form (0-7, 0-7)
+        :return: a tuple of the color and name of the piece, or None if the space is empty
+        """
+
+        code = self.squares[SQUARES[coordinates[0]][coordinates[1]]]
+        return ('black' if code & BLACK else 'white', NAMES[code & 7]) if code else None
+
+    def __eq__(self, other) -> bool:
+        """
+        checks if two positions are the same, the move counters are not compared since they do not change which moves
+        can be made
+
+        :param other: the other position
+        :return: true if the positions are the same
+        """
+
+        return isinstance(other, Position) and self.squares == other.squares and self.turn == other.turn and \
+            self.castling == other.castling and self.en_passant == other.en_passant
+
+    __hash__ = None  # positions can be changed so they are not hashable, use the key instead
+
+    def __repr__(self) -> str:
+        """
+        draws the board with a letter for every piece, upper case for white, and a dot for every empty space
+
+        :return: 8 lines of 8 characters, starting from black's side
+        """
+
+        return '\n'.join(''.join('.pnbrqk'[code & 7].upper() if code and not code & BLACK else '.pnbrqk'[code & 7]
+                                 for code in self.squares[8 * y:8 * y + 8]) for y in range(8))
@@ -0,0 +1,174 @@
+from sys import modules
+from time import perf_counter
+from Game import Game
+from Piece import Piece
+from Board import PAWN_SPECIALS, KING_SPECIALS
+
+
+"""
+a few functions for counting and timing the calls of the functions that find the moves of the pieces, to see where
+the time of a slow turn goes:
+
+    1) enable - swaps every timed function for a copy that counts and times its calls, and optionally reports a line of
+       the numbers of the turn after every update of the board
+    2) disable - puts the original functions back, the functions are only swapped while profiling so nothing is added
+       to a call when it is off
+    3) stats - the number of calls and seconds of every timed function since it was enabled or reset
+    4) reset - sets every number back to 0
+
+the timed functions are Piece.update_moves, Game.attacked, Game.in_check, Game.update_board, Game.step_moves, every
+special move pre-test of the pawns and kings (see SpecialMoves.py, only the ray walker runs them) and the redraw of the
+highlights of the view (View.highlight and View.toggle_show_moves). the view is only timed when it was imported before
+profiling was enabled, it is never imported here so profiling works without tkinter. the time of a function includes
+the time of the timed functions it calls, for example update_board includes update_moves
+"""
+
+
+COUNTERS = {}  # the name of a timed function as the key and a list of its calls and seconds as the value
+SWAPPED = []  # a list of (owner, key, original function) for every swapped function, the owner is a class or a list
+TURN = {}  # the counters at the last report, so a report only has the numbers of its turn
+
+
+def timed(name: str, function, report=None):
+    """
+    makes a copy of a function that counts and times its calls, functions with the same name share their counters
+
+    :param name: the name of the function in the stats
+    :param function: the function to time
+    :param report: a function called with a line of text of the numbers of the turn after every call, None if nothing
+        is reported
+    :return: the timed function
+    """
+
+    counter = COUNTERS.setdefault(name, [0, 0.0])
+
+    def wrapped_function(*arguments, **keywords):
+        """
+        calls the function and adds its time to the counters
+
+        :return: the return of the function
+        """
+
+        start = perf_counter()
+        try:
+            return function(*arguments, **keywords)
+        finally:
+            counter[0] += 1
+            counter[1] += perf_counter() - start
+            report(turn_line()) if report is not None else None
+
+    return wrapped_function
+
+
+def swap(owner, key, function):
+    """
+    replaces a function of a class or an entry of a list and remembers the original so it can be put back
+
+    :param owner: the class or the list
+    :param key: the name of the function in the class or the index of the entry in the list
+    :param function: the function or entry to put in its place
+    """
+
+    if isinstance(owner, list):
+        SWAPPED.append((owner, key, owner[key]))
+        owner[key] = function
+    else:
+        SWAPPED.append((owner, key, getattr(owner, key)))
+        setattr(owner, key, function)
+
+
+def enable(report=None):
+    """
+    starts counting and timing the calls of the timed functions, does nothing if it is already enabled
+
+    :param report: a function called with a line of text of the numbers of the turn after every update of the board,
+        for example print, None if nothing is reported
+    """
+
+    if SWAPPED:
+        return
+
+    # swaps the functions of the game, the pieces and the view
+    swap(Piece, 'update_moves', timed('update_moves', Piece.update_moves))
+    swap(Game, 'attacked', timed('attacked', Game.attacked))
+    swap(Game, 'in_check', timed('in_check', Game.in_check))
+    swap(Game, 'update_board', timed('update_board', Game.update_board, report))
+    swap(Game, 'step_moves', timed('step_moves', Game.step_moves))
+    if 'View' in modules:
+        view = modules['View'].View
+        swap(view, 'highlight', timed('highlight', view.highlight))
+        swap(view, 'toggle_show_moves', timed('toggle_show_moves', view.toggle_show_moves))
+
+    # swaps the pre-tests in the special move tables, which are shared by every piece so new pieces are timed too
+    for specials in (PAWN_SPECIALS['white'], PAWN_SPECIALS['black'], KING_SPECIALS):
+        for entries in specials.values():
+            for index, (test, action) in enumerate(entries):
+                name = 'king_can_move' if test.__name__ == 'wrapped_function' else test.__name__
+                swap(entries, index, (timed(name, test), action))
+    TURN.update((name, tuple(counter)) for name, counter in COUNTERS.items())
+
+
+def disable():
+    """
+    stops counting and timing by putting the original functions back, the numbers are kept until reset
+    """
+
+    while SWAPPED:
+        owner, key, original = SWAPPED.pop()
+        if isinstance(owner, list):
+            owner[key] = original
+        else:
+            setattr(owner, key, original)
+
+
+def stats() -> dict:
+    """
+    finds the numbers of every timed function since profiling was enabled or reset
+
+    :return: a dict with the name of the function as the key and a tuple of its calls and seconds as the value, the
+        functions that were never called are left out
+    """
+
+    return {name: (counter[0], counter[1]) for name, counter in COUNTERS.items() if counter[0]}
+
+
+def reset():
+    """
+    sets the calls and seconds of every timed function back to 0
+    """
+
+    for counter in COUNTERS.values():
+        counter[0] = 0
+        counter[1] = 0.0
+    TURN.clear()
+
+
+def turn_line() -> str:
+    """
+    finds the numbers of the timed functions since the last line
+
+    :return: a line of text of the calls and milliseconds of every function called since the last line
+    """
+
+    parts = []
+    for name, (calls, seconds) in stats().items():
+        last_calls, last_seconds = TURN.get(name, (0, 0.0))
+        if calls > last_calls:
+            parts.append(f'{name} {calls - last_calls}x {(seconds - last_seconds) * 1000:.2f}ms')
+        TURN[name] = (calls, seconds)
+    return '  '.join(parts)
+
+
+def table(numbers: dict = None) -> str:
+    """
+    lays out the numbers of the timed functions as a table, slowest first
+
+    :param numbers: the numbers to lay out in the form returned by stats, None for the current numbers
+    :return: the lines of the table
+    """
+
+    numbers = stats() if numbers is None else numbers
+    lines = [f'{"function":<28}{"calls":>10}{"total ms":>12}{"us per call":>14}']
+    for name, (calls, seconds) in sorted(numbers.items(), key=lambda item: -item[1][1]):
+        lines.append(f'{name:<28}{calls:>10}{seconds * 1000:>12.1f}{seconds / calls * 1e6:>14.2f}')
+    return '\n'.join(lines)
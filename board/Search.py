@@ -0,0 +1,526 @@
+from time import perf_counter
+from Bitboard import SQUARES, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, rook_attacks, bishop_attacks
+from Book import Book
+from Game import Game
+from Tablebase import Tablebase
+from Transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+
+"""
+a computer player that searches the moves of a game with alpha-beta negamax:
+
+    1) iterative deepening - the game is searched one move deeper at a time so there is always a best move to return
+       when the time runs out, and the best move of each depth is searched first at the next depth
+    2) move ordering - kills are searched first, most valuable victim then least valuable attacker (MVV-LVA), followed
+       by upgrades, the two quiet moves that last caused a cutoff at the same depth (killers) and quiet moves that
+       often caused cutoffs before (history)
+    3) quiescence search - kills are searched past the last depth until the position is quiet so a move is never
+       judged in the middle of a trade
+    4) time control - the clock is checked every few hundred positions and the search stops as soon as the time is up
+    5) transposition table - the score and best move of every searched position is stored so a position reached by
+       another order of moves is not searched again, and the stored best move is searched first otherwise
+    6) opening book and endgame tables - known opening moves are played without searching (see Book.py) and positions
+       with few pieces are scored from the endgame tables instead of being searched (see Tablebase.py)
+    7) draws - a position reached before and a position after 50 moves without a kill or a pawn move are scored as
+       draws from the counters the game keeps (see Game.draw), so the search does not repeat a won position
+
+scores are in centipawns from the side of the player whose turn it is, checkmates are scored MATE minus the number of
+moves to the mate so a faster mate is always preferred. mates are stored in the transposition table as the number of
+moves from the stored position instead of from the root since the position can be reached at any depth
+"""
+
+
+# ===================================================== EVALUATION =====================================================
+
+
+VALUES = {'pawn': 100, 'knight': 320, 'bishop': 330, 'rook': 500, 'queen': 900, 'king': 0, 'endgame': 0}
+MATE = 100000
+MAX_DEPTH = 100  # the deepest depth searched, the killers and lines are kept for this many moves from the root
+
+# the bonus for a piece on each space from white's side, the first row is the eighth rank so the tables are indexed by
+# space for white and by the space flipped vertically (space ^ 56) for black
+TABLES = {
+    'pawn': (0, 0, 0, 0, 0, 0, 0, 0,
+             50, 50, 50, 50, 50, 50, 50, 50,
+             10, 10, 20, 30, 30, 20, 10, 10,
+             5, 5, 10, 25, 25, 10, 5, 5,
+             0, 0, 0, 20, 20, 0, 0, 0,
+             5, -5, -10, 0, 0, -10, -5, 5,
+             5, 10, 10, -20, -20, 10, 10, 5,
+             0, 0, 0, 0, 0, 0, 0, 0),
+    'knight': (-50, -40, -30, -30, -30, -30, -40, -50,
+               -40, -20, 0, 0, 0, 0, -20, -40,
+               -30, 0, 10, 15, 15, 10, 0, -30,
+               -30, 5, 15, 20, 20, 15, 5, -30,
+               -30, 0, 15, 20, 20, 15, 0, -30,
+               -30, 5, 10, 15, 15, 10, 5, -30,
+               -40, -20, 0, 5, 5, 0, -20, -40,
+               -50, -40, -30, -30, -30, -30, -40, -50),
+    'bishop': (-20, -10, -10, -10, -10, -10, -10, -20,
+               -10, 0, 0, 0, 0, 0, 0, -10,
+               -10, 0, 5, 10, 10, 5, 0, -10,
+               -10, 5, 5, 10, 10, 5, 5, -10,
+               -10, 0, 10, 10, 10, 10, 0, -10,
+               -10, 10, 10, 10, 10, 10, 10, -10,
+               -10, 5, 0, 0, 0, 0, 5, -10,
+               -20, -10, -10, -10, -10, -10, -10, -20),
+    'rook': (0, 0, 0, 0, 0, 0, 0, 0,
+             5, 10, 10, 10, 10, 10, 10, 5,
+             -5, 0, 0, 0, 0, 0, 0, -5,
+             -5, 0, 0, 0, 0, 0, 0, -5,
+             -5, 0, 0, 0, 0, 0, 0, -5,
+             -5, 0, 0, 0, 0, 0, 0, -5,
+             -5, 0, 0, 0, 0, 0, 0, -5,
+             0, 0, 0, 5, 5, 0, 0, 0),
+    'queen': (-20, -10, -10, -5, -5, -10, -10, -20,
+              -10, 0, 0, 0, 0, 0, 0, -10,
+              -10, 0, 5, 5, 5, 5, 0, -10,
+              -5, 0, 5, 5, 5, 5, 0, -5,
+              0, 0, 5, 5, 5, 5, 0, -5,
+              -10, 5, 5, 5, 5, 5, 0, -10,
+              -10, 0, 5, 0, 0, 0, 0, -10,
+              -20, -10, -10, -5, -5, -10, -10, -20),
+    'king': (-30, -40, -40, -50, -50, -40, -40, -30,
+             -30, -40, -40, -50, -50, -40, -40, -30,
+             -30, -40, -40, -50, -50, -40, -40, -30,
+             -30, -40, -40, -50, -50, -40, -40, -30,
+             -20, -30, -30, -40, -40, -30, -30, -20,
+             -10, -20, -20, -20, -20, -20, -20, -10,
+             20, 20, 0, 0, 0, 0, 20, 20,
+             20, 30, 10, 0, 0, 10, 30, 20)}
+
+# the king moves to the middle of the board once the queens and most pieces are gone
+KING_ENDGAME = (-50, -40, -30, -20, -20, -30, -40, -50,
+                -30, -20, -10, 0, 0, -10, -20, -30,
+                -30, -10, 20, 30, 30, 20, -10, -30,
+                -30, -10, 30, 40, 40, 30, -10, -30,
+                -30, -10, 30, 40, 40, 30, -10, -30,
+                -30, -10, 20, 30, 30, 20, -10, -30,
+                -30, -30, 0, 0, 0, 0, -30, -30,
+                -50, -30, -30, -30, -30, -30, -30, -50)
+ENDGAME_MATERIAL = 1300
+
+# the value plus the bonus of each piece on each space for each color, the king uses the 'endgame' table in the endgame
+WEIGHTS = {color: {name: [VALUES[name] + table[square ^ flip] for square in range(64)]
+                   for name, table in list(TABLES.items()) + [('endgame', KING_ENDGAME)]}
+           for color, flip in (('white', 0), ('black', 56))}
+
+# a kill is skipped in the quiescence search when even winning the piece plus this margin cannot raise the score
+DELTA = 200
+
+
+def evaluate(game: Game) -> int:
+    """
+    scores a position by the value of each piece and the bonus for the space it is on
+
+    :param game: the game to score
+    :return: the score in centipawns from the side of the player whose turn it is
+    """
+
+    # adds up the pieces of each color
+    scores = {'white': 0, 'black': 0}
+    material = 0
+    for color in ('white', 'black'):
+        bitboards = game.bitboards[color]
+        for name in ('pawn', 'knight', 'bishop', 'rook', 'queen'):
+            bitboard = bitboards[name]
+            weights = WEIGHTS[color][name]
+            while bitboard:
+                low = bitboard & -bitboard
+                scores[color] += weights[low.bit_length() - 1]
+                bitboard ^= low
+            material += VALUES[name] * bin(bitboards[name]).count('1') if name != 'pawn' else 0
+
+    # adds the kings, which use a different table in the endgame
+    table = 'endgame' if material <= 2 * ENDGAME_MATERIAL else 'king'
+    for color in ('white', 'black'):
+        scores[color] += WEIGHTS[color][table][game.bitboards[color]['king'].bit_length() - 1]
+    enemy = 'black' if game.turn == 'white' else 'white'
+    return scores[game.turn] - scores[enemy]
+
+
+def defended(game: Game, position: tuple) -> bool:
+    """
+    checks if a space is attacked by the player whose turn it is not, found straight from the bitboards
+
+    :param game: the game to check
+    :param position: the coordinates of the space
+    :return: true if the other player attacks the space
+    """
+
+    enemy = 'black' if game.turn == 'white' else 'white'
+    enemies = game.bitboards[enemy]
+    square = SQUARES[position[0]][position[1]]
+    occupied = game.occupied['white'] | game.occupied['black']
+    return bool(PAWN_ATTACKS[game.turn][square] & enemies['pawn'] or KNIGHT_ATTACKS[square] & enemies['knight'] or
+                KING_ATTACKS[square] & enemies['king'] or
+                rook_attacks(square, occupied) & (enemies['rook'] | enemies['queen']) or
+                bishop_attacks(square, occupied) & (enemies['bishop'] | enemies['queen']))
+
+
+# ======================================================= SEARCH =======================================================
+
+
+class TimeUp(Exception):
+    """
+    raised inside the search when the time or the positions allowed for the move run out
+    """
+
+
+class Search:
+    """
+    a class representing a computer player searching a game for the best move. instances of the class contains the
+    following attributes
+        1) game - the game being searched, it is back in its position whenever a search returns
+        2) report - a function called with (depth, score, nodes, seconds, principal variation) after every depth, None
+            if nothing is reported
+        3) stop - set to true from another thread to end the search early, the best move so far is still returned
+        4) nodes - the number of positions searched by the current search
+        5) deadline - the perf_counter time the current search must end by, None if there is no time limit
+        6) node_limit - the number of positions the current search may search, None if there is no limit
+        7) killers - a list indexed by the number of moves from the root of the two quiet moves that last caused a
+            cutoff there
+        8) history - a dict with the (start, end) of a quiet move as the key and a score of how often it caused a
+            cutoff as the value
+        9) pv - a list indexed by the number of moves from the root of the best line found from that position
+        10) table - the transposition table, shared between searches of the same game so later moves reuse it
+        11) book - the opening book whose moves are played before searching, None if there is no book
+        12) tablebase - the endgame tables used instead of searching positions with few pieces, None if there are none
+
+    class contains the following functions:
+        1) __init__ - creates a search for a game
+        2) best_move - finds the best move within a time, depth or position limit
+        3) root - searches the moves of the root position
+        4) negamax - searches a position to a depth with alpha-beta pruning
+        5) quiescence - searches the kills of a position until it is quiet
+        6) line - finds the best line of the last depth, extended with the moves of the transposition table
+        7) store - stores the result of searching a position in the transposition table
+        8) ordered - orders moves so the moves most likely to cause a cutoff are searched first
+        9) tick - counts a position and checks if the search must stop
+    """
+
+    def __init__(self, game: Game, report=None, table: TranspositionTable = None, book: Book = None,
+                 tablebase: Tablebase = None):
+        """
+        creates a search for a game
+
+        :param game: the game to search
+        :param report: a function called with (depth, score, nodes, seconds, principal variation) after every depth
+        :param table: the transposition table to use, None creates a 16 megabyte table
+        :param book: the opening book whose moves are played before searching, None if there is no book
+        :param tablebase: the endgame tables used instead of searching positions with few pieces, None if there are
+            none
+        """
+
+        self.game = game
+        self.report = report
+        self.stop = False
+        self.nodes = 0
+        self.deadline = None
+        self.node_limit = None
+        self.killers = []
+        self.history = {}
+        self.pv = []
+        self.table = table if table is not None else TranspositionTable()
+        self.book = book
+        self.tablebase = tablebase
+
+    def best_move(self, time_limit: float = 1.0, depth: int = None, nodes: int = None) -> tuple:
+        """
+        finds the best move for the player whose turn it is by searching one move deeper at a time until a limit is
+        reached, the best move found so far is returned when the search is stopped. a move of the opening book is
+        played without searching while the position is in the book, and the move of the endgame tables once the
+        position is in a table
+
+        :param time_limit: the number of seconds the search may take, None if there is no time limit
+        :param depth: the deepest depth to search, None if there is no depth limit
+        :param nodes: the number of positions the search may search, None if there is no limit
+        :return: the best move in the form (start, end, promotion), see Game.legal_moves, or None if there are no moves
+        """
+
+        # handles when there are no moves or only one move and when the position is in the book
+        start = perf_counter()
+        moves = list(self.game.legal_moves())
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+        move = self.book.choose(self.game) if self.book is not None else None
+        if move is None and self.tablebase is not None and self.tablebase.probe(self.game) is not None:
+            move = self.tablebase.best_move(self.game)
+        if move is not None:
+            return move
+
+        # resets the limits, the killers belong to the previous position so they are cleared
+        self.stop = False
+        self.nodes = 0
+        self.deadline = start + time_limit if time_limit is not None else None
+        self.node_limit = nodes
+        self.killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        self.history = {key: value // 8 for key, value in self.history.items() if value >= 8}
+        self.pv = [[] for _ in range(MAX_DEPTH + 2)]
+        self.table.new_search()
+        root = len(self.game.history)
+        best = moves[0]
+
+        # searches one move deeper at a time
+        current = 1
+        while current <= min(depth if depth is not None else MAX_DEPTH, MAX_DEPTH):
+            try:
+                score, move = self.root(moves, best, current)
+            except TimeUp:
+
+                # takes back the moves of the unfinished search, a better first move is kept since it was searched fully
+                while len(self.game.history) > root:
+                    self.game.unmake_move()
+                if self.pv[0] and self.pv[0][0] != best and self.pv[0][0] in moves:
+                    best = self.pv[0][0]
+                break
+            best = move
+
+            # reports the depth and stops when a mate is found or the next depth would not finish in time
+            elapsed = perf_counter() - start
+            if self.report is not None:
+                self.report(current, score, self.nodes, elapsed, self.line(current))
+            if abs(score) >= MATE - 128 or self.stop:
+                break
+            if self.deadline is not None and perf_counter() + 2 * elapsed > self.deadline:
+                break
+            current += 1
+        return best
+
+    def root(self, moves: list, best: tuple, depth: int) -> tuple:
+        """
+        searches the moves of the root position, the best move of the previous depth is searched first
+
+        :param moves: the legal moves of the root position
+        :param best: the best move of the previous depth
+        :param depth: the depth to search
+        :return: a tuple of the score of the best move and the best move
+        """
+
+        alpha = -MATE - 1
+        best_move = None
+        self.pv[0] = []
+        for move in [best] + [move for move in self.ordered(moves, 0) if move != best]:
+            self.game.make_move(*move)
+            score = -self.negamax(depth - 1, -MATE - 1, -alpha, 1)
+            self.game.unmake_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self.pv[0] = [move] + self.pv[1]
+        return alpha, best_move
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        searches a position to a depth with alpha-beta pruning
+
+        :param depth: the number of moves left to search before the quiescence search
+        :param alpha: the score the player whose turn it is can already get
+        :param beta: the score the other player can already get, a better score than beta is never reached
+        :param ply: the number of moves from the root
+        :return: the score of the position
+        """
+
+        # scores a position reached before and a position after 50 moves without a kill or a pawn move as a draw, the
+        # player who is behind can always repeat a position so it is never worth more than a draw
+        self.pv[ply] = []
+        if ply and (self.game.repetitions.get(self.game.key, 0) >= 2 or self.game.halfmove_clock >= 100):
+            return 0
+
+        # uses the endgame tables when there are few enough pieces left
+        if self.tablebase is not None:
+            found = self.tablebase.probe(self.game)
+            if found is not None:
+                return found[0] * (MATE - ply - found[1])
+
+        # searches only kills at the last depth
+        if depth <= 0:
+            return self.quiescence(alpha, beta, ply)
+        self.tick()
+
+        # uses the stored score when the position was already searched deep enough
+        game = self.game
+        key = game.key
+        entry = self.table.probe(key)
+        hash_move = None
+        if entry is not None:
+            stored_depth, score, bound, hash_move = entry
+            score = score - ply if score >= MATE - 256 else score + ply if score <= -MATE + 256 else score
+            if stored_depth >= depth and (bound == EXACT or (bound == LOWER and score >= beta) or
+                                          (bound == UPPER and score <= alpha)):
+                return score
+
+        # handles when there are no moves, which is a checkmate when the king is in check and a draw otherwise
+        moves = list(game.legal_moves())
+        if not moves:
+            return -MATE + ply if game.in_check() else 0
+
+        # searches every move until one is too good for the other player to allow, the stored best move goes first
+        ordered = self.ordered(moves, ply)
+        if hash_move in moves:
+            ordered.remove(hash_move)
+            ordered.insert(0, hash_move)
+        original_alpha = alpha
+        best = None
+        for move in ordered:
+            game.make_move(*move)
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            game.unmake_move()
+            if score > alpha:
+                alpha = score
+                best = move
+                self.pv[ply] = [move] + self.pv[ply + 1]
+                if score >= beta:
+
+                    # remembers quiet moves that cause cutoffs
+                    if game.board[move[1][0]][move[1][1]] is None and move[2] is None:
+                        killers = self.killers[ply]
+                        if killers[0] != move:
+                            killers[1] = killers[0]
+                            killers[0] = move
+                        self.history[move[0:2]] = self.history.get(move[0:2], 0) + depth * depth
+                    self.store(key, depth, beta, LOWER, move, ply)
+                    return beta
+        self.store(key, depth, alpha, EXACT if alpha > original_alpha else UPPER, best, ply)
+        return alpha
+
+    def line(self, depth: int) -> list:
+        """
+        finds the best line of the last depth, the line found by the search stops where a position was scored from the
+        transposition table so it is followed further with the stored best moves
+
+        :param depth: the depth that was searched, the line is at most this many moves
+        :return: a list of the moves of the line in the form (start, end, promotion)
+        """
+
+        # makes the moves of the line found by the search
+        game = self.game
+        line = list(self.pv[0])
+        [game.make_move(*move) for move in line]
+
+        # follows the stored best moves until a position repeats or has no legal stored move
+        seen = set()
+        while len(line) < depth and game.key not in seen:
+            seen.add(game.key)
+            entry = self.table.probe(game.key)
+            if entry is None or entry[3] is None or entry[3] not in list(game.legal_moves()):
+                break
+            line.append(entry[3])
+            game.make_move(*entry[3])
+        [game.unmake_move() for _ in line]
+        return line
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: tuple, ply: int):
+        """
+        stores the result of searching a position in the transposition table, mates are stored as the number of moves
+        from the position instead of from the root
+
+        :param key: the zobrist key of the position
+        :param depth: the depth the position was searched to
+        :param score: the score of the position from the side of the player whose turn it is
+        :param bound: EXACT, LOWER or UPPER, see Transposition.py
+        :param move: the best move found, None if no move raised alpha
+        :param ply: the number of moves from the root
+        """
+
+        score = score + ply if score >= MATE - 256 else score - ply if score <= -MATE + 256 else score
+        self.table.store(key, depth, score, bound, move)
+
+    def quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        """
+        searches the kills of a position until it is quiet, every move is searched when the king is in check since
+        standing still is not an option
+
+        :param alpha: the score the player whose turn it is can already get
+        :param beta: the score the other player can already get
+        :param ply: the number of moves from the root
+        :return: the score of the position
+        """
+
+        # the player can choose not to kill, unless they are in check
+        self.tick()
+        game = self.game
+        check = game.in_check()
+        score = -MATE
+        if not check:
+            score = evaluate(game)
+            if score >= beta:
+                return beta
+            alpha = max(alpha, score)
+
+        # finds the kills and upgrades to a queen, or every move when in check
+        moves = list(game.legal_moves(kills=not check))
+        if check and not moves:
+            return -MATE + ply
+
+        # searches the kills, skipping kills that cannot bring the score back up to alpha (delta pruning) and kills of a
+        # defended piece with a more valuable piece since they lose material
+        for move in self.ordered(moves, ply):
+            if not check and move[2] is None:
+                victim = game.board[move[1][0]][move[1][1]]
+                gain = VALUES[victim.name] if victim is not None else VALUES['pawn']
+                loss = VALUES[game.board[move[0][0]][move[0][1]].name]
+                if score + gain + DELTA <= alpha or (loss > gain and defended(game, move[1])):
+                    continue
+            elif not check and move[2] != 'queen':
+                continue
+            game.make_move(*move)
+            result = -self.quiescence(-beta, -alpha, ply + 1)
+            game.unmake_move()
+            if result >= beta:
+                return beta
+            alpha = max(alpha, result)
+        return alpha
+
+    def ordered(self, moves: list, ply: int) -> list:
+        """
+        orders moves so the moves most likely to cause a cutoff are searched first
+
+        :param moves: the moves to order
+        :param ply: the number of moves from the root, used to find the killers
+        :return: the moves from most to least promising
+        """
+
+        board = self.game.board
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+
+        def score(move: tuple) -> int:
+            """
+            scores a move for ordering
+
+            :param move: the move to score
+            :return: the score, higher is searched first
+            """
+
+            # kills are ordered by most valuable victim then least valuable attacker
+            (x, y), end, promotion = move
+            victim = board[end[0]][end[1]]
+            if victim is not None:
+                return 1000000 + VALUES[victim.name] * 10 - VALUES[board[x][y].name] // 10
+            if promotion is not None:
+                return 900000 + VALUES[promotion]
+            if end == self.game.en_passant and board[x][y].name == 'pawn':
+                return 1000000 + VALUES['pawn'] * 10 - VALUES['pawn'] // 10
+
+            # quiet moves are ordered by killers then history
+            if move == killers[0]:
+                return 800000
+            if move == killers[1]:
+                return 700000
+            return self.history.get(move[0:2], 0)
+
+        return sorted(moves, key=score, reverse=True)
+
+    def tick(self):
+        """
+        counts a position and checks if the search must stop, the clock is only read every 256 positions
+
+        :raises TimeUp: when the time or the positions allowed run out, or the search was stopped
+        """
+
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise TimeUp
+        if not self.nodes & 255:
+            if self.stop or (self.deadline is not None and perf_counter() >= self.deadline):
+                raise TimeUp
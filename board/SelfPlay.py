@@ -0,0 +1,157 @@
+from datetime import date
+from multiprocessing import Pool, cpu_count
+from random import Random
+from time import perf_counter
+from Board import initialize_board, load_fen
+from Book import Book
+from Game import Game
+from Notation import parse_move
+from Pgn import san, write_game
+from Search import Search
+from Tablebase import Tablebase
+from Transposition import TranspositionTable
+
+
+"""
+a few functions for playing the search against itself without a window to make collections of games:
+
+    1) play_game - plays a single game from an opening and writes it in PGN, a position the endgame tables know is a
+       draw ends the game (see Game.outcome)
+    2) run - plays many games over a pool of processes and writes each game to a file as soon as it finishes
+
+every process keeps one transposition table for all of its games and the games are written as they finish, so the
+memory used stays the same no matter how many games are played. an opening book is memory mapped by every process, so
+the processes share the pages of the file instead of each reading a copy
+"""
+
+
+table = None  # the transposition table of the current process, created by start_worker
+book = None  # the opening book of the current process, None if there is no book
+tablebase = None  # the endgame tables of the current process, None if there are none
+
+
+def start_worker(megabytes: float, book_path: str = None, tablebase_path: str = None):
+    """
+    creates the transposition table and opens the opening book and endgame tables of a process in the pool
+
+    :param megabytes: the memory of the table
+    :param book_path: the path of a Polyglot opening book, None if there is no book
+    :param tablebase_path: the directory of the endgame tables, None if there are none
+    """
+
+    global table, book, tablebase
+    table = TranspositionTable(megabytes)
+    book = Book(book_path) if book_path is not None else None
+    tablebase = Tablebase(tablebase_path) if tablebase_path is not None else None
+
+
+def play_game(index: int, opening: str, random_moves: int, time_limit: float, depth: int, nodes: int,
+              max_plies: int) -> str:
+    """
+    plays a single game of the search against itself
+
+    :param index: the number of the game, used as the round and to choose the random moves
+    :param opening: the position to start from as a FEN string, or long algebraic moves from the starting position
+        separated by spaces, for example 'e2e4 e7e5', None to start from the starting position
+    :param random_moves: the number of random moves played after the opening so games from the same opening differ
+    :param time_limit: the number of seconds to search each move, None if there is no time limit
+    :param depth: the depth to search each move, None if there is no depth limit
+    :param nodes: the number of positions to search each move, None if there is no limit
+    :param max_plies: the number of plies (half moves) after which the game is stopped without a result
+    :return: the game in PGN
+    """
+
+    # sets up the opening
+    tags = {'Event': 'Self-play', 'Site': '?', 'Date': date.today().strftime('%Y.%m.%d'), 'Round': index + 1,
+            'White': 'Search', 'Black': 'Search'}
+    if opening is not None and '/' in opening:
+        game = load_fen(Game(), opening)
+        tags.update(SetUp='1', FEN=opening)
+        moves = []
+    else:
+        game = initialize_board(Game())
+        moves = [parse_move(name) for name in opening.split()] if opening is not None else []
+    game.tablebase = tablebase
+    first_turn = game.turn
+    first_number = game.fullmove_number
+
+    # plays until the game is over, the random and book moves are chosen from the number of the game so they can be
+    # repeated
+    generator = Random(index)
+    book.random.seed(index) if book is not None else None
+    names = []
+    search = Search(game, table=table, book=book, tablebase=tablebase)
+    result = game.outcome()
+    while result is None and len(names) < max_plies:
+
+        # chooses the move from the opening, at random or with the search
+        if len(names) < len(moves):
+            move = moves[len(names)]
+            if move not in list(game.legal_moves()):
+                raise ValueError(f'illegal opening move {move} in {opening!r}')
+        elif len(names) < len(moves) + random_moves:
+            move = generator.choice(list(game.legal_moves()))
+        else:
+            move = search.best_move(time_limit, depth, nodes)
+
+        # makes the move and checks if the game is over
+        names.append(san(game, move))
+        game.make_move(*move)
+        result = game.outcome()
+
+    tags.update(PlyCount=len(names))
+    tags.update(Termination='unterminated') if result is None else None
+    return write_game(tags, names, result or '*', first_turn, first_number)
+
+
+def play_task(task: tuple) -> str:
+    """
+    plays a game in a process of the pool
+
+    :param task: the arguments of play_game
+    :return: the game in PGN
+    """
+
+    return play_game(*task)
+
+
+def run(path: str, games: int, openings: list = None, workers: int = None, random_moves: int = 4,
+        time_limit: float = None, depth: int = 2, nodes: int = None, max_plies: int = 400, megabytes: float = 16,
+        book_path: str = None, tablebase_path: str = None, report=print) -> float:
+    """
+    plays many games over a pool of processes, each game is written to the file as soon as it finishes
+
+    :param path: the file to write the games to, games are added to the end of the file
+    :param games: the number of games to play
+    :param openings: a list of openings, see play_game, the games go through the list in order, None to start every
+        game from the starting position
+    :param workers: the number of processes, None for one per core
+    :param random_moves: the number of random moves played after the opening
+    :param time_limit: the number of seconds to search each move, None if there is no time limit
+    :param depth: the depth to search each move, None if there is no depth limit
+    :param nodes: the number of positions to search each move, None if there is no limit
+    :param max_plies: the number of plies (half moves) after which a game is stopped without a result
+    :param megabytes: the memory of the transposition table of each process
+    :param book_path: the path of a Polyglot opening book the search plays from, None if there is no book
+    :param tablebase_path: the directory of the endgame tables the search plays from, None if there are none
+    :param report: the function called with a line of text as games finish
+    :return: the number of games played per second
+    """
+
+    # the tasks are made as the pool asks for them so they are never all in memory at once
+    openings = openings or [None]
+    tasks = ((index, openings[index % len(openings)], random_moves, time_limit, depth, nodes, max_plies)
+             for index in range(games))
+    results = {'1-0': 0, '0-1': 0, '1/2-1/2': 0, '*': 0}
+    start = perf_counter()
+    arguments = (megabytes, book_path, tablebase_path)
+    with open(path, 'a') as file, Pool(workers or cpu_count(), start_worker, arguments) as pool:
+        for count, text in enumerate(pool.imap_unordered(play_task, tasks), 1):
+            file.write(text)
+            file.flush()
+            results[text[text.index('[Result "') + 9:].split('"')[0]] += 1
+            if count % max(1, games // 20) == 0 or count == games:
+                elapsed = perf_counter() - start
+                report(f'{count}/{games} games  {count / elapsed:.2f} games/sec  white {results["1-0"]}  '
+                       f'black {results["0-1"]}  draw {results["1/2-1/2"]}  unfinished {results["*"]}')
+    return games / max(perf_counter() - start, 1e-9)
@@ -0,0 +1,373 @@
+from asyncio import start_server, open_connection, create_task, gather, sleep, run, LimitOverrunError
+from json import dumps, loads
+from random import Random
+from time import perf_counter
+from Board import load_fen, save_fen
+from Game import Game
+from Notation import parse_move, move_name
+from Tablebase import Tablebase
+
+
+"""
+a server hosting many games at once for playing online, every game is checked against the rules on the server so a
+client can not make a move that is not legal. the server runs on asyncio so one process and one thread hold every
+connection, a move is checked and sent to both players without waiting on any other game
+
+the server speaks line delimited JSON over TCP, every message is a JSON object on its own line with a type:
+
+    1) {"type": "join"} - sent by a client to play, the client is paired with the next client that joins
+    2) {"type": "start", "game": 1, "color": "white", "fen": "..."} - sent to both players once they are paired
+    3) {"type": "move", "move": "e2e4"} - sent by the player whose turn it is, the move is in long algebraic notation
+    4) {"type": "move", "move": "e2e4", "fen": "...", "result": null} - sent to both players after a legal move, the
+       result is '1-0', '0-1' or '1/2-1/2' when the move ends the game
+    5) {"type": "end", "result": "1-0", "reason": "resign"} - sent to the other player when a player resigns or leaves
+    6) {"type": "resign"} - sent by a player to give up
+    7) {"type": "error", "message": "..."} - sent to a client whose message was not valid, the game is unchanged. a
+       client that sends a line longer than 4096 bytes is sent an error and its connection is closed
+"""
+
+
+START = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+def send(writer, message: dict):
+    """
+    sends a message to a client, the message is buffered so sending never waits
+
+    :param writer: the stream of the client
+    :param message: the message
+    """
+
+    if not writer.is_closing():
+        writer.write(dumps(message).encode() + b'\n')
+
+
+class Match:
+    """
+    a class representing a game on the server, instances of the class contains the following attributes
+        1) number - the number of the game
+        2) game - the game, only checked against the rules so the possible moves of the pieces are never updated. a
+            position the endgame tables know is a draw ends the game, see Game.outcome
+        3) players - a dict with the color as the key and the stream of the player as the value
+        4) result - the result of the game, None while it is being played
+        5) started - true once both players have joined, moves are refused until then
+
+    class contains the following functions:
+        1) __init__ - creates the game
+        2) move - checks and makes a move then sends it to both players
+        3) end - ends the game and tells the other player
+    """
+
+    __slots__ = ('number', 'game', 'players', 'result', 'started')
+
+    def __init__(self, number: int, tablebase: Tablebase = None):
+        """
+        creates the game
+
+        :param number: the number of the game
+        :param tablebase: the endgame tables the game is looked up in, None if there are none
+        """
+
+        self.number = number
+        self.game = load_fen(Game(tablebase=tablebase), START, False)
+        self.players = {}
+        self.result = None
+        self.started = False
+
+    def move(self, color: str, name: str) -> str:
+        """
+        checks and makes a move then sends it to both players
+
+        :param color: the color of the player making the move
+        :param name: the long algebraic name of the move
+        :return: an error message if the move was not made, None otherwise
+        """
+
+        if self.result is not None:
+            return 'the game is over'
+        if not self.started:
+            return 'the game has not started'
+        if color != self.game.turn:
+            return 'it is not your turn'
+        try:
+            move = parse_move(name)
+        except ValueError as error:
+            return str(error)
+        if move not in self.game.legal_moves():
+            return f'illegal move {name!r}'
+        self.game.make_move(*move)
+        self.result = self.game.outcome()
+        message = {'type': 'move', 'move': move_name(move), 'fen': save_fen(self.game), 'result': self.result}
+        [send(writer, message) for writer in self.players.values()]
+        return None
+
+    def end(self, color: str, reason: str):
+        """
+        ends the game when a player resigns or leaves and tells the other player
+
+        :param color: the color of the player who resigned or left
+        :param reason: 'resign' or 'disconnect'
+        """
+
+        if self.result is None:
+            self.result = '0-1' if color == 'white' else '1-0'
+            message = {'type': 'end', 'result': self.result, 'reason': reason}
+            [send(writer, message) for other, writer in self.players.items() if other != color]
+
+
+class Server:
+    """
+    a class representing the server, instances of the class contains the following attributes
+        1) matches - a dict with the number of a game as the key and the game as the value, games are removed once
+            both players have left
+        2) waiting - the game of a player waiting for another player to join, None if no player is waiting
+        3) games - the number of games started
+        4) moves - the number of moves checked
+        5) seconds - the time spent checking and sending moves
+        6) tablebase - the endgame tables shared by every game, None if there are none
+
+    class contains the following functions:
+        1) __init__ - creates the server
+        2) serve - listens for clients until the server is stopped
+        3) handle - reads the messages of a client
+        4) join - pairs a client with a waiting client
+        5) stats - the numbers of the server
+    """
+
+    def __init__(self, tablebase: Tablebase = None):
+        """
+        creates the server
+
+        :param tablebase: the endgame tables shared by every game, None if there are none
+        """
+
+        self.matches = {}
+        self.waiting = None
+        self.games = 0
+        self.moves = 0
+        self.seconds = 0
+        self.tablebase = tablebase
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765, ready=None):
+        """
+        listens for clients until the server is stopped
+
+        :param host: the address to listen on
+        :param port: the port to listen on
+        :param ready: a function called with the server once it is listening, None if there is none
+        """
+
+        server = await start_server(self.handle, host, port, limit=4096, backlog=4096)
+        ready(server) if ready is not None else None
+        async with server:
+            await server.serve_forever()
+
+    async def handle(self, reader, writer):
+        """
+        reads the messages of a client until it leaves
+
+        :param reader: the stream the messages are read from
+        :param writer: the stream the messages are sent to
+        """
+
+        match = None
+        color = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                # reads the message
+                try:
+                    message = loads(line)
+                    kind = message['type']
+                except (ValueError, KeyError, TypeError):
+                    send(writer, {'type': 'error', 'message': 'invalid message'})
+                    continue
+
+                # handles when the client joins
+                if kind == 'join' and match is None:
+                    match, color = self.join(writer)
+
+                # handles when the client moves, the time is only counted for the moves
+                elif kind == 'move' and match is not None:
+                    start = perf_counter()
+                    error = match.move(color, str(message.get('move')))
+                    self.seconds += perf_counter() - start
+                    self.moves += 1
+                    send(writer, {'type': 'error', 'message': error}) if error is not None else None
+
+                # handles when the client resigns, a game can only be resigned once both players have joined
+                elif kind == 'resign' and match is not None and match.started:
+                    match.end(color, 'resign')
+                elif kind == 'resign' and match is not None:
+                    send(writer, {'type': 'error', 'message': 'the game has not started'})
+                else:
+                    send(writer, {'type': 'error', 'message': f'unexpected message {kind!r}'})
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+        # handles when the line is longer than the limit of the stream, the client is told before it is closed
+        except (ValueError, LimitOverrunError):
+            send(writer, {'type': 'error', 'message': 'the message is too long'})
+
+        # ends the game when the client leaves
+        finally:
+            if match is not None:
+                match.end(color, 'disconnect')
+                match.players.pop(color, None)
+                self.waiting = None if self.waiting is match else self.waiting
+                self.matches.pop(match.number) if not match.players else None
+            writer.close()
+
+    def join(self, writer) -> tuple:
+        """
+        pairs a client with the waiting client, the client waits for the next client when no one is waiting
+
+        :param writer: the stream of the client
+        :return: a tuple of the game and the color of the client
+        """
+
+        # handles when no one is waiting
+        if self.waiting is None:
+            self.games += 1
+            self.waiting = Match(self.games, self.tablebase)
+            self.waiting.players['white'] = writer
+            self.matches[self.waiting.number] = self.waiting
+            return self.waiting, 'white'
+
+        # starts the game
+        match = self.waiting
+        self.waiting = None
+        match.players['black'] = writer
+        match.started = True
+        for color, player in match.players.items():
+            send(player, {'type': 'start', 'game': match.number, 'color': color, 'fen': START})
+        return match, 'black'
+
+    def stats(self) -> str:
+        """
+        finds the numbers of the server
+
+        :return: a line of text with the games being played, the moves checked and the average time to check a move
+        """
+
+        average = self.seconds / self.moves * 1e6 if self.moves else 0
+        return f'{len(self.matches)} games  {self.moves} moves  {average:.0f}us per move'
+
+
+# ===================================================== LOAD TEST ======================================================
+
+
+async def player(host: str, port: int, moves: int, seed: int, latencies: list):
+    """
+    connects to the server and plays random legal moves, keeping a copy of the game to choose the moves from
+
+    :param host: the address of the server
+    :param port: the port of the server
+    :param moves: the number of moves of each player before leaving
+    :param seed: the seed of the random moves
+    :param latencies: a list the seconds from sending each move to receiving it back are added to
+    """
+
+    reader, writer = await open_connection(host, port, limit=4096)
+    writer.write(b'{"type": "join"}\n')
+    generator = Random(seed)
+    game = load_fen(Game(), START, False)
+    color = None
+    sent = None
+    made = 0
+    while made < moves:
+        line = await reader.readline()
+        if not line:
+            break
+        message = loads(line)
+
+        # handles the start of the game and moves of both players
+        if message['type'] == 'start':
+            color = message['color']
+        elif message['type'] == 'move':
+            game.make_move(*parse_move(message['move']))
+            if sent is not None:
+                latencies.append(perf_counter() - sent)
+                sent = None
+                made += 1
+            if message['result'] is not None:
+                break
+        elif message['type'] in ('end', 'error'):
+            break
+
+        # moves when it is the turn of the player
+        if color == game.turn:
+            move = generator.choice(list(game.legal_moves()))
+            sent = perf_counter()
+            writer.write(dumps({'type': 'move', 'move': move_name(move)}).encode() + b'\n')
+            await writer.drain()
+    writer.close()
+
+
+async def load_test(host: str = '127.0.0.1', port: int = 8765, games: int = 1000, moves: int = 20,
+                    connections: int = 200, report=print) -> dict:
+    """
+    plays many games on a server at once with random legal moves, the players connect a few at a time so the server is
+    not flooded with connections
+
+    :param host: the address of the server
+    :param port: the port of the server
+    :param games: the number of games to play at once
+    :param moves: the number of moves of each player before leaving
+    :param connections: the number of players connecting at once
+    :param report: the function called with a line of text of the results
+    :return: a dict of the number of moves, the moves per second and the median and slowest round trip of a move
+    """
+
+    latencies = []
+    start = perf_counter()
+    tasks = []
+    for index in range(2 * games):
+        tasks.append(create_task(player(host, port, moves, index, latencies)))
+        if len(tasks) % connections == 0:
+            await sleep(0.05)
+    await gather(*tasks)
+    elapsed = perf_counter() - start
+    latencies.sort()
+    middle = latencies[len(latencies) // 2] if latencies else 0
+    results = {'moves': len(latencies), 'moves_per_second': len(latencies) / elapsed, 'median': middle,
+               'slowest': latencies[-1] if latencies else 0}
+    report(f'{games} games  {results["moves"]} moves  {results["moves_per_second"]:.0f} moves/sec  '
+           f'median {results["median"] * 1000:.2f}ms  slowest {results["slowest"] * 1000:.2f}ms')
+    return results
+
+
+def serve(host: str = '127.0.0.1', port: int = 8765, report=print, interval: float = 10, tablebase_path: str = None):
+    """
+    runs the server until it is stopped, reporting its numbers every few seconds
+
+    :param host: the address to listen on
+    :param port: the port to listen on
+    :param report: the function called with a line of text of the numbers of the server
+    :param interval: the number of seconds between reports
+    :param tablebase_path: the directory of the endgame tables, None if there are none
+    """
+
+    server = Server(Tablebase(tablebase_path) if tablebase_path is not None else None)
+
+    async def main():
+        """
+        runs the server and the reports
+        """
+
+        async def reports():
+            """
+            reports the numbers of the server every few seconds
+            """
+
+            while True:
+                await sleep(interval)
+                report(server.stats())
+
+        await gather(server.serve(host, port, lambda listening: report(f'listening on {host}:{port}')), reports())
+
+    run(main())
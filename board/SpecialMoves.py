@@ -1,5 +1,4 @@
 from Piece import Piece
-from tkinter import PhotoImage, NW
 
 
 """
@@ -13,12 +12,14 @@ a few functions for special moves that the following pieces can have:
         --> pre-test to see if pawn can advance to the end of the board and upgrade to another piece
         --> pre-test to see if pawn can advance to the end of the board and upgrade to another piece after a
             diagonal attack
+        --> pre-test to see if pawn can attack a pawn that just moved 2 spaces beside it (en passant)
 
         --> action function to move forward 2 spaces
         --> action function to attack a diagonal enemy and move to its place
         --> action function to move forward 1 space
         --> action function to move pawn to end of board and update to another piece
         --> action function to move pawn to end of board and update to another piece after diagonal attack
+        --> action function to attack en passant
 
     2) King
 
@@ -26,80 +27,42 @@ a few functions for special moves that the following pieces can have:
         --> pre-test to see if king can be castled
 
         --> action function to move king to available spots without being put in check/checkmate
-        --> action function to castle the king
+        --> action function to castle the king, the rook is moved by Game.make_move
 """
 
 
 #  =============================================== PAWN HELPER-FUNCTIONS ===============================================
 
 
-def choose_upgrade(pawn: Piece):
+def upgrade(pawn: Piece, name: str) -> Piece:
     """
-    lets the user choose an upgrade for their pawn
+    replaces the pawn with the piece it was upgraded to
 
     :param pawn: the pawn to upgrade
+    :param name: the name of the piece to upgrade to, can be 'queen', 'knight', 'rook' or 'bishop'
+    :return: the new piece
     """
 
-    # loads images
-    pawn.queen = PhotoImage(file=f'board/assets/{pawn.color}/queen.png').subsample(5, 5)
-    pawn.knight = PhotoImage(file=f'board/assets/{pawn.color}/knight.png').subsample(5, 5)
-    pawn.rook = PhotoImage(file=f'board/assets/{pawn.color}/rook.png').subsample(5, 5)
-    pawn.bishop = PhotoImage(file=f'board/assets/{pawn.color}/bishop.png').subsample(5, 5)
+    moves = {'queen': {(0, 'i'), (0, '-i'), ('i', 0), ('-i', 0), ('i', 'i'), ('i', '-i'), ('-i', 'i'), ('-i', '-i')},
+             'knight': {(1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)},
+             'rook': {(0, 'i'), (0, '-i'), ('i', 0), ('-i', 0)},
+             'bishop': {('i', 'i'), ('i', '-i'), ('-i', 'i'), ('-i', '-i')}}
+    return Piece(pawn.game, pawn.coordinates, pawn.color, name, moves[name], None)
 
-    # places images
-    squares = [Piece.CANVAS.create_rectangle(800, (y * 100) + 200, 900, (y * 100) + 300, fill='gray') for y in range(4)]
-    queen_id = Piece.CANVAS.create_image(810, 215, image=pawn.queen, anchor=NW)
-    knight_id = Piece.CANVAS.create_image(820, 315, image=pawn.knight, anchor=NW)
-    rook_id = Piece.CANVAS.create_image(820, 415, image=pawn.rook, anchor=NW)
-    bishop_id = Piece.CANVAS.create_image(815, 510, image=pawn.bishop, anchor=NW)
 
-    # changes click function
-    def click(event):
-        """
-        waits for user to click on choice
-
-        :param event: the click event
-        """
-
-        # scales coordinates for easy indexing
-        x = event.x // 100
-        y = event.y // 100
-
-        # makes sure a choice was selected
-        if x == 8 and 2 <= y <= 5:
-            Piece.CANVAS.delete(pawn.id)
-            piece = None
-
-            # handles when queen is selected
-            if y == 2:
-                moves = {(0, 'i'), (0, '-i'), ('i', 0), ('-i', 0), ('i', 'i'), ('i', '-i'), ('-i', 'i'), ('-i', '-i')}
-                piece = Piece(pawn.coordinates, f'board/assets/{pawn.color}/queen.png', (10, 15), moves, None)
-
-            # handles when knight is selected
-            elif y == 3:
-                moves = {(1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)}
-                piece = Piece(pawn.coordinates, f'board/assets/{pawn.color}/knight.png', (20, 15), moves, None)
-
-            # handles when rook is selected
-            elif y == 4:
-                moves = {(0, 'i'), (0, '-i'), ('i', 0), ('-i', 0)}
-                piece = Piece(pawn.coordinates, f'board/assets/{pawn.color}/rook.png', (20, 15), moves, None)
-
-            # handles when bishop is selected
-            elif y == 5:
-                moves = {('i', 'i'), ('i', '-i'), ('-i', 'i'), ('-i', '-i')}
-                piece = Piece(pawn.coordinates, f'board/assets/{pawn.color}/bishop.png', (15, 10), moves, None)
+def choose_upgrade(pawn: Piece, position: tuple):
+    """
+    lets the user choose an upgrade for their pawn before it moves, when there is no view the pawn is upgraded to a
+    queen
 
-            # places new piece, deletes choice images and continues game
-            Piece.board[pawn.coordinates[0]][pawn.coordinates[1]] = piece
-            [Piece.CANVAS.delete(square) for square in squares]
-            Piece.CANVAS.delete(queen_id)
-            Piece.CANVAS.delete(knight_id)
-            Piece.CANVAS.delete(rook_id)
-            Piece.CANVAS.delete(bishop_id)
-            Piece.CANVAS.bind('<Button-1>', Piece.click)
+    :param pawn: the pawn to upgrade
+    :param position: the position at the end of the board the pawn will move to
+    """
 
-    Piece.CANVAS.bind('<Button-1>', click)
+    if pawn.game.view is None:
+        pawn.game.make_move(pawn.coordinates, position, 'queen')
+    else:
+        pawn.game.view.choose_upgrade(pawn, position)
 
 
 #  ================================================== PAWN PRE-TESTS ===================================================
@@ -115,7 +78,7 @@ def pawn_can_move_two(pawn: Piece) -> bool:
 
     y = -2 if pawn.color == 'white' else 2
     test_one = pawn.has_not_moved and pawn_can_move_one(pawn)
-    return test_one and Piece.board[pawn.coordinates[0]][pawn.coordinates[1] + y] is None
+    return test_one and pawn.game.board[pawn.coordinates[0]][pawn.coordinates[1] + y] is None
 
 
 def pawn_can_attack_left(pawn: Piece) -> bool:
@@ -132,8 +95,8 @@ def pawn_can_attack_left(pawn: Piece) -> bool:
 
     # checks if pawn can attack if pawn is not at end of board
     y = -1 if pawn.color == 'white' else 1
-    piece = Piece.board[pawn.coordinates[0] - 1][pawn.coordinates[1] + y] is not None
-    return piece and Piece.board[pawn.coordinates[0] - 1][pawn.coordinates[1] + y].color != pawn.color
+    piece = pawn.game.board[pawn.coordinates[0] - 1][pawn.coordinates[1] + y] is not None
+    return piece and pawn.game.board[pawn.coordinates[0] - 1][pawn.coordinates[1] + y].color != pawn.color
 
 
 def pawn_can_attack_right(pawn: Piece) -> bool:
@@ -150,8 +113,8 @@ def pawn_can_attack_right(pawn: Piece) -> bool:
 
     # checks if pawn can attack if pawn is not at end of board
     y = -1 if pawn.color == 'white' else 1
-    piece = Piece.board[pawn.coordinates[0] + 1][pawn.coordinates[1] + y] is not None
-    return piece and Piece.board[pawn.coordinates[0] + 1][pawn.coordinates[1] + y].color != pawn.color
+    piece = pawn.game.board[pawn.coordinates[0] + 1][pawn.coordinates[1] + y] is not None
+    return piece and pawn.game.board[pawn.coordinates[0] + 1][pawn.coordinates[1] + y].color != pawn.color
 
 
 def pawn_can_move_one(pawn: Piece) -> bool:
@@ -163,7 +126,7 @@ def pawn_can_move_one(pawn: Piece) -> bool:
     """
 
     y = -1 if pawn.color == 'white' else 1
-    return Piece.board[pawn.coordinates[0]][pawn.coordinates[1] + y] is None
+    return pawn.game.board[pawn.coordinates[0]][pawn.coordinates[1] + y] is None
 
 
 def pawn_can_upgrade(pawn: Piece) -> bool:
@@ -202,6 +165,32 @@ def pawn_can_attack_right_upgrade(pawn: Piece) -> bool:
     return pawn_can_attack_right(pawn) and pawn.coordinates[1] == border
 
 
+def pawn_can_en_passant_left(pawn: Piece) -> bool:
+    """
+    determines if the pawn can attack the pawn to its left en passant, the pawn to its left must have just moved
+    forward 2 spaces
+
+    :param pawn: the pawn to check
+    :return: true if the pawn can attack en passant, false if it cannot
+    """
+
+    y = -1 if pawn.color == 'white' else 1
+    return pawn.game.en_passant == (pawn.coordinates[0] - 1, pawn.coordinates[1] + y)
+
+
+def pawn_can_en_passant_right(pawn: Piece) -> bool:
+    """
+    determines if the pawn can attack the pawn to its right en passant, the pawn to its right must have just moved
+    forward 2 spaces
+
+    :param pawn: the pawn to check
+    :return: true if the pawn can attack en passant, false if it cannot
+    """
+
+    y = -1 if pawn.color == 'white' else 1
+    return pawn.game.en_passant == (pawn.coordinates[0] + 1, pawn.coordinates[1] + y)
+
+
 #  =============================================== PAWN ACTION FUNCTIONS ===============================================
 
 
@@ -256,8 +245,8 @@ def pawn_upgrade(pawn: Piece):
     :param pawn: the pawn to upgrade
     """
 
-    pawn_move_one(pawn)
-    choose_upgrade(pawn)
+    y = -1 if pawn.color == 'white' else 1
+    choose_upgrade(pawn, (pawn.coordinates[0], pawn.coordinates[1] + y))
 
 
 def pawn_attack_left_upgrade(pawn: Piece):
@@ -267,8 +256,8 @@ def pawn_attack_left_upgrade(pawn: Piece):
     :param pawn: the pawn to move and upgrade
     """
 
-    pawn_attack_left(pawn)
-    choose_upgrade(pawn)
+    y = -1 if pawn.color == 'white' else 1
+    choose_upgrade(pawn, (pawn.coordinates[0] - 1, pawn.coordinates[1] + y))
 
 
 def pawn_attack_right_upgrade(pawn: Piece):
@@ -278,8 +267,28 @@ def pawn_attack_right_upgrade(pawn: Piece):
     :param pawn: the pawn to move and upgrade
     """
 
+    y = -1 if pawn.color == 'white' else 1
+    choose_upgrade(pawn, (pawn.coordinates[0] + 1, pawn.coordinates[1] + y))
+
+
+def pawn_en_passant_left(pawn: Piece):
+    """
+    makes the pawn attack the pawn to its left en passant
+
+    :param pawn: the pawn to attack
+    """
+
+    pawn_attack_left(pawn)
+
+
+def pawn_en_passant_right(pawn: Piece):
+    """
+    makes the pawn attack the pawn to its right en passant
+
+    :param pawn: the pawn to attack
+    """
+
     pawn_attack_right(pawn)
-    choose_upgrade(pawn)
 
 
 #  ================================================== KING PRE-TESTS ===================================================
@@ -301,11 +310,12 @@ def generate_king_can_move(move: tuple):
         :return: true if the king can move, false if it cannot
         """
 
+        board = king.game.board
         x = king.coordinates[0] + move[0]
         y = king.coordinates[1] + move[1]
         on_board = 0 <= y <= 7 and 0 <= x <= 7
-        not_blocked = on_board and not (Piece.board[x][y] is not None and Piece.board[x][y].color == king.color)
-        return not_blocked and (not Piece.attacked((x, y), king.color))
+        not_blocked = on_board and not (board[x][y] is not None and board[x][y].color == king.color)
+        return not_blocked and (not king.game.attacked((x, y), king.color))
 
     return wrapped_function
 
@@ -318,11 +328,13 @@ def king_can_castle_left(king: Piece) -> bool:
     :return: true if the king can castle false if it cannot
     """
 
+    board = king.game.board
     y = 7 if king.color == 'white' else 0
-    not_moved = king.has_not_moved and Piece.board[0][y] is not None and Piece.board[0][y].has_not_moved
-    no_pieces_between = Piece.board[1][y] is None and Piece.board[2][y] is None and Piece.board[3][y] is None
-    not_in_check = not Piece.attacked(king.coordinates, king.color)
-    no_checks = (not Piece.attacked((2, y), king.color)) and (not Piece.attacked((3, y), king.color))
+    rook = board[0][y]
+    not_moved = king.has_not_moved and rook is not None and rook.name == 'rook' and rook.has_not_moved
+    no_pieces_between = board[1][y] is None and board[2][y] is None and board[3][y] is None
+    not_in_check = not king.game.attacked(king.coordinates, king.color)
+    no_checks = (not king.game.attacked((2, y), king.color)) and (not king.game.attacked((3, y), king.color))
     return not_moved and no_pieces_between and not_in_check and no_checks
 
 
@@ -334,11 +346,13 @@ def king_can_castle_right(king: Piece) -> bool:
     :return: true if the king can castle false if it cannot
     """
 
+    board = king.game.board
     y = 7 if king.color == 'white' else 0
-    not_moved = king.has_not_moved and Piece.board[7][y] is not None and Piece.board[7][y].has_not_moved
-    no_pieces_between = Piece.board[5][y] is None and Piece.board[6][y] is None
-    not_in_check = not Piece.attacked(king.coordinates, king.color)
-    no_checks = (not Piece.attacked((5, y), king.color)) and (not Piece.attacked((6, y), king.color))
+    rook = board[7][y]
+    not_moved = king.has_not_moved and rook is not None and rook.name == 'rook' and rook.has_not_moved
+    no_pieces_between = board[5][y] is None and board[6][y] is None
+    not_in_check = not king.game.attacked(king.coordinates, king.color)
+    no_checks = (not king.game.attacked((5, y), king.color)) and (not king.game.attacked((6, y), king.color))
     return not_moved and no_pieces_between and not_in_check and no_checks
 
 
@@ -365,6 +379,12 @@ def generate_king_move(move: tuple):
     return wrapped_function
 
 
+# the action of every step of the king, shared by the special moves of the kings (see Board.py) and the moves found
+# from the bitboards (see Game.step_moves) so both find the same action
+KING_STEPS = {move: generate_king_move(move)
+              for move in ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))}
+
+
 def king_castle_left(king: Piece):
     """
     castles the king with the rook to the left
@@ -374,8 +394,6 @@ def king_castle_left(king: Piece):
 
     y = 7 if king.color == 'white' else 0
     king.move((2, y))
-    Piece.board[0][y].toggle_show_moves()
-    Piece.board[0][y].move((3, y))
 
 
 def king_castle_right(king: Piece):
@@ -387,5 +405,3 @@ def king_castle_right(king: Piece):
 
     y = 7 if king.color == 'white' else 0
     king.move((6, y))
-    Piece.board[7][y].toggle_show_moves()
-    Piece.board[7][y].move((5, y))
@@ -0,0 +1,394 @@
+from itertools import product
+from mmap import mmap, ACCESS_READ
+from os import listdir
+from os.path import join, exists
+from time import perf_counter
+from Bitboard import KING_ATTACKS, PAWN_ATTACKS, bits, piece_attacks
+from Game import Game
+from Position import NAMES as CODE_NAMES, BLACK
+
+
+"""
+endgame tables (tablebases) with the result of every position of a few pieces under perfect play, made by retrograde
+analysis: the checkmates are found first, then every position one move before a checkmate, then one move before those
+and so on until no position changes, the positions that are never reached are draws
+
+a table holds every position of a set of pieces, named by the pieces of each side such as 'KQvK' or 'KPvK'. the pieces
+are listed white king, black king, then the other white pieces then the other black pieces, strongest first, and the
+index of a position is the turn followed by the space of every piece as the digits of a number in base 64:
+
+    index = turn * 64 ** n + space of piece 1 * 64 ** (n - 1) + ... + space of piece n
+
+where turn is 0 for white and 1 for black and the spaces are indexed like the bitboards (see Bitboard.py). a table is
+a file of one byte per index:
+
+    1) 0 - a draw, also used for positions that can not happen such as two pieces on the same space
+    2) 1 to 127 - the player whose turn it is checkmates in that many moves, a move being a move of each player
+    3) 128 to 255 - the player whose turn it is is checkmated in the byte minus 128 moves, 128 is a checkmate
+
+positions where black has the stronger pieces are read from the table of white with the board flipped, so 'KvKQ' is
+read from 'KQvK'. the tables do not know about castling, en passant or the fifty move rule, and the files are memory
+mapped when probed so only the pages of the positions looked up are read from the disk
+"""
+
+
+ORDER = ('queen', 'rook', 'bishop', 'knight', 'pawn')
+LETTERS = {'king': 'K', 'queen': 'Q', 'rook': 'R', 'bishop': 'B', 'knight': 'N', 'pawn': 'P'}
+NAMES = {letter: name for name, letter in LETTERS.items()}
+PROMOTIONS = ('queen', 'rook', 'bishop', 'knight')
+OTHER = {'white': 'black', 'black': 'white'}
+
+
+# ====================================================== INDEXING ======================================================
+
+
+def table_pieces(signature: str) -> list:
+    """
+    finds the pieces of a table in the order of its index
+
+    :param signature: the name of the table, for example 'KQvK'
+    :return: a list of tuples of the color and name of each piece
+    """
+
+    white, black = signature.split('v')
+    return [('white', 'king'), ('black', 'king')] + [('white', NAMES[letter]) for letter in white[1:]] + \
+        [('black', NAMES[letter]) for letter in black[1:]]
+
+
+def table_index(placed: list, turn: str) -> tuple:
+    """
+    finds the table and the index of a position, the board is flipped when black has the stronger pieces
+
+    :param placed: a list of tuples of the color, name and space of every piece
+    :param turn: the color of the player whose turn it is
+    :return: a tuple of the name of the table and the index of the position in it
+    """
+
+    # flips the board when black has more or stronger pieces
+    sides = {color: sorted((ORDER.index(name), square) for piece_color, name, square in placed
+                           if piece_color == color and name != 'king') for color in ('white', 'black')}
+    strength = {color: (len(side), [-rank for rank, _ in side]) for color, side in sides.items()}
+    flip = strength['black'] > strength['white']
+    if flip:
+        sides = {OTHER[color]: [(rank, square ^ 56) for rank, square in side] for color, side in sides.items()}
+        turn = OTHER[turn]
+    kings = {(OTHER[color] if flip else color): square ^ (56 if flip else 0)
+             for color, name, square in placed if name == 'king'}
+
+    # finds the name and index
+    signature = 'K' + ''.join(LETTERS[ORDER[rank]] for rank, _ in sides['white']) + 'vK' + \
+        ''.join(LETTERS[ORDER[rank]] for rank, _ in sides['black'])
+    index = 1 if turn == 'black' else 0
+    for square in [kings['white'], kings['black']] + [square for _, square in sides['white'] + sides['black']]:
+        index = index * 64 + square
+    return signature, index
+
+
+def decode(value: int) -> tuple:
+    """
+    finds the result of a byte of a table
+
+    :param value: the byte
+    :return: a tuple of 1 for a win, 0 for a draw or -1 for a loss of the player whose turn it is and the number of
+        moves of either player (plies) until the checkmate
+    """
+
+    if not value:
+        return 0, 0
+    return (1, 2 * value - 1) if value < 128 else (-1, 2 * (value - 128))
+
+
+# ===================================================== GENERATION =====================================================
+
+
+def attacked(pieces: list, squares: list, square: int, color: str, occupied: int, skip: int = None) -> bool:
+    """
+    checks if a space is attacked by the pieces of a color
+
+    :param pieces: the color and name of every piece
+    :param squares: the space of every piece
+    :param square: the space to check
+    :param color: the color of the attacking pieces
+    :param occupied: a bitboard of every piece on the board
+    :param skip: the index of a piece that was killed and can not attack, None if there is none
+    :return: true if the space is attacked
+    """
+
+    for index, (piece_color, name) in enumerate(pieces):
+        if piece_color == color and index != skip and \
+                piece_attacks(name, color, squares[index], occupied) >> square & 1:
+            return True
+    return False
+
+
+def table_moves(pieces: list, squares: list, turn: str) -> list:
+    """
+    finds the legal moves of a position of a table
+
+    :param pieces: the color and name of every piece
+    :param squares: the space of every piece
+    :param turn: the color of the player whose turn it is
+    :return: a list of tuples of the spaces after the move, the index of the killed piece or None, the upgrade or
+        None and the index of the moved piece
+    """
+
+    occupied = 0
+    own = 0
+    for (color, _), square in zip(pieces, squares):
+        occupied |= 1 << square
+        own |= 1 << square if color == turn else 0
+    king = squares[0 if turn == 'white' else 1]
+    moves = []
+    for index, (color, name) in enumerate(pieces):
+        if color != turn:
+            continue
+
+        # finds the spaces the piece can move to, pawns move forward and kill diagonally
+        square = squares[index]
+        if name == 'pawn':
+            step = -8 if turn == 'white' else 8
+            targets = list(bits(PAWN_ATTACKS[turn][square] & occupied & ~own))
+            if not occupied >> (square + step) & 1:
+                targets.append(square + step)
+                if square // 8 == (6 if turn == 'white' else 1) and not occupied >> (square + 2 * step) & 1:
+                    targets.append(square + 2 * step)
+        else:
+            targets = bits(piece_attacks(name, turn, square, occupied) & ~own)
+
+        # keeps the moves that do not leave the king in check
+        for target in targets:
+            killed = squares.index(target) if occupied >> target & 1 else None
+            after = list(squares)
+            after[index] = target
+            if attacked(pieces, after, target if name == 'king' else king, OTHER[turn],
+                        occupied & ~(1 << square) | 1 << target, killed):
+                continue
+            upgrades = PROMOTIONS if name == 'pawn' and target // 8 in (0, 7) else (None,)
+            moves += [(after, killed, upgrade, index) for upgrade in upgrades]
+    return moves
+
+
+def generate(signature: str, directory: str, report=print, tables: dict = None) -> bytearray:
+    """
+    makes the table of a set of pieces by retrograde analysis and writes it to a file, the tables of the positions
+    reached by kills and upgrades are made first when their files do not exist yet
+
+    :param signature: the name of the table, for example 'KQvK', white must have the stronger pieces
+    :param directory: the directory the tables are read from and written to
+    :param report: the function called with a line of text as the tables are made
+    :param tables: a dict with the name of a table as the key and the table as the value, the tables already made
+    :return: the table
+    """
+
+    # handles when the table was already made
+    tables = tables if tables is not None else {}
+    if signature in tables:
+        return tables[signature]
+    path = join(directory, f'{signature}.tb')
+    if exists(path):
+        with open(path, 'rb') as file:
+            tables[signature] = bytearray(file.read())
+        return tables[signature]
+    pieces = table_pieces(signature)
+    if table_index([(color, name, 0) for color, name in pieces], 'white')[0] != signature:
+        raise ValueError(f'invalid table {signature!r}, white must have the stronger pieces')
+    start = perf_counter()
+    count = len(pieces)
+    half = 64 ** count
+    weights = [64 ** (count - 1 - index) for index in range(count)]
+    legal = bytearray(2 * half)
+    counts = bytearray(2 * half)  # the moves that stay in the table whose result is not known yet
+    longest = bytearray(2 * half)  # the most moves of a kill or upgrade that loses
+    values = bytearray(2 * half)
+    wins = [[] for _ in range(512)]
+    losses = [[] for _ in range(512)]
+
+    # finds the result of every kill and upgrade from its own table and counts the rest of the moves
+    index = -1
+    for turn in ('white', 'black'):
+        enemy = OTHER[turn]
+        for squares in product(range(64), repeat=count):
+            index += 1
+
+            # skips positions that can not happen
+            if len(set(squares)) != count or KING_ATTACKS[squares[0]] >> squares[1] & 1:
+                continue
+            if any(name == 'pawn' and square // 8 in (0, 7) for (_, name), square in zip(pieces, squares)):
+                continue
+            occupied = sum(1 << square for square in squares)
+            if attacked(pieces, squares, squares[1 if turn == 'white' else 0], turn, occupied):
+                continue
+            legal[index] = 1
+
+            # handles checkmates and stalemates
+            moves = table_moves(pieces, list(squares), turn)
+            if not moves:
+                losses[0].append(index) if attacked(pieces, squares, squares[0 if turn == 'white' else 1], enemy,
+                                                    occupied) else None
+                continue
+
+            # a kill or upgrade that wins or draws means the position is never lost, so it is counted as a move whose
+            # result is never known
+            shortest = None
+            exits = False
+            for after, killed, upgrade, moved in moves:
+                if killed is None and upgrade is None:
+                    counts[index] += 1
+                    continue
+                exits = True
+                placed = [(color, upgrade if position == moved and upgrade is not None else name, after[position])
+                          for position, (color, name) in enumerate(pieces) if position != killed]
+                child, child_index = table_index(placed, enemy)
+                result, plies = decode(generate(child, directory, report, tables)[child_index])
+                if result == 1:
+                    longest[index] = max(longest[index], plies)
+                else:
+                    counts[index] += 1
+                    shortest = plies + 1 if result == -1 and (shortest is None or plies + 1 < shortest) else shortest
+            if shortest is not None:
+                wins[shortest].append(index)
+            elif exits and not counts[index]:
+                losses[longest[index] + 1].append(index)
+
+    # finds the positions one move before the positions found so far, the fewest moves first
+    for plies in range(512):
+        for index, lost in [(index, True) for index in losses[plies]] + [(index, False) for index in wins[plies]]:
+            if values[index]:
+                continue
+            values[index] = 128 + plies // 2 if lost else (plies + 1) // 2
+
+            # finds the squares of the pieces and takes back every move of the player who just moved
+            turn = 'black' if index >= half else 'white'
+            moved = OTHER[turn]
+            squares = []
+            rest = index % half
+            for weight in weights:
+                squares.append(rest // weight)
+                rest %= weight
+            occupied = sum(1 << square for square in squares)
+            base = index - (half if turn == 'black' else 0) + (half if moved == 'black' else 0)
+            for position, (color, name) in enumerate(pieces):
+                if color != moved:
+                    continue
+                square = squares[position]
+                if name == 'pawn':
+                    step = 8 if moved == 'white' else -8
+                    origins = []
+                    if 8 <= square + step < 56 and not occupied >> (square + step) & 1:
+                        origins.append(square + step)
+                        if square // 8 == (4 if moved == 'white' else 3) and not occupied >> (square + 2 * step) & 1:
+                            origins.append(square + 2 * step)
+                else:
+                    origins = bits(piece_attacks(name, moved, square, occupied) & ~occupied)
+
+                # a position before a loss is a win, a position where every move wins for the other player is a loss
+                for origin in origins:
+                    previous = base + (origin - square) * weights[position]
+                    if not legal[previous] or values[previous]:
+                        continue
+                    if lost:
+                        wins[plies + 1].append(previous)
+                    else:
+                        counts[previous] -= 1
+                        if not counts[previous]:
+                            losses[max(plies, longest[previous]) + 1].append(previous)
+        wins[plies] = losses[plies] = None
+
+    # writes the table
+    with open(path, 'wb') as file:
+        file.write(values)
+    tables[signature] = values
+    report(f'{signature}  {sum(legal)} positions  {sum(1 for value in values if 0 < value < 128)} wins  '
+           f'{sum(1 for value in values if value >= 128)} losses  {perf_counter() - start:.1f}s')
+    return values
+
+
+# ======================================================= PROBING ======================================================
+
+
+class Tablebase:
+    """
+    a class representing a directory of tables that are memory mapped when first probed, instances of the class
+    contains the following attributes
+        1) directory - the directory of the tables
+        2) maps - a dict with the name of a table as the key and its memory map as the value
+        3) pieces - the most pieces of a table in the directory, positions with more pieces are not probed
+
+    class contains the following functions:
+        1) __init__ - finds the tables of a directory
+        2) probe - finds the result of the position of a game
+        3) best_move - finds the move that checkmates the fastest or loses the slowest
+        4) close - closes the memory maps
+    """
+
+    def __init__(self, directory: str):
+        """
+        finds the tables of a directory, no table is read until it is probed
+
+        :param directory: the directory of the tables
+        """
+
+        self.directory = directory
+        names = [name[:-3] for name in listdir(directory) if name.endswith('.tb')]
+        self.maps = dict.fromkeys(names)
+        self.pieces = max((len(name) - 1 for name in names), default=0)
+
+    def probe(self, game: Game) -> tuple:
+        """
+        finds the result of the position of a game, positions with castling rights or an en passant kill are not in
+        the tables
+
+        :param game: the game
+        :return: a tuple of 1 for a win, 0 for a draw or -1 for a loss of the player whose turn it is and the number
+            of moves of either player until the checkmate, or None if the position is not in a table
+        """
+
+        # handles positions with too many pieces or rights the tables do not know about
+        if bin(game.occupied['white'] | game.occupied['black']).count('1') > self.pieces or game.castling or \
+                game.en_passant_key():
+            return None
+
+        # finds the table, mapping it the first time it is used
+        placed = [('black' if code & BLACK else 'white', CODE_NAMES[code & 7], square)
+                  for square, code in enumerate(game.squares) if code]
+        signature, index = table_index(placed, game.turn)
+        if signature not in self.maps:
+            return None
+        if self.maps[signature] is None:
+            with open(join(self.directory, f'{signature}.tb'), 'rb') as file:
+                self.maps[signature] = mmap(file.fileno(), 0, access=ACCESS_READ)
+        return decode(self.maps[signature][index])
+
+    def best_move(self, game: Game) -> tuple:
+        """
+        finds the move that checkmates the fastest when the position is won, keeps the draw when it is drawn and
+        loses the slowest when it is lost
+
+        :param game: the game, the game is back in its position when the function returns
+        :return: the move in the form (start, end, promotion), see Game.legal_moves, or None if a position is not in
+            a table
+        """
+
+        best = None
+        best_score = None
+        for move in list(game.legal_moves()):
+            game.make_move(*move)
+            found = self.probe(game)
+            game.unmake_move()
+            if found is None:
+                return None
+
+            # a loss for the other player is best, then a draw, then a win for the other player
+            result, plies = found
+            score = 1000 - plies if result == -1 else 0 if result == 0 else plies - 1000
+            if best_score is None or score > best_score:
+                best, best_score = move, score
+        return best
+
+    def close(self):
+        """
+        closes the memory maps
+        """
+
+        [table.close() for table in self.maps.values() if table is not None]
+        self.maps = dict.fromkeys(self.maps)
@@ -0,0 +1,188 @@
+from array import array
+from Bitboard import SQUARES, COORDINATES
+
+
+"""
+a table of searched positions (transposition table) so a position reached by a different order of moves is not searched
+again. the table is a flat array of 64 bit numbers instead of a dict of objects so its memory is fixed when it is
+created, a table of n megabytes takes n megabytes no matter how many positions are stored in it
+
+the table is split into buckets of two entries, every entry is two numbers:
+
+    1) the key of the position xor the data, so an entry that was only partly written never matches a key
+    2) the data, packed from lowest bit to highest as
+        1) the best move, 6 bits for the start space, 6 bits for the end space and 3 bits for the upgrade
+        2) the score plus SCORE_OFFSET, 32 bits
+        3) the depth, 8 bits
+        4) the bound, 2 bits, 0 when the entry is empty
+        5) the generation of the search that stored it, 6 bits
+
+the first entry of a bucket keeps the deepest search (depth-preferred) and the second entry is always replaced, entries
+from older searches are replaced first no matter how deep they are (aging)
+
+the array can also be a buffer shared between processes (see Parallel.py), a process writing an entry while another
+reads it can only cause a miss since the key is stored xor the data
+"""
+
+
+# the bound of a score, the score is exact, at least the score (a cutoff) or at most the score (no move raised alpha)
+EXACT, LOWER, UPPER = 1, 2, 3
+SCORE_OFFSET = 1 << 31
+ENTRY_BYTES = 16
+PROMOTIONS = (None, 'queen', 'rook', 'bishop', 'knight')
+PROMOTION_CODES = {name: code for code, name in enumerate(PROMOTIONS)}
+
+
+def table_bytes(megabytes: float) -> int:
+    """
+    finds the number of bytes a table uses
+
+    :param megabytes: the memory the table may take
+    :return: the number of bytes of the entries, at most megabytes but always at least one bucket
+    """
+
+    return max(1, int(megabytes * (1 << 20)) // (2 * ENTRY_BYTES)) * 2 * ENTRY_BYTES
+
+
+def pack_move(move: tuple) -> int:
+    """
+    packs a move into 15 bits
+
+    :param move: the move in the form (start, end, promotion), see Game.legal_moves, or None for no move
+    :return: the packed move, 0 for no move since no move starts and ends on the same space
+    """
+
+    if move is None:
+        return 0
+    (start_x, start_y), (end_x, end_y), promotion = move
+    return SQUARES[start_x][start_y] | SQUARES[end_x][end_y] << 6 | PROMOTION_CODES[promotion] << 12
+
+
+def unpack_move(packed: int) -> tuple:
+    """
+    unpacks a move packed by pack_move
+
+    :param packed: the packed move
+    :return: the move in the form (start, end, promotion), or None for no move
+    """
+
+    if not packed:
+        return None
+    return COORDINATES[packed & 63], COORDINATES[packed >> 6 & 63], PROMOTIONS[packed >> 12 & 7]
+
+
+class TranspositionTable:
+    """
+    a class representing a transposition table with a fixed amount of memory. instances of the class contains the
+    following attributes
+        1) megabytes - the memory the table was created with
+        2) buckets - the number of buckets in the table
+        3) entries - the array of 64 bit numbers holding the entries, 4 numbers per bucket, either an array or a
+            memoryview of a shared buffer
+        4) generation - the number of the current search, used to age entries from older searches
+
+    class contains the following functions:
+        1) __init__ - creates an empty table
+        2) clear - empties the table
+        3) new_search - starts a new generation so the entries of older searches are replaced first
+        4) probe - finds the entry of a position
+        5) store - stores the result of searching a position
+        6) usage - finds the share of the table in use by the current search
+    """
+
+    def __init__(self, megabytes: float = 16, buffer=None):
+        """
+        creates an empty table
+
+        :param megabytes: the memory the table may take
+        :param buffer: a buffer of at least table_bytes(megabytes) bytes to keep the entries in, for example shared
+            memory, None to create an array. the buffer is used as it is so it should be zeroed
+        """
+
+        self.megabytes = megabytes
+        self.buckets = table_bytes(megabytes) // (2 * ENTRY_BYTES)
+        if buffer is None:
+            self.entries = array('Q', [0]) * (4 * self.buckets)
+        else:
+            self.entries = memoryview(buffer).cast('B').cast('Q')[:4 * self.buckets]
+        self.generation = 0
+
+    def clear(self):
+        """
+        empties the table, a shared buffer is zeroed a megabyte at a time so no second table is allocated
+        """
+
+        zeros = array('Q', [0]) * min(len(self.entries), 1 << 17)
+        for start in range(0, len(self.entries), len(zeros)):
+            end = min(start + len(zeros), len(self.entries))
+            self.entries[start:end] = zeros[0:end - start]
+        self.generation = 0
+
+    def new_search(self):
+        """
+        starts a new generation so the entries of older searches are replaced first
+        """
+
+        self.generation = (self.generation + 1) & 63
+
+    def probe(self, key: int) -> tuple:
+        """
+        finds the entry of a position
+
+        :param key: the zobrist key of the position
+        :return: a tuple of (depth, score, bound, best move), or None if the position is not in the table
+        """
+
+        entries = self.entries
+        index = key % self.buckets * 4
+        for slot in (index, index + 2):
+            data = entries[slot + 1]
+            if entries[slot] ^ data == key and data >> 56 & 3:
+                return data >> 48 & 255, (data >> 16 & 0xFFFFFFFF) - SCORE_OFFSET, data >> 56 & 3, \
+                    unpack_move(data & 0x7FFF)
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: tuple):
+        """
+        stores the result of searching a position, the depth-preferred entry of the bucket is only replaced by a search
+        at least as deep, by the same position or when it is from an older search, otherwise the always-replace entry is
+        replaced
+
+        :param key: the zobrist key of the position
+        :param depth: the depth the position was searched to
+        :param score: the score of the position
+        :param bound: EXACT, LOWER or UPPER
+        :param move: the best move found, None if no move was best
+        """
+
+        # finds the entry to replace
+        entries = self.entries
+        index = key % self.buckets * 4
+        data = entries[index + 1]
+        if data >> 56 & 3 and entries[index] ^ data != key and data >> 58 == self.generation and \
+                data >> 48 & 255 > depth:
+            index += 2
+
+        # keeps the best move of the position when the new search did not find one
+        if move is None and entries[index] ^ entries[index + 1] == key:
+            packed_move = entries[index + 1] & 0x7FFF
+        else:
+            packed_move = pack_move(move)
+
+        data = packed_move | (score + SCORE_OFFSET) << 16 | min(depth, 255) << 48 | bound << 56 | self.generation << 58
+        entries[index] = key ^ data
+        entries[index + 1] = data
+
+    def usage(self) -> int:
+        """
+        finds the share of the table in use by the current search by sampling the first buckets
+
+        :return: the share in use per thousand, the unit used by UCI (hashfull)
+        """
+
+        sample = min(self.buckets, 500)
+        used = 0
+        for index in range(0, sample * 4, 2):
+            data = self.entries[index + 1]
+            used += 1 if data >> 56 & 3 and data >> 58 == self.generation else 0
+        return used * 1000 // (sample * 2)
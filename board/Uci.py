@@ -0,0 +1,285 @@
+from multiprocessing import cpu_count
+from sys import stdin, stdout
+from threading import Thread, Event, Lock
+from Board import initialize_board, load_fen
+from Game import Game
+from Notation import parse_move, move_name
+from Parallel import ParallelSearch
+from Search import Search, MATE
+from Transposition import TranspositionTable
+
+
+"""
+the computer as a UCI engine, so it can be played against other engines by tournament managers such as cutechess-cli
+or fastchess. commands are read from the standard input and answers are written to the standard output, the search
+runs in its own thread so commands such as stop and isready are answered while it searches:
+
+    1) uci - names the engine and its options, Hash (the megabytes of the transposition table) and Threads (the
+       number of processes searching, see Parallel.py)
+    2) isready - answers readyok
+    3) setoption name Hash value 64 - sets an option
+    4) ucinewgame - clears the transposition table
+    5) position startpos moves e2e4 e7e5 - sets up the start position or a FEN string (position fen ...) and makes
+       the moves
+    6) go wtime 60000 btime 60000 winc 1000 binc 1000 - searches the position, limited by the clocks, movetime, depth
+       or nodes, or until stop with infinite. an info line is written after every depth and bestmove once it is done
+    7) stop - ends the search, the best move so far is written
+    8) quit - ends the search and the engine
+"""
+
+
+NAME = 'Chess'
+AUTHOR = 'TB543'
+OVERHEAD = 0.03  # the seconds kept back from every move for reading and writing the commands
+MOVES_TO_GO = 30  # the number of moves the time left is shared between when the number is not given
+
+
+class Engine:
+    """
+    a class representing the computer speaking UCI, instances of the class contains the following attributes
+        1) game - the position set by the last position command
+        2) megabytes - the memory of the transposition table, the Hash option
+        3) threads - the number of processes searching, the Threads option
+        4) search - the search, a Search for one thread or a ParallelSearch otherwise, created when the first go
+            command arrives
+        5) thread - the thread running the search, None when there is no search
+        6) stopped - an event set by stop, an infinite search waits for it before writing its best move
+        7) lock - a lock held while writing a line so the lines of the two threads are never mixed
+        8) output - the stream the answers are written to
+
+    class contains the following functions:
+        1) __init__ - creates the engine with the start position
+        2) run - reads commands until quit
+        3) command - handles a single command
+        4) send - writes a line
+        5) set_option - sets the Hash or Threads option
+        6) position - sets up a position and makes the moves after it
+        7) go - starts a search
+        8) think - searches and writes the best move, run by the search thread
+        9) info - writes the info line of a depth
+        10) stop - ends the search and waits for its best move
+        11) close - ends the search and stops the processes of a parallel search
+    """
+
+    def __init__(self, output=stdout):
+        """
+        creates the engine with the start position
+
+        :param output: the stream the answers are written to
+        """
+
+        self.game = initialize_board(Game())
+        self.megabytes = 16
+        self.threads = 1
+        self.search = None
+        self.thread = None
+        self.stopped = Event()
+        self.lock = Lock()
+        self.output = output
+
+    def run(self, lines=stdin):
+        """
+        reads commands until quit or the end of the input
+
+        :param lines: the lines of the commands
+        """
+
+        for line in lines:
+            if not self.command(line):
+                break
+        self.close()
+
+    def command(self, line: str) -> bool:
+        """
+        handles a single command, commands that are not known are ignored as UCI asks
+
+        :param line: the line of the command
+        :return: false when the command is quit, true otherwise
+        """
+
+        words = line.split()
+        name = words[0] if words else ''
+
+        # handles the commands answered straight away, even while searching
+        if name == 'uci':
+            self.send(f'id name {NAME}')
+            self.send(f'id author {AUTHOR}')
+            self.send('option name Hash type spin default 16 min 1 max 4096')
+            self.send(f'option name Threads type spin default 1 min 1 max {cpu_count()}')
+            self.send('uciok')
+        elif name == 'isready':
+            self.send('readyok')
+        elif name == 'stop':
+            self.stop()
+        elif name == 'quit':
+            return False
+
+        # handles the commands that change the position or the search, the search is ended first
+        elif name == 'setoption':
+            self.stop()
+            self.set_option(words[1:])
+        elif name == 'ucinewgame':
+            self.stop()
+            self.search.table.clear() if self.search is not None else None
+        elif name == 'position':
+            self.stop()
+            self.position(words[1:])
+        elif name == 'go':
+            self.stop()
+            self.go(words[1:])
+        return True
+
+    def send(self, line: str):
+        """
+        writes a line to the output and flushes it so the tournament manager reads it straight away
+
+        :param line: the line without the end of line
+        """
+
+        with self.lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def set_option(self, words: list):
+        """
+        sets the Hash or Threads option, the search is created again with the new option at the next go command
+
+        :param words: the words after setoption, in the form name <name> value <value>
+        """
+
+        if 'name' not in words or 'value' not in words:
+            return
+        name = ' '.join(words[words.index('name') + 1:words.index('value')]).lower()
+        try:
+            value = int(words[words.index('value') + 1])
+        except (ValueError, IndexError):
+            self.send(f'info string invalid value for {name}')
+            return
+        if name == 'hash':
+            self.megabytes = min(max(value, 1), 4096)
+        elif name == 'threads':
+            self.threads = min(max(value, 1), cpu_count())
+        else:
+            return
+        self.close()
+        self.search = None
+
+    def position(self, words: list):
+        """
+        sets up the start position or a FEN string and makes the moves after it, the moves are made so the game keeps
+        the positions that were reached for finding repetitions
+
+        :param words: the words after position, startpos or fen followed by the FEN string, then moves and the long
+            algebraic names of the moves
+        """
+
+        end = words.index('moves') if 'moves' in words else len(words)
+        try:
+            if words and words[0] == 'fen':
+                game = load_fen(Game(), ' '.join(words[1:end]), False)
+            else:
+                game = initialize_board(Game())
+
+            # makes the moves, the position stays at the last legal move
+            for name in words[end + 1:]:
+                move = parse_move(name)
+                if move not in list(game.legal_moves()):
+                    raise ValueError(f'illegal move {name!r}')
+                game.make_move(*move)
+        except (ValueError, IndexError) as error:
+            self.send(f'info string {error}')
+            return
+        self.game = game
+
+    def go(self, words: list):
+        """
+        starts a search of the position in its own thread, the time of the move is found from the clocks as the time
+        left shared between the moves to go plus most of the increment
+
+        :param words: the words after go, pairs such as wtime 60000 and movetime 1000 and the word infinite
+        """
+
+        # reads the limits
+        values = {}
+        for name, value in zip(words, words[1:]):
+            if name in ('wtime', 'btime', 'winc', 'binc', 'movestogo', 'movetime', 'depth', 'nodes'):
+                try:
+                    values[name] = int(value)
+                except ValueError:
+                    pass
+        infinite = 'infinite' in words
+
+        # finds the time of the move in seconds
+        white = self.game.turn == 'white'
+        left = values.get('wtime' if white else 'btime')
+        if 'movetime' in values:
+            time_limit = max(values['movetime'] / 1000 - OVERHEAD, 0.01)
+        elif left is not None and not infinite:
+            share = left / values.get('movestogo', MOVES_TO_GO) + values.get('winc' if white else 'binc', 0) * 0.75
+            time_limit = max(min(share, left / 2) / 1000 - OVERHEAD, 0.01)
+        else:
+            time_limit = None
+
+        # creates the search for the options and starts it
+        if self.search is None and self.threads > 1:
+            self.search = ParallelSearch(self.game, self.threads, self.megabytes, self.info)
+        elif self.search is None:
+            self.search = Search(self.game, self.info, TranspositionTable(self.megabytes))
+        self.search.game = self.game
+        if isinstance(self.search, ParallelSearch):
+            self.search.search.game = self.game
+        self.stopped.clear()
+        self.thread = Thread(target=self.think, args=(time_limit, values.get('depth'), values.get('nodes'), infinite),
+                             daemon=True)
+        self.thread.start()
+
+    def think(self, time_limit: float, depth: int, nodes: int, infinite: bool):
+        """
+        searches the position and writes the best move, an infinite search waits for stop before writing it
+
+        :param time_limit: the number of seconds the search may take, None if there is no time limit
+        :param depth: the deepest depth to search, None if there is no depth limit
+        :param nodes: the number of positions the search may search, None if there is no limit
+        :param infinite: true if the best move is only written after stop
+        """
+
+        move = self.search.best_move(time_limit, depth, nodes)
+        self.stopped.wait() if infinite else None
+        self.send(f'bestmove {move_name(move) if move is not None else "0000"}')
+
+    def info(self, depth: int, score: int, nodes: int, seconds: float, line: list):
+        """
+        writes the info line of a depth, mates are written as the number of moves to the mate
+
+        :param depth: the depth that was searched
+        :param score: the score of the position in centipawns
+        :param nodes: the number of positions searched
+        :param seconds: the time searched
+        :param line: the principal variation
+        """
+
+        plies = MATE - abs(score)
+        value = f'mate {(plies + 1) // 2 * (1 if score > 0 else -1)}' if plies < 128 else f'cp {score}'
+        speed = int(nodes / seconds) if seconds > 0 else 0
+        self.send(f'info depth {depth} score {value} nodes {nodes} nps {speed} time {int(seconds * 1000)} '
+                  f'pv {" ".join(move_name(move) for move in line)}')
+
+    def stop(self):
+        """
+        ends the search and waits for the search thread to write its best move, the stop flag is set until the thread
+        ends since the search clears it when it starts
+        """
+
+        self.stopped.set()
+        while self.thread is not None and self.thread.is_alive():
+            (self.search.search if isinstance(self.search, ParallelSearch) else self.search).stop = True
+            self.thread.join(0.01)
+        self.thread = None
+
+    def close(self):
+        """
+        ends the search and stops the processes of a parallel search
+        """
+
+        self.stop()
+        self.search.close() if isinstance(self.search, ParallelSearch) else None
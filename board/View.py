@@ -0,0 +1,369 @@
+from os.path import dirname, abspath, join
+from queue import Queue
+from threading import Thread
+from Game import Game
+from Piece import Piece
+from Search import Search
+from Client import Remote
+from tkinter import Canvas, PhotoImage, NW
+
+
+ASSETS = join(dirname(abspath(__file__)), 'assets')
+BOARD_SCALE = 2  # the piece images are shrunk by this factor on the board
+PICKER_SCALE = 5  # the piece images are shrunk by this factor in the upgrade picker
+SPRITES = {}  # the decoded piece images with (color, name, scale) as the key, shared by every view
+
+
+def sprite(color: str, name: str, scale: int) -> PhotoImage:
+    """
+    finds the image of a piece, each image is decoded from its file once and kept for every later use. only the shrunk
+    image is kept so there is one image in memory per sprite
+
+    :param color: the color of the piece
+    :param name: the name of the piece
+    :param scale: the factor the image is shrunk by
+    :return: the image
+    """
+
+    image = SPRITES.get((color, name, scale))
+    if image is None:
+        image = PhotoImage(file=join(ASSETS, color, f'{name}.png')).subsample(scale, scale)
+        SPRITES[(color, name, scale)] = image
+    return image
+
+
+def preload():
+    """
+    decodes every image the board and the upgrade picker use so no image is decoded during a game, a tkinter window
+    must exist first
+    """
+
+    for color in ('white', 'black'):
+        for name in ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king'):
+            sprite(color, name, BOARD_SCALE)
+        for name in ('queen', 'knight', 'rook', 'bishop'):
+            sprite(color, name, PICKER_SCALE)
+
+
+class View:
+    """
+    a class representing the tkinter canvas that draws the game, the rules can run without it so this module is only
+    imported when the game is played with a window. contains the following attributes:
+        1) offsets - the number of pixels to offset each piece image for it to be centered on its space
+
+    instances of the class contains the following attributes
+        1) canvas - the canvas where the pieces will be drawn to
+        2) game - the game being drawn
+        3) images - a dict with the piece as the key and the id of its image on the canvas as the value, the images
+            themselves are shared sprites, see sprite
+        4) clicked_piece - the piece whose moves are being displayed, None if no moves are displayed
+        5) highlights - a list indexed [x][y] like the game board of the 64 highlights, one circle per space that is
+            created hidden and is only shown, hidden and recolored afterwards
+        6) shown - a dict with the coordinates of the shown highlights as the key and their color as the value
+        7) show_all - true when every possible move of the player whose turn it is is displayed while no piece is
+            clicked
+        8) ai - the search playing against the user, None when two users play
+        9) ai_color - the color the search plays
+        10) remote - the connection to a game on the server when playing online, None otherwise
+        11) thinking - the queue the search of the ai puts its move on while it thinks, None otherwise. the search
+            makes and takes back moves on the game so the game is not read by the window while it thinks
+        12) status - the id of the text under the upgrade picker telling the user why a move was taken back or that
+            the connection to the server was lost
+
+    class contains the following functions:
+        1) __init__ - creates the canvas and attaches it to the game
+        2) sync - moves, creates and deletes piece images so they match the board
+        3) highlight - shows the highlights of the moves that should be displayed and hides the rest
+        4) toggle_show_moves - display or hides possible moves for a piece
+        5) toggle_show_all - display or hides every possible move of the player whose turn it is
+        6) click - handles when the mouse is clicked on the board
+        7) choose_upgrade - lets the user choose an upgrade for their pawn
+        8) end_turn - updates the board after a move and lets the ai move when it is its turn
+        9) ai_move - starts the search of the ai in its own thread
+        10) ai_done - makes the move the ai chose once its search is done
+        11) poll - makes the moves of the other player and handles the errors of the server when playing online
+    """
+
+    offsets = {'pawn': (20, 15), 'bishop': (20, 15), 'rook': (20, 15), 'knight': (20, 15), 'queen': (15, 15),
+               'king': (20, 15)}
+
+    def __init__(self, game: Game, ai: Search = None, ai_color: str = 'black', remote: Remote = None):
+        """
+        creates the canvas and attaches it to the game
+
+        :param game: the game to draw
+        :param ai: the search playing against the user, None when two users play
+        :param ai_color: the color the search plays
+        :param remote: the connection to a game on the server when playing online, None otherwise
+        """
+
+        # creates the canvas and decodes the piece images
+        self.canvas = Canvas(width=900, height=800)
+        self.canvas.pack()
+        self.canvas.master.resizable(False, False)
+        preload()
+        self.game = game
+        self.images = {}
+        self.clicked_piece = None
+        self.shown = {}
+        self.show_all = False
+        self.ai = ai
+        self.ai_color = ai_color
+        self.remote = remote
+        self.thinking = None
+
+        # places the board spaces on the canvas
+        for y in range(8):
+            y *= 100
+            for x in range(8):
+                x *= 100
+                fill = ['#e3c16f', '#b88b4a'][((x + y) // 100) % 2]
+                self.canvas.create_rectangle(x, y, x + 100, y + 100, fill=fill)
+
+        # creates the hidden highlights under where the pieces will be drawn and the show all moves button
+        self.highlights = [[self.canvas.create_oval(x * 100, y * 100, x * 100 + 100, y * 100 + 100, fill='blue',
+                                                    state='hidden') for y in range(8)] for x in range(8)]
+        self.canvas.create_rectangle(800, 0, 900, 100, fill='gray')
+        self.canvas.create_text(850, 50, text='show all\nmoves', justify='center')
+        self.status = self.canvas.create_text(850, 700, text='', justify='center', width=90)
+
+        # binds click event to click function and attaches the view
+        self.canvas.bind('<Button-1>', self.click)
+        game.view = self
+        self.canvas.after(50, self.poll) if remote is not None else None
+
+    def sync(self):
+        """
+        updates the canvas so it matches the board by performing the following actions
+            1) deletes the images of pieces that were killed or upgraded
+            2) creates images for pieces that do not have one yet
+            3) moves every image to the coordinates of its piece
+        """
+
+        # deletes images of pieces that are no longer on the board
+        pieces = {piece for column in self.game.board for piece in column if piece is not None}
+        for piece in tuple(self.images.keys()):
+            if piece not in pieces:
+                self.canvas.delete(self.images.pop(piece))
+
+        # creates and moves images
+        for piece in pieces:
+            x = (piece.coordinates[0] * 100) + View.offsets[piece.name][0]
+            y = (piece.coordinates[1] * 100) + View.offsets[piece.name][1]
+            if piece not in self.images:
+                image = sprite(piece.color, piece.name, BOARD_SCALE)
+                self.images[piece] = self.canvas.create_image(x, y, image=image, anchor=NW)
+            else:
+                self.canvas.coords(self.images[piece], x, y)
+
+    def highlight(self):
+        """
+        shows the highlights of the possible moves of the clicked piece in blue, or of every piece of the player whose
+        turn it is in light blue when show all is on, and hides the rest. only the highlights that change are updated
+        """
+
+        # finds the spaces to highlight
+        spaces = {}
+        if self.clicked_piece is not None:
+            piece = self.clicked_piece
+            spaces = dict.fromkeys(piece.possible_moves.union(piece.possible_specials.keys()), 'blue')
+        elif self.show_all:
+            for column in self.game.board:
+                for piece in column:
+                    if piece is not None and piece.color == self.game.turn:
+                        spaces.update(dict.fromkeys(piece.possible_moves.union(piece.possible_specials.keys()),
+                                                    'light blue'))
+
+        # hides the highlights that are no longer needed and shows or recolors the rest
+        for x, y in tuple(self.shown.keys()):
+            if (x, y) not in spaces:
+                self.canvas.itemconfigure(self.highlights[x][y], state='hidden')
+                self.shown.pop((x, y))
+        for (x, y), fill in spaces.items():
+            if self.shown.get((x, y)) != fill:
+                self.canvas.itemconfigure(self.highlights[x][y], state='normal', fill=fill)
+                self.shown[(x, y)] = fill
+
+    def toggle_show_moves(self, piece: Piece):
+        """
+        performs one of the following actions:
+            1) displays the possible moves for the piece when clicked
+            2) hides possible moves when piece is clicked and moves are already displayed
+
+        additionally if a different piece is already displaying moves, its moves are replaced by the current pieces
+        moves
+
+        :param piece: the piece that was clicked
+        """
+
+        self.clicked_piece = None if self.clicked_piece == piece else piece
+        self.highlight()
+
+    def toggle_show_all(self):
+        """
+        displays or hides every possible move of the player whose turn it is, the moves of a clicked piece are still
+        displayed on their own until it is clicked again
+        """
+
+        self.show_all = not self.show_all
+        self.highlight()
+
+    def click(self, event):
+        """
+        handles when the mouse is clicked on the canvas
+
+        :param event: the mouse click event
+        """
+
+        # converts canvas coordinates to game board coordinates
+        x = event.x // 100
+        y = event.y // 100
+        piece = self.clicked_piece
+
+        # handles when the game is over, the ai is thinking or it is the turn of the other player online, the click is
+        # ignored
+        ai_turn = self.thinking is not None or (self.ai is not None and self.game.turn == self.ai_color)
+        remote_turn = self.remote is not None and (self.game.turn != self.remote.color or
+                                                   self.remote.result is not None or self.remote.closed)
+        if self.game.result is not None or ai_turn or remote_turn:
+            return
+
+        # handles when the show all moves button was clicked
+        elif x >= 8 and y == 0:
+            self.toggle_show_all()
+
+        # handles when click was outside of game
+        elif x >= 8:
+            self.toggle_show_moves(piece) if piece is not None else None
+
+        # handles when move has been clicked
+        elif piece is not None and (x, y) in piece.possible_moves:
+            self.toggle_show_moves(piece)
+            piece.move((x, y))
+            self.end_turn()
+
+        # handles when special move has been clicked, an upgrade is only made once the user chooses the piece so the
+        # turn is ended by choose_upgrade instead
+        elif piece is not None and (x, y) in piece.possible_specials.keys():
+            self.toggle_show_moves(piece)
+            moves = len(self.game.history)
+            piece.possible_specials[(x, y)](piece)
+            self.end_turn() if len(self.game.history) > moves else None
+
+        # handles when piece is clicked
+        elif self.game.board[x][y] is not None and self.game.board[x][y].color == self.game.turn:
+            self.toggle_show_moves(self.game.board[x][y])
+
+        # handles when empty spot is clicked
+        elif piece is not None:
+            self.toggle_show_moves(piece)
+
+    def choose_upgrade(self, pawn: Piece, position: tuple):
+        """
+        lets the user choose an upgrade for their pawn, the pawn moves once the choice is made
+
+        :param pawn: the pawn to upgrade
+        :param position: the position at the end of the board the pawn will move to
+        """
+
+        # finds the images
+        images = [sprite(pawn.color, name, PICKER_SCALE) for name in ('queen', 'knight', 'rook', 'bishop')]
+
+        # places images
+        squares = [self.canvas.create_rectangle(800, (y * 100) + 200, 900, (y * 100) + 300, fill='gray')
+                   for y in range(4)]
+        image_ids = [self.canvas.create_image(810, 215, image=images[0], anchor=NW),
+                     self.canvas.create_image(820, 315, image=images[1], anchor=NW),
+                     self.canvas.create_image(820, 415, image=images[2], anchor=NW),
+                     self.canvas.create_image(815, 510, image=images[3], anchor=NW)]
+
+        # changes click function
+        def click(event):
+            """
+            waits for user to click on choice
+
+            :param event: the click event
+            """
+
+            # scales coordinates for easy indexing
+            x = event.x // 100
+            y = event.y // 100
+
+            # deletes choice images, moves and upgrades the pawn and continues game
+            if x == 8 and 2 <= y <= 5:
+                [self.canvas.delete(shape) for shape in squares + image_ids]
+                self.canvas.bind('<Button-1>', self.click)
+                self.game.make_move(pawn.coordinates, position, ('queen', 'knight', 'rook', 'bishop')[y - 2])
+                self.end_turn()
+
+        self.canvas.bind('<Button-1>', click)
+
+    def end_turn(self):
+        """
+        updates the board and the highlights after a move and lets the ai move when it is its turn, the ai waits for the
+        canvas to draw the move of the user first. when playing online the move of the user is sent to the server
+        """
+
+        # sends the move of the user, an upgraded pawn is no longer on the space it moved to
+        if self.remote is not None and self.game.turn != self.remote.color:
+            piece, start, end = self.game.history[-1][0:3]
+            upgrade = self.game.board[end[0]][end[1]].name
+            self.remote.send((start, end, upgrade if piece.name == 'pawn' and upgrade != 'pawn' else None))
+        self.game.update_board()
+        self.sync()
+        self.highlight()
+        if self.ai is not None and self.game.turn == self.ai_color and self.game.result is None:
+            self.canvas.after(50, self.ai_move)
+
+    def ai_move(self):
+        """
+        starts the search of the ai in its own thread so the window keeps responding while it thinks, the clicks of the
+        user are ignored until the move is made
+        """
+
+        self.thinking = Queue()
+        Thread(target=lambda: self.thinking.put(self.ai.best_move()), daemon=True).start()
+        self.canvas.after(50, self.ai_done)
+
+    def ai_done(self):
+        """
+        makes the move the ai chose once its search is done, checking again every 50 milliseconds like poll
+        """
+
+        if self.thinking.empty():
+            self.canvas.after(50, self.ai_done)
+            return
+        move = self.thinking.get()
+        self.thinking = None
+        if move is not None:
+            self.game.make_move(*move)
+            self.end_turn()
+
+    def poll(self):
+        """
+        makes the moves of the other player that arrived from the server, checking again every 50 milliseconds until
+        the connection is closed. a move of the user the server did not accept is taken back so the board stays the
+        same as the game on the server, and the reason is shown
+        """
+
+        for kind, value in self.remote.received():
+
+            # handles when the other player moved
+            if kind == 'move':
+                self.canvas.itemconfigure(self.status, text='')
+                self.game.make_move(*value)
+                self.end_turn()
+
+            # handles when the server did not accept the move of the user, which is the last move on the board
+            elif kind == 'error' and self.game.turn != self.remote.color and self.game.history:
+                self.game.unmake_move()
+                self.game.update_board()
+                self.clicked_piece = None
+                self.sync()
+                self.highlight()
+                self.canvas.itemconfigure(self.status, text=f'move taken back: {value}')
+
+            # handles other errors and when the connection was closed
+            else:
+                self.canvas.itemconfigure(self.status, text=value)
+        self.canvas.after(50, self.poll) if not self.remote.closed else None
@@ -0,0 +1,32 @@
+from random import Random
+
+
+"""
+random numbers used to hash positions (zobrist hashing). the key of a position is the xor of the numbers for:
+
+    1) every piece on its space
+    2) the turn, only when it is black's turn
+    3) the castling rights that are still available
+    4) the en passant file, only when a pawn can actually attack en passant
+
+a move only changes a few of these so the key of the game is updated with a few xors instead of being recalculated
+"""
+
+
+# the numbers are generated from a fixed seed so every process hashes a position to the same key
+generator = Random(0x5EED)
+PIECE_KEYS = {color: {name: [generator.getrandbits(64) for _ in range(64)]
+                      for name in ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')}
+              for color in ('white', 'black')}
+TURN_KEY = generator.getrandbits(64)
+EN_PASSANT_KEYS = [generator.getrandbits(64) for _ in range(8)]
+
+# castling rights are a 4 bit number, white right, white left, black right, black left from lowest bit to highest
+RIGHT_KEYS = [generator.getrandbits(64) for _ in range(4)]
+CASTLING_KEYS = [0] * 16
+for rights in range(16):
+    for bit in range(4):
+        CASTLING_KEYS[rights] ^= RIGHT_KEYS[bit] if rights >> bit & 1 else 0
+
+# the spaces of the kings and rooks before they move, castling rights can only change when a move touches one of them
+CASTLING_SPACES = {(0, 0), (4, 0), (7, 0), (0, 7), (4, 7), (7, 7)}
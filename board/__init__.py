@@ -1,7 +1,9 @@
 from sys import path
-from os import getcwd
+from os.path import dirname, abspath
 
-path.append(getcwd() + '/board')
+path.append(dirname(abspath(__file__)))
 
-from Board import initialize_board
+from Board import initialize_board, load_fen, save_fen, load_position
+from Game import Game
 from Piece import Piece
+from Position import Position
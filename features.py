@@ -0,0 +1,30 @@
+"""
+turns the positions of a PGN file into feature planes for tuning the evaluation or training a model, the positions are
+written to .npy files of a fixed size that can be read as memory maps, see board/Features.py. needs numpy
+
+usage:
+    python features.py games.pgn --out dataset                       writes every position after each move
+    cat games.pgn | python features.py - --out dataset --shard 1000000
+"""
+
+from argparse import ArgumentParser
+from sys import stdin
+from time import perf_counter
+from board import *
+from Features import write_shards
+from Pgn import read_games
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='turns the positions of a PGN file into feature planes')
+    parser.add_argument('path', help='the PGN file, - for the standard input')
+    parser.add_argument('--out', default='dataset', help='the directory the shards are written to')
+    parser.add_argument('--shard', type=int, default=65536, help='the number of positions in each shard')
+    arguments = parser.parse_args()
+
+    # the games are read and replayed one at a time so the file can be bigger than the memory
+    file = stdin if arguments.path == '-' else open(arguments.path)
+    start = perf_counter()
+    total = write_shards(read_games(file), arguments.out, arguments.shard, print)
+    file.close() if file is not stdin else None
+    print(f'{total} positions  {total / max(perf_counter() - start, 1e-9):.0f} positions/sec')
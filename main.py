@@ -5,15 +5,32 @@ implement checkmate notification
     return to menu button
 add surrender button
 add timer option to display time between moves
-add show all possible moves button
 add main menu with following options
     play local
-    play online
-    play against ai
 """
 
+from os.path import isdir
+from sys import argv
 from board import *
+from Book import Book
+from Client import Remote
+import Profile
+from Search import Search
+from Tablebase import Tablebase
+from View import View
 
 
-initialize_board()
-Piece.CANVAS.mainloop()
+# passing ai as an argument plays against the computer, which plays black, a .bin file is used as its opening book and
+# a directory as its endgame tables, which also end the games they know are drawn. passing online plays on the server
+# (see server.py), a host:port can follow it. passing profile prints the calls and time of the functions that find
+# the moves after every turn (see Profile.py)
+Profile.enable(print) if 'profile' in argv[1:] else None
+book = next((Book(name) for name in argv[1:] if name.endswith('.bin')), None)
+tablebase = next((Tablebase(name) for name in argv[1:] if isdir(name)), None)
+game = Game(tablebase=tablebase)
+address = next((name.split(':') for name in argv[1:] if ':' in name), ('127.0.0.1', 8765))
+remote = Remote(address[0], int(address[1])) if 'online' in argv[1:] else None
+View(game, Search(game, book=book, tablebase=tablebase) if 'ai' in argv[1:] else None, remote=remote)
+initialize_board(game)
+game.view.sync()
+game.view.canvas.mainloop()
@@ -0,0 +1,26 @@
+"""
+measures how much faster the parallel search reaches a depth than the search of a single process
+
+usage:
+    python parallel.py                              searches the start position to depth 5 with 2, 4, ... processes
+    python parallel.py --workers 1 8 32 --depth 6   searches to depth 6 with 1, 8 and 32 processes
+    python parallel.py --fen FEN                    searches a position instead of the start position
+"""
+
+from argparse import ArgumentParser
+from multiprocessing import cpu_count
+from board import *
+from Parallel import speedup
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='measures the speedup of the parallel search')
+    parser.add_argument('--workers', type=int, nargs='+', help='the numbers of processes to measure, by default '
+                                                               'every power of 2 up to the number of cores')
+    parser.add_argument('--depth', type=int, default=5, help='the depth to search to')
+    parser.add_argument('--hash', type=float, default=64, help='the megabytes of the transposition table')
+    parser.add_argument('--fen', help='the position to search, the start position by default')
+    arguments = parser.parse_args()
+    workers = arguments.workers or [2 ** power for power in range(1, cpu_count().bit_length())] or [2]
+    game = load_fen(Game(), arguments.fen) if arguments.fen else initialize_board(Game())
+    speedup(game, arguments.depth, workers, arguments.hash)
@@ -0,0 +1,53 @@
+"""
+counts the positions reachable from standard positions (perft) to check the move generation and measure its speed
+
+usage:
+    python perft.py                         checks every standard position up to depth 3
+    python perft.py --depth 5               checks every standard position up to depth 5, this takes a long time
+    python perft.py --pieces                checks the possible moves of the pieces instead of Game.legal_moves
+    python perft.py --fen FEN --depth 3     counts the positions of a FEN and lists the count after each move
+    python perft.py --updates --depth 2     checks updating only the pieces affected by a move gives the same moves
+                                            as updating every piece, for every standard position
+    python perft.py --engines --depth 2     checks the ray walker and the bitboard engine give the same moves, for every
+                                            standard position
+    python perft.py --pieces --profile      also counts and times the functions that find the moves, see Profile.py
+"""
+
+from argparse import ArgumentParser
+from board import *
+from Perft import SUITE, perft, perft_pieces, divide, run_suite, compare_updates, compare_engines
+import Profile
+
+
+parser = ArgumentParser(description='counts the positions reachable from standard positions')
+parser.add_argument('--depth', type=int, default=3, help='the number of moves to count, from 1 to 5 for the suite')
+parser.add_argument('--pieces', action='store_true', help='count with update_board and the possible moves of pieces')
+parser.add_argument('--fen', help='count the positions of a single position and list the count after each move')
+parser.add_argument('--updates', action='store_true', help='check updating only the pieces affected by a move')
+parser.add_argument('--engines', action='store_true', help='check the ray walker and the bitboard engine agree')
+parser.add_argument('--profile', action='store_true', help='count and time the functions that find the moves')
+arguments = parser.parse_args()
+count = perft_pieces if arguments.pieces else perft
+Profile.enable() if arguments.profile else None
+
+# checks the updates of every standard position
+if arguments.updates:
+    for name, fen, _ in SUITE:
+        print(f'{name}: {compare_updates(load_fen(Game(), fen), arguments.depth)} positions match')
+
+# checks the engines agree for every standard position
+elif arguments.engines:
+    for name, fen, _ in SUITE:
+        games = tuple(load_fen(Game(engine), fen) for engine in ('rays', 'bitboard'))
+        print(f'{name}: {compare_engines(games, arguments.depth)} positions match')
+
+# counts a single position
+elif arguments.fen:
+    counts = divide(load_fen(Game(), arguments.fen), arguments.depth, count)
+    [print(f'{move}: {nodes}') for move, nodes in sorted(counts.items())]
+    print(f'total: {sum(counts.values())}')
+
+# checks the suite
+else:
+    run_suite(min(arguments.depth, 5), count)
+print(Profile.table()) if arguments.profile else None
@@ -0,0 +1,58 @@
+"""
+reads the games of a PGN file one at a time and replays every move through the rules, a game with a move that is not
+legal is reported and skipped
+
+usage:
+    python pgn.py games.pgn                                          checks every game of the file
+    cat games.pgn | python pgn.py -                                  reads the games from the standard input
+    python pgn.py games.pgn --out clean.pgn                          writes the legal games to a new file
+    python pgn.py games.pgn --pieces                                 also checks the moves the view lets the user make
+"""
+
+from argparse import ArgumentParser
+from sys import stdin
+from time import perf_counter
+from board import *
+from Pgn import read_games, replay, write_game
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='reads the games of a PGN file and replays every move through the rules')
+    parser.add_argument('path', help='the PGN file, - for the standard input')
+    parser.add_argument('--out', help='a file the legal games are written to')
+    parser.add_argument('--pieces', action='store_true', help='also check the possible moves of the pieces')
+    parser.add_argument('--report', type=int, default=1000, help='the number of games between progress lines')
+    arguments = parser.parse_args()
+
+    # replays each game as it is read so only one game is in memory at a time
+    file = stdin if arguments.path == '-' else open(arguments.path)
+    out = open(arguments.out, 'w') if arguments.out else None
+    games = invalid = moves = 0
+    start = perf_counter()
+    for tags, names, result in read_games(file):
+        games += 1
+        try:
+            for game in replay(tags, names, arguments.pieces):
+                moves += 1
+        except ValueError as error:
+            invalid += 1
+            print(f'game {games}: {error}')
+            continue
+
+        # writes the game, the moves of the first position come from the FEN tag
+        if out is not None:
+            first_turn, first_number = 'white', 1
+            if 'FEN' in tags:
+                fields = tags['FEN'].split()
+                first_turn = 'white' if fields[1] == 'w' else 'black'
+                first_number = int(fields[5]) if len(fields) == 6 else 1
+            out.write(write_game(tags, names, result, first_turn, first_number))
+        if games % arguments.report == 0:
+            print(f'{games} games  {games / (perf_counter() - start):.1f} games/sec')
+
+    # closes the files and reports the totals
+    file.close() if file is not stdin else None
+    out.close() if out is not None else None
+    elapsed = max(perf_counter() - start, 1e-9)
+    print(f'{games} games  {invalid} invalid  {moves} moves  {games / elapsed:.1f} games/sec  '
+          f'{moves / elapsed:.0f} moves/sec')
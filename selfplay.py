@@ -0,0 +1,48 @@
+"""
+plays the search against itself without a window and writes the games to a PGN file
+
+usage:
+    python selfplay.py --games 1000 --out games.pgn                  plays 1000 games with a search of depth 2
+    python selfplay.py --games 100 --time 0.1                        searches each move for a tenth of a second
+    python selfplay.py --games 100 --openings openings.txt           starts the games from a list of openings, one
+                                                                     opening per line as a FEN string or moves
+                                                                     such as e2e4 e7e5
+    python selfplay.py --games 100 --book book.bin --random 0        plays the opening moves from a Polyglot book
+    python selfplay.py --games 100 --tables tables                   plays endgames from the tables made by
+                                                                     tablebase.py
+"""
+
+from argparse import ArgumentParser
+from board import *
+from SelfPlay import run
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='plays the search against itself and writes the games to a PGN file')
+    parser.add_argument('--games', type=int, default=100, help='the number of games to play')
+    parser.add_argument('--out', default='games.pgn', help='the file the games are added to')
+    parser.add_argument('--openings', help='a file of openings, one FEN string or list of moves per line')
+    parser.add_argument('--workers', type=int, help='the number of processes, one per core by default')
+    parser.add_argument('--random', type=int, default=4, help='the number of random moves after the opening')
+    parser.add_argument('--depth', type=int, help='the depth to search each move, 2 when no limit is given')
+    parser.add_argument('--time', type=float, help='the number of seconds to search each move')
+    parser.add_argument('--nodes', type=int, help='the number of positions to search each move')
+    parser.add_argument('--max-plies', type=int, default=400,
+                        help='the number of plies (half moves) before a game is stopped')
+    parser.add_argument('--hash', type=float, default=16, help='the megabytes of the table of each process')
+    parser.add_argument('--book', help='a Polyglot opening book the search plays from')
+    parser.add_argument('--tables', help='a directory of endgame tables the search plays from')
+    arguments = parser.parse_args()
+
+    # reads the openings, skipping blank lines and comments
+    openings = None
+    if arguments.openings:
+        with open(arguments.openings) as file:
+            openings = [line.strip() for line in file if line.strip() and not line.startswith('#')]
+    depth = arguments.depth
+    if depth is None and arguments.time is None and arguments.nodes is None:
+        depth = 2
+    games_per_second = run(arguments.out, arguments.games, openings, arguments.workers, arguments.random,
+                           arguments.time, depth, arguments.nodes, arguments.max_plies, arguments.hash,
+                           arguments.book, arguments.tables)
+    print(f'{games_per_second:.2f} games/sec')
@@ -0,0 +1,31 @@
+"""
+hosts games for playing online, or plays many games on a running server to measure how many it can hold
+
+usage:
+    python server.py                                                 runs the server on 127.0.0.1:8765
+    python server.py --host 0.0.0.0 --port 9000                      runs the server for other computers
+    python server.py --tables tables                                 ends games the endgame tables know are drawn
+    python server.py --load-test --games 2000 --moves 20             plays 2000 games at once on a running server
+    python main.py online                                            plays on the server in a window
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from board import *
+from Server import serve, load_test
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='hosts games for playing online')
+    parser.add_argument('--host', default='127.0.0.1', help='the address of the server')
+    parser.add_argument('--port', type=int, default=8765, help='the port of the server')
+    parser.add_argument('--tables', help='a directory of endgame tables, games they know are drawn are ended')
+    parser.add_argument('--load-test', action='store_true', help='plays many games on a running server')
+    parser.add_argument('--games', type=int, default=1000, help='the number of games the load test plays at once')
+    parser.add_argument('--moves', type=int, default=20, help='the number of moves of each player in the load test')
+    arguments = parser.parse_args()
+
+    if arguments.load_test:
+        run(load_test(arguments.host, arguments.port, arguments.games, arguments.moves))
+    else:
+        serve(arguments.host, arguments.port, tablebase_path=arguments.tables)
@@ -0,0 +1,43 @@
+"""
+makes endgame tables by retrograde analysis and looks up positions in them
+
+usage:
+    python tablebase.py KQvK KRvK KPvK                                makes the tables in the tables directory, along
+                                                                     with the tables they lead to such as KBvK
+    python tablebase.py KBNvK --dir endgames                         makes a table in another directory, tables of
+                                                                     four pieces take much longer than three
+    python tablebase.py --probe "8/8/8/4k3/8/8/8/KR6 w - - 0 1"      finds the result of a position and its best move
+"""
+
+from argparse import ArgumentParser
+from os import makedirs
+from board import *
+from Notation import move_name
+from Tablebase import Tablebase, generate
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='makes endgame tables and looks up positions in them')
+    parser.add_argument('tables', nargs='*', help='the tables to make, for example KQvK')
+    parser.add_argument('--dir', default='tables', help='the directory of the tables')
+    parser.add_argument('--probe', help='a position to look up as a FEN string')
+    arguments = parser.parse_args()
+
+    # makes the tables
+    makedirs(arguments.dir, exist_ok=True)
+    tables = {}
+    for signature in arguments.tables:
+        generate(signature, arguments.dir, print, tables)
+
+    # looks up the position
+    if arguments.probe:
+        game = load_fen(Game(), arguments.probe, False)
+        tablebase = Tablebase(arguments.dir)
+        found = tablebase.probe(game)
+        if found is None:
+            print('the position is not in a table')
+        else:
+            result = {1: 'win', 0: 'draw', -1: 'loss'}[found[0]]
+            move = tablebase.best_move(game)
+            print(f'{result} for {game.turn}' + (f' in {found[1]} moves of either player' if found[0] else '') +
+                  (f', best move {move_name(move)}' if move is not None else ''))
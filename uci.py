@@ -0,0 +1,15 @@
+"""
+runs the computer as a UCI engine for tournament managers such as cutechess-cli or fastchess, see board/Uci.py for
+the commands it understands
+
+usage:
+    python uci.py                           reads UCI commands from the standard input
+    cutechess-cli -engine cmd=python arg=uci.py ...
+"""
+
+from board import *
+from Uci import Engine
+
+
+if __name__ == '__main__':
+    Engine().run()